@@ -0,0 +1,37 @@
+"""
+Config/settings_test.py
+测试专用设置：在项目设置基础上统一替换慢速/外部依赖项
+- 用法：DJANGO_SETTINGS_MODULE=Config.settings_test python manage.py test
+- 以此模块运行时，各测试类无需再逐类 override_settings（见 TESTING 标记）
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+# 测试设置标记：测试模块据此跳过重复的逐类设置覆盖
+TESTING = True
+
+# 密码哈希使用 MD5，避免默认慢哈希拖慢建用户与登录
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# 邮件写入内存，登录免图形验证码
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+ALLOW_LOGIN_WITHOUT_CAPTCHA = True
+
+# 进程内缓存，不依赖 Redis
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ftc-tests",
+    }
+}
+
+# 关闭登录与通用写操作限流，其余限流保持默认以便相关用例按需覆盖
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        **REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {}),
+        "login": None,
+        "user_post": None,
+    },
+}
@@ -65,7 +65,7 @@ class AccountsAPITestCase(AuthenticatedAPIMixin, APITestCase):
             password="StrongPass123!",
         )
         cls.admin.is_email_verified = True
-        cls.admin.save()
+        cls.admin.save(update_fields=["is_email_verified"])
         # 创建普通用户
         cls.user = User.objects.create_user(
             username="tester",
@@ -73,7 +73,7 @@ class AccountsAPITestCase(AuthenticatedAPIMixin, APITestCase):
             password="Passw0rd123",
         )
         cls.user.is_email_verified = True
-        cls.user.save()
+        cls.user.save(update_fields=["is_email_verified"])
 
     def setUp(self):
         # 清理 throttle 缓存，避免跨用例触发限流
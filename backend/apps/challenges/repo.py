@@ -243,6 +243,16 @@ class ChallengeHintUnlockRepo(BaseRepo[ChallengeHintUnlock]):
             costs[key] = costs.get(key, 0) + int(rec["cost"] or 0)
         return costs
 
+    def cost_by_challenge(self, *, challenge_ids: list[int], user: User, team=None) -> dict[int, int]:
+        """当前用户/队伍在多道题目下的提示总成本（题目 id -> 成本），一次分组聚合取出"""
+        qs = self.filter(challenge_id__in=challenge_ids)
+        if team:
+            qs = qs.filter(models.Q(team=team) | models.Q(user=user))
+        else:
+            qs = qs.filter(user=user)
+        rows = qs.values_list("challenge_id").annotate(total=models.Sum("cost")).order_by()
+        return {challenge_id: int(total or 0) for challenge_id, total in rows}
+
     def cost_for_solver(self, *, challenge: Challenge, user: User, team=None) -> int:
         """当前用户/队伍在指定题目的总提示成本，供计分扣减使用"""
         qs = self.filter(challenge=challenge)
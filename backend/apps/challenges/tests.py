@@ -58,10 +58,10 @@ class ChallengeServiceTests(TestCase):
         )
         self.author = User.objects.create_user(username="author", email="author@example.com", password="Pass1234")
         self.author.is_email_verified = True
-        self.author.save()
+        self.author.save(update_fields=["is_email_verified"])
         self.player = User.objects.create_user(username="player", email="player@example.com", password="Pass1234")
         self.player.is_email_verified = True
-        self.player.save()
+        self.player.save(update_fields=["is_email_verified"])
         self._ensure_category(self.contest, "Misc")
 
     def test_challenge_create_and_fetch(self):
@@ -252,10 +252,10 @@ class ChallengesAPITestCase(AuthenticatedAPIMixin, APITestCase):
             password="StrongPass123!",
         )
         cls.admin.is_email_verified = True
-        cls.admin.save()
+        cls.admin.save(update_fields=["is_email_verified"])
         cls.player = User.objects.create_user(username="alice", email="alice@example.com", password="Passw0rd123")
         cls.player.is_email_verified = True
-        cls.player.save()
+        cls.player.save(update_fields=["is_email_verified"])
         now = timezone.now()
         cls.contest = Contest.objects.create(
             name="API CTF",
@@ -89,9 +89,11 @@ class ChallengeListView(APIView):
     )
     def post(self, request: Request, contest_slug: str) -> Response:
         # 补充比赛标识后创建题目
-        payload = dict(request.data)
-        payload["contest_slug"] = contest_slug
-        schema = ChallengeCreateSchema.from_dict(payload, auto_validate=True)
+        schema = ChallengeCreateSchema.from_dict(
+            request.data,
+            overrides={"contest_slug": contest_slug},
+            auto_validate=True,
+        )
         challenge = ChallengeCreateService().execute(request.user, schema)
         return response.created({"challenge": serialize_challenge(challenge, request=request)}, message="题目已创建")
 
@@ -150,9 +152,11 @@ class ChallengeDetailView(APIView):
     )
     def patch(self, request: Request, contest_slug: str, challenge_slug: str) -> Response:
         # 补充比赛/题目标识后更新题目
-        payload = dict(request.data)
-        payload.update({"contest_slug": contest_slug, "slug": challenge_slug})
-        schema = ChallengeUpdateSchema.from_dict(payload, auto_validate=True)
+        schema = ChallengeUpdateSchema.from_dict(
+            request.data,
+            overrides={"contest_slug": contest_slug, "slug": challenge_slug},
+            auto_validate=True,
+        )
         challenge = ChallengeUpdateService().execute(schema)
         return response.success({"challenge": serialize_challenge(challenge, request=request)}, message="题目已更新")
 
@@ -29,7 +29,7 @@ from rest_framework_simplejwt.exceptions import (
 
 from .exceptions import TokenError, AuthError
 from .infra.logger import get_logger, logger_extra
-from .utils.request_context import update_request_user
+from .utils.request_context import build_user_gate, update_request_user
 
 logger = get_logger(__name__)
 
@@ -113,6 +113,8 @@ class JWTAuthentication(SimpleJWTAuthentication):
 
         # 5. 认证成功后更新请求上下文中的用户信息，确保后续日志拥有账户标识
         update_request_user(user)
+        # 身份摘要随用户对象在本次请求内复用，服务层无需反复读取权限属性
+        user.gate = build_user_gate(user)
 
         # 6. 返回 (user, validated_token)，与 SimpleJWT 接口保持一致
         return user, validated_token
@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import asdict, dataclass, fields
-from typing import Any, ClassVar, Dict, Generic, Iterable, Mapping, Optional, TypeVar
+from copy import deepcopy
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Dict, Generic, Iterable, Mapping, Optional, TypeVar
+
+from apps.common.exceptions import ValidationError
 
 T = TypeVar("T")
 SchemaType = TypeVar("SchemaType", bound="BaseSchema[Any]")
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseSchema(ABC, Generic[T]):
     """
     业务 Schema / DTO 基类
@@ -35,11 +39,44 @@ class BaseSchema(ABC, Generic[T]):
     auto_validate: ClassVar[bool] = False
     #: 字段别名映射：用于兼容不同命名风格（如中文拼音）到内部字段
     ALIASES: ClassVar[dict[str, str]] = {}
+    #: 必填字段声明：(字段名, 缺失时的提示)，由 check_required 统一校验
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = ()
+    #: 类创建时根据 REQUIRED_FIELDS 预编译的取值器
+    _required_getters: ClassVar[tuple[tuple[Callable[[Any], Any], str], ...]] = ()
+    #: 可直接落库的字段白名单（对应 Model 列），由 to_db_dict 使用
+    DB_FIELDS: ClassVar[tuple[str, ...]] = ()
+    #: 类创建时根据 DB_FIELDS 预编译的取值器
+    _db_getter: ClassVar[Optional[Callable[[Any], Any]]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        # slots=True 会重建类，零参 super() 指向旧类，因此显式指定 BaseSchema
+        super(BaseSchema, cls).__init_subclass__(**kwargs)
+        cls._required_getters = tuple((attrgetter(name), message) for name, message in cls.REQUIRED_FIELDS)
+        cls._db_getter = attrgetter(*cls.DB_FIELDS) if cls.DB_FIELDS else None
 
     def __post_init__(self):
         if self.auto_validate:
             self.validate()
 
+    def check_required(self) -> None:
+        """
+        按 REQUIRED_FIELDS 顺序校验必填字段，首个为空的字段抛出 ValidationError
+        """
+        for getter, message in self._required_getters:
+            if not getter(self):
+                raise ValidationError(message=message)
+
+    @classmethod
+    def field_names(cls) -> tuple[str, ...]:
+        """
+        返回字段名元组：首次调用时解析 dataclass 字段并缓存在类上，后续序列化直接复用
+        """
+        names = cls.__dict__.get("_field_names_cache")
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            setattr(cls, "_field_names_cache", names)
+        return names
+
     # ------------------------
     # 校验钩子
     # ------------------------
@@ -63,7 +100,7 @@ class BaseSchema(ABC, Generic[T]):
         """
         将 Schema 转为 dict，支持过滤 None 或移除指定字段
         """
-        data = asdict(self)
+        data = {name: deepcopy(getattr(self, name)) for name in self.field_names()}
         if exclude_none:
             data = {key: value for key, value in data.items() if value is not None}
         if exclude:
@@ -71,6 +108,20 @@ class BaseSchema(ABC, Generic[T]):
                 data.pop(key, None)
         return data
 
+    def to_db_dict(self) -> Dict[str, Any]:
+        """
+        按 DB_FIELDS 白名单导出非 None 字段，供 create/update 直接落库
+        - 仅遍历声明的列，不做反射与深拷贝；未声明白名单时退化为 to_dict(exclude_none=True)
+        """
+        getter = self._db_getter
+        if getter is None:
+            return self.to_dict(exclude_none=True)
+        values = getter(self)
+        if len(self.DB_FIELDS) == 1:
+            # 单字段 attrgetter 返回标量，统一包装为元组
+            values = (values,)
+        return {name: value for name, value in zip(self.DB_FIELDS, values) if value is not None}
+
     def to_model_kwargs(
             self,
             *,
@@ -117,13 +168,17 @@ class BaseSchema(ABC, Generic[T]):
             cls: type[SchemaType],
             data: Dict[str, Any],
             *,
+            overrides: Optional[Dict[str, Any]] = None,
             auto_validate: Optional[bool] = None,
     ) -> SchemaType:
         """
         将外部 payload 转为 Schema；auto_validate 控制是否立即校验
+        - overrides：覆盖 payload 中的同名键（如路由参数 contest_slug），与 payload 合并时只复制一次
         """
+        if overrides:
+            data = {**data, **overrides}
         # 兼容 QueryDict/类似 Mapping，统一转为普通 dict
-        if not isinstance(data, dict):
+        elif not isinstance(data, dict):
             data = dict(data)
         # 兼容别名：将外部使用的别名（如中文拼音）映射到内部字段名
         if cls.ALIASES:
@@ -153,10 +208,10 @@ class BaseSchema(ABC, Generic[T]):
         """
         payload: Dict[str, Any] = {}
         attr_map = field_map or {}
-        for field in fields(cls):
-            target_attr = attr_map.get(field.name, field.name)
+        for name in cls.field_names():
+            target_attr = attr_map.get(name, name)
             if hasattr(model, target_attr):
-                payload[field.name] = getattr(model, target_attr)
+                payload[name] = getattr(model, target_attr)
         if extra:
             payload.update(extra)
         return cls(**payload)
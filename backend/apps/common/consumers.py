@@ -13,6 +13,7 @@ from __future__ import annotations
 import asyncio
 import time
 
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.contrib.auth.models import AnonymousUser
 from django.conf import settings
@@ -163,10 +164,16 @@ class NotifyConsumer(BaseAuthorizedConsumer):
     通用通知通道：
     - 需登录（可根据业务码扩展）
     - 默认加入个人频道，便于点对点推送
+    - 同时加入所在队伍的频道，队伍通知单次发布后按 recipients 过滤
     """
 
     required_perm = None  # 登录即可
     user_group: str | None = None
+    team_groups: set[str]
+    # 个人频道收到这些事件时加入/退出对应队伍频道，保证连接期间队伍变化后仍能收到队伍通知
+    # 队长移交可能重新激活已离队成员，新队长需随之加入队伍频道（已在组内时直接跳过）
+    _TEAM_JOIN_EVENTS = frozenset({"team_created", "team_joined", "team_transferred"})
+    _TEAM_LEAVE_EVENTS = frozenset({"team_left"})
 
     async def connect(self):
         user = self.scope.get("user")
@@ -175,17 +182,67 @@ class NotifyConsumer(BaseAuthorizedConsumer):
             return None
         await self.accept()
         self.user_group = f"user_{user.id}"
+        self.team_groups = set()
         if self.channel_layer:
             await self.channel_layer.group_add(self.user_group, self.channel_name)
+            for team_id in await self._active_team_ids(user.id):
+                await self._join_team_group(team_id)
         return None
 
     async def disconnect(self, close_code):
         if getattr(self, "user_group", None) and self.channel_layer:
             await self.channel_layer.group_discard(self.user_group, self.channel_name)
+            for group in getattr(self, "team_groups", ()):
+                await self.channel_layer.group_discard(group, self.channel_name)
         return None
 
+    @staticmethod
+    @database_sync_to_async
+    def _active_team_ids(user_id: int) -> list[int]:
+        """查询用户当前所在的有效队伍 id"""
+        from apps.contests.repo import TeamMemberRepo  # 延迟导入避免循环
+
+        return list(
+            TeamMemberRepo()
+            .filter(user_id=user_id, is_active=True, team__is_active=True)
+            .values_list("team_id", flat=True)
+        )
+
+    async def _join_team_group(self, team_id) -> None:
+        group = f"team_{team_id}"
+        if group in self.team_groups or not self.channel_layer:
+            return
+        await self.channel_layer.group_add(group, self.channel_name)
+        self.team_groups.add(group)
+
+    async def _leave_team_group(self, team_id) -> None:
+        group = f"team_{team_id}"
+        if group not in self.team_groups or not self.channel_layer:
+            return
+        await self.channel_layer.group_discard(group, self.channel_name)
+        self.team_groups.discard(group)
+
     async def broadcast(self, event):
-        """统一的广播入口：直接把 event 透传给前端"""
+        """
+        统一的广播入口：
+        - 队伍频道事件携带 recipients（[用户 id, 通知 id, 创建时间]），仅推送给列表内用户并补全本人的通知 id
+        - 其余事件直接透传给前端
+        """
+        recipients = event.get("recipients")
+        if recipients is not None:
+            user_id = getattr(self.scope.get("user"), "id", None)
+            entry = next((r for r in recipients if r[0] == user_id), None)
+            if entry is None:
+                return
+            event = {k: v for k, v in event.items() if k != "recipients"}
+            event["id"], event["created_at"] = entry[1], entry[2]
+        else:
+            name = event.get("event")
+            team_id = event.get("team_id")
+            if team_id and name in self._TEAM_JOIN_EVENTS:
+                await self._join_team_group(team_id)
+            elif team_id and name in self._TEAM_LEAVE_EVENTS:
+                await self._leave_team_group(team_id)
         await self.send_json(event)
 
 
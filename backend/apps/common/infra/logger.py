@@ -15,6 +15,7 @@ import logging
 import logging.handlers
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -281,13 +282,16 @@ def sanitize_extra(extra: Optional[dict] = None) -> dict:
     """
     if not extra:
         return {}
-    sanitized = {}
-    for k, v in extra.items():
-        if k.lower() in SENSITIVE_KEYS:
-            sanitized[k] = "***"
-        else:
-            sanitized[k] = v
-    return sanitized
+    # 绝大多数 extra 不含敏感键：直接复用调用方新建的字典，避免逐键复制
+    if not any(_is_sensitive_key(k) for k in extra):
+        return extra
+    return {k: "***" if _is_sensitive_key(k) else v for k, v in extra.items()}
+
+
+@lru_cache(maxsize=512)
+def _is_sensitive_key(key: str) -> bool:
+    """判断字段名是否敏感；日志字段名集合有限，按键名缓存结果"""
+    return key.lower() in SENSITIVE_KEYS
 
 
 def logger_extra(extra: Optional[dict] = None) -> dict:
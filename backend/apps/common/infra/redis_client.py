@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import os
 import json
+import time
+from functools import partial
 from typing import Any, Optional
 
 from django.conf import settings
@@ -22,9 +24,60 @@ except Exception:  # pragma: no cover
     redis = None
 
 
+# JSON 缓存统一紧凑编码：去掉分隔空格并保留非 ASCII 字符，缩短大对象（如榜单）的编码耗时与体积
+_json_dumps = partial(json.dumps, separators=(",", ":"), ensure_ascii=False)
+
+# 健康检查：PING 结果缓存若干秒，Redis 宕机期间各方法直接短路，避免每次请求都等待连接超时
+HEALTH_CHECK_INTERVAL = float(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 5))
+# 持续不可用超过该秒数时升级为 ERROR 日志，便于告警
+HEALTH_ERROR_AFTER = float(os.getenv("REDIS_HEALTH_ERROR_AFTER", 60))
+_health_state: dict[str, Any] = {"ok": True, "checked_at": 0.0, "down_since": None, "escalated": False}
+
+
+def healthy() -> bool:
+    """
+    返回 Redis 是否可用（PING 结果缓存 HEALTH_CHECK_INTERVAL 秒）
+    - 由健康转为不可用时记录 WARNING；持续不可用超过 HEALTH_ERROR_AFTER 秒时记录一次 ERROR
+    """
+    now = time.monotonic()
+    if now - _health_state["checked_at"] < HEALTH_CHECK_INTERVAL:
+        return _health_state["ok"]
+    client = _build_client()
+    try:
+        ok = client is not None and bool(client.ping())
+    except Exception:
+        ok = False
+    _health_state["checked_at"] = now
+    if ok:
+        if not _health_state["ok"]:
+            _logger.info("Redis 已恢复可用", extra={"service": "redis"})
+        _health_state.update(ok=True, down_since=None, escalated=False)
+        return True
+    if _health_state["ok"]:
+        _logger.warning("Redis 不可用，缓存读写将短路", extra={"service": "redis"})
+        _health_state.update(ok=False, down_since=now)
+    elif not _health_state["escalated"] and now - _health_state["down_since"] >= HEALTH_ERROR_AFTER:
+        _logger.error(
+            "Redis 持续不可用",
+            extra={"service": "redis", "down_seconds": int(now - _health_state["down_since"])},
+        )
+        _health_state["escalated"] = True
+    return False
+
+
 def _get_client():
     """
-    获取 Redis 客户端；不可用时返回 None 并记录警告
+    获取 Redis 客户端；不可用时返回 None
+    - 健康检查未通过时直接返回 None，调用方按既有逻辑回退到 DB/非缓存路径
+    """
+    if not healthy():
+        return None
+    return _build_client()
+
+
+def _build_client():
+    """
+    构造 Redis 客户端；不可用时返回 None 并记录警告
     - 适配生产：Redis 未安装/未启动时不抛致命异常，由调用方选择回退方案
     """
     if not redis:
@@ -51,15 +104,15 @@ def _get_client():
         return None
 
 
-def set(key: str, value: Any, ex: Optional[int] = None) -> None:
+def set(key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> None:
     """
-    设置键值，可选过期时间（秒）
+    设置键值，可选过期时间（秒）；nx=True 时仅在键不存在时写入
     """
     client = _get_client()
     if client is None:
         return
     try:
-        client.set(key, value, ex=ex)
+        client.set(key, value, ex=ex, nx=nx)
     except Exception:
         _logger.warning("Redis 写入失败，已跳过", extra={"key": key}, exc_info=True)
 
@@ -99,15 +152,30 @@ def incr(key: str, amount: int = 1, ex: Optional[int] = None) -> int:
         raise CacheUnavailableError(message="Redis 不可用，计数器失败") from exc
 
 
-def delete(key: str) -> None:
-    """删除键，失败时跳过"""
+def delete(*keys: str) -> None:
+    """删除一个或多个键（单条 DEL 一次往返），失败时跳过"""
+    if not keys:
+        return
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        client.delete(*keys)
+    except Exception:
+        _logger.warning("Redis 删除键失败，已跳过", extra={"keys": list(keys)})
+
+
+def delete_pattern(pattern: str) -> None:
+    """按模式批量删除键（SCAN 遍历，避免 KEYS 阻塞），失败时跳过"""
     client = _get_client()
     if client is None:
         return
     try:
-        client.delete(key)
+        keys = list(client.scan_iter(match=pattern, count=500))
+        if keys:
+            client.delete(*keys)
     except Exception:
-        _logger.warning("Redis 删除键失败，已跳过", extra={"key": key})
+        _logger.warning("Redis 批量删除键失败，已跳过", extra={"pattern": pattern})
 
 
 def acquire_lock(key: str, *, ex: Optional[int] = None) -> bool:
@@ -159,9 +227,63 @@ def lrange(key: str, start: int = 0, end: int = -1):
         return []
 
 
+def sadd(key: str, *values, ex: Optional[int] = None) -> None:
+    """集合添加成员，可选刷新过期时间；失败时跳过"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.sadd(key, *values)
+        if ex:
+            pipe.expire(key, ex)
+        pipe.execute()
+    except Exception:
+        _logger.warning("Redis 集合写入失败，已跳过", extra={"key": key})
+
+
+def srem(key: str, *values) -> None:
+    """集合移除成员，失败时跳过"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        client.srem(key, *values)
+    except Exception:
+        _logger.warning("Redis 集合移除失败，已跳过", extra={"key": key})
+
+
+def sismember(key: str, value: Any) -> bool:
+    """判断集合成员；Redis 不可用时返回 False，由调用方回退到 DB"""
+    client = _get_client()
+    if client is None:
+        return False
+    try:
+        return bool(client.sismember(key, value))
+    except Exception:
+        _logger.warning("Redis 集合读取失败，已跳过", extra={"key": key}, exc_info=True)
+        return False
+
+
 def set_json(key: str, data: Any, ex: Optional[int] = None) -> None:
     """以 JSON 序列化存储数据，方便结构化缓存"""
-    set(key, json.dumps(data), ex=ex)
+    set(key, _json_dumps(data), ex=ex)
+
+
+def set_many_json(mapping: dict[str, Any], ex: Optional[int] = None) -> None:
+    """批量以 JSON 写入多个键，经 pipeline 一次往返完成，失败时跳过"""
+    if not mapping:
+        return
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key, data in mapping.items():
+            pipe.set(key, _json_dumps(data), ex=ex)
+        pipe.execute()
+    except Exception:
+        _logger.warning("Redis 批量写入失败，已跳过", extra={"keys": list(mapping)}, exc_info=True)
 
 
 def get_json(key: str) -> Optional[Any]:
@@ -173,3 +295,24 @@ def get_json(key: str) -> Optional[Any]:
         return json.loads(raw)
     except Exception:
         return None
+
+
+def mget_json(keys: list[str]) -> list[Optional[Any]]:
+    """批量获取 JSON 数据，一次往返读取多个键；不可用或解析失败的位置返回 None"""
+    if not keys:
+        return []
+    client = _get_client()
+    if client is None:
+        return [None] * len(keys)
+    try:
+        raws = client.mget(keys)
+    except Exception:
+        _logger.warning("Redis 批量读取失败，已跳过", extra={"count": len(keys)}, exc_info=True)
+        return [None] * len(keys)
+    result: list[Optional[Any]] = []
+    for raw in raws:
+        try:
+            result.append(json.loads(raw) if raw is not None else None)
+        except Exception:
+            result.append(None)
+    return result
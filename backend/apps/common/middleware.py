@@ -7,14 +7,17 @@ from apps.common.utils.request_context import (
     generate_request_id,
     set_request_context,
 )
+from apps.common.utils.time import clear_request_now, set_request_now
 
 
 class RequestContextMiddleware(MiddlewareMixin):
     """
     在请求生命周期内写入 request_id、用户、方法、路径、IP，供日志过滤器使用
+    同时记录请求级统一时间，供服务层在同一请求内复用
     """
 
     def process_request(self, request):
+        set_request_now()
         user = getattr(request, "user", None)
         remote_ip = self._get_client_ip(request)
         set_request_context(
@@ -32,6 +35,7 @@ class RequestContextMiddleware(MiddlewareMixin):
     def process_response(request, response):
         _ = request
         clear_request_context()
+        clear_request_now()
         return response
 
     @staticmethod
@@ -39,6 +43,7 @@ class RequestContextMiddleware(MiddlewareMixin):
         _ = request
         _ = exception
         clear_request_context()
+        clear_request_now()
         return None
 
     @staticmethod
@@ -10,13 +10,18 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, List
 
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from apps.common.response import page_success
+from apps.common.exceptions import ValidationError
+from apps.common.response import api_response, page_success
 
 
 class StandardPagination(PageNumberPagination):
@@ -61,3 +66,103 @@ class StandardPagination(PageNumberPagination):
         if size is None:
             return None
         return max(1, size)
+
+
+def keyset_filter(field: str, value: datetime, pk: int | None = None) -> Q:
+    """
+    键集分页的范围条件：取 (field, id) 严格早于游标的行
+    - 同一时间戳的多行以 id 决定先后，翻页边界落在并列值内部时不丢行
+    - 仅有时间戳（旧游标）时退化为 field < value
+    """
+    before = Q(**{f"{field}__lt": value})
+    if pk is None:
+        return before
+    return before | Q(**{field: value, "id__lt": pk})
+
+
+class KeysetPagination:
+    """
+    键集分页（游标翻页）
+
+    - 前端传入上一页返回的 next_cursor（?before=<时间戳>,<id>），后端按索引范围扫描取下一页
+    - 相比 LIMIT/OFFSET，翻到后面的页时不需要跳过前面的行，耗时与页码无关
+    - 数据层需按 (游标字段, id) 倒序，并多取 1 条用于判断是否还有下一页
+    """
+
+    page_size: int = StandardPagination.page_size
+    page_size_query_param: str = StandardPagination.page_size_query_param
+    max_page_size: int = StandardPagination.max_page_size
+    cursor_query_param: str = "before"
+
+    def __init__(self, cursor_field: str = "created_at"):
+        self.cursor_field = cursor_field
+        self.page_size_used = self.page_size
+        self.has_next = False
+        self.next_cursor: str | None = None
+        self.cursor_id: int | None = None
+
+    def get_cursor(self, request: Request) -> datetime | None:
+        """
+        解析游标参数；未传入时返回 None，由调用方回退到页码分页
+        - 游标格式为 "<时间戳>,<id>"，id 部分记入 cursor_id；只有时间戳的旧游标仍可解析
+        """
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        head, sep, pk = raw.rpartition(",")
+        if sep:
+            if not pk.isdigit():
+                raise ValidationError(message="游标参数格式不正确")
+            raw, self.cursor_id = head, int(pk)
+        value = parse_datetime(raw)
+        if value is None:
+            raise ValidationError(message="游标参数格式不正确")
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, timezone.get_default_timezone())
+        return value
+
+    def filter_queryset(self, queryset, before: datetime):
+        """按游标过滤并按 (游标字段, id) 倒序排列，调用方再按 get_fetch_limit 切片"""
+        return queryset.filter(keyset_filter(self.cursor_field, before, self.cursor_id)).order_by(
+            f"-{self.cursor_field}", "-id"
+        )
+
+    def get_page_size(self, request: Request) -> int:
+        """读取每页大小，限制在 [1, max_page_size]"""
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        self.page_size_used = max(1, min(size, self.max_page_size))
+        return self.page_size_used
+
+    def get_fetch_limit(self, request: Request) -> int:
+        """数据层应读取的条数：每页大小 + 1 条探测下一页"""
+        return self.get_page_size(request) + 1
+
+    def paginate_rows(self, rows: List[Any]) -> List[Any]:
+        """裁剪多取的一条，记录是否有下一页及下一页游标"""
+        self.has_next = len(rows) > self.page_size_used
+        page = list(rows[: self.page_size_used])
+        if self.has_next and page:
+            last = page[-1]
+            # 兼容 values() 查询返回的字典行
+            if isinstance(last, dict):
+                last_value, last_id = last.get(self.cursor_field), last.get("id")
+            else:
+                last_value, last_id = getattr(last, self.cursor_field, None), getattr(last, "id", None)
+            if last_value is not None:
+                # 游标携带 id，下一页从并列时间戳中 id 更小的行继续
+                self.next_cursor = last_value.isoformat() if last_id is None else f"{last_value.isoformat()},{last_id}"
+        return page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """封装统一响应，extra 携带下一页游标"""
+        return api_response(
+            data=data,
+            extra={
+                "page_size": self.page_size_used,
+                "has_next": self.has_next,
+                "next_cursor": self.next_cursor,
+            },
+        )
@@ -1,6 +1,8 @@
 # apps/common/schema_utils.py
 from __future__ import annotations
 
+from functools import lru_cache
+
 from rest_framework import serializers
 from drf_spectacular.utils import inline_serializer, OpenApiParameter
 
@@ -65,9 +67,10 @@ def pagination_meta_serializer():
     )
 
 
-def pagination_parameters() -> list[OpenApiParameter]:
-    """通用分页查询参数"""
-    return [
+@lru_cache(maxsize=None)
+def _pagination_parameter_objects() -> tuple[OpenApiParameter, ...]:
+    """分页参数对象只构造一次，各视图的 extend_schema 共用"""
+    return (
         OpenApiParameter(
             name="page",
             location=OpenApiParameter.QUERY,
@@ -82,7 +85,24 @@ def pagination_parameters() -> list[OpenApiParameter]:
             required=False,
             type=int,
         ),
-    ]
+    )
+
+
+def pagination_parameters() -> list[OpenApiParameter]:
+    """通用分页查询参数（返回新列表，调用方可自由拼接）"""
+    return list(_pagination_parameter_objects())
+
+
+@lru_cache(maxsize=None)
+def cursor_parameter() -> OpenApiParameter:
+    """键集分页游标参数（before），与 KeysetPagination 对应"""
+    return OpenApiParameter(
+        name="before",
+        location=OpenApiParameter.QUERY,
+        description="键集分页游标（上一页返回的 next_cursor），传入后忽略 page 参数",
+        required=False,
+        type=str,
+    )
 
 
 def list_response(
@@ -335,7 +355,7 @@ def announcement_serializer(**kwargs):
                 "contest": serializers.CharField(),
                 "title": serializers.CharField(),
                 "summary": serializers.CharField(),
-                "content": serializers.CharField(),
+                "content": serializers.CharField(required=False, help_text="正文，仅详情/创建接口返回"),
                 "is_active": serializers.BooleanField(),
                 "created_at": serializers.DateTimeField(required=False),
                 "updated_at": serializers.DateTimeField(required=False),
@@ -44,6 +44,15 @@ class AuthenticatedAPIMixin:
         client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
         return client
 
+    def client_as(self, user) -> APIClient:
+        """
+        构造强制认证为指定用户的 APIClient，跳过登录与密码校验，适用于只关注视图逻辑的用例
+        """
+        client = APIClient()
+        client.raise_request_exception = False
+        client.force_authenticate(user=user)
+        return client
+
     # 兼容已有命名
     def _login(self, identifier: str, password: str) -> str:
         return self.api_login(identifier, password)
@@ -13,6 +13,36 @@ def scoreboard_key(contest_id: int) -> str:
     return f"contest:{contest_id}:scoreboard"
 
 
+def contest_row_key(contest_id: int) -> str:
+    """比赛基础信息行缓存键（按主键，slug 变更不影响命中校验）"""
+    return f"contest:{contest_id}:row"
+
+
+def contest_categories_key(contest_id: int) -> str:
+    """比赛题目分类序列化结果缓存键"""
+    return f"contest:{contest_id}:categories"
+
+
+def contest_user_fields_key(contest_id: int, user_id: int) -> str:
+    """比赛列表中当前用户报名/队伍/副状态字段缓存键"""
+    return f"contest:{contest_id}:user_fields:{user_id}"
+
+
+def contest_user_fields_version_key(contest_id: int) -> str:
+    """比赛下用户附加字段缓存的版本号：整场失效时自增，旧版本缓存读取时视为未命中"""
+    return f"contest:{contest_id}:user_fields_version"
+
+
+def user_registered_contests_key(user_id: int) -> str:
+    """用户已报名比赛 id 集合键"""
+    return f"user:{user_id}:contests:registered"
+
+
+def team_member_count_key(team_id: int) -> str:
+    """队伍有效成员数缓存键"""
+    return f"team:{team_id}:member_count"
+
+
 def blood_rank_key(challenge_id: int) -> str:
     """题目血次序计数器键"""
     return f"challenge:{challenge_id}:blood_rank"
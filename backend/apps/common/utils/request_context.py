@@ -3,7 +3,7 @@ from __future__ import annotations
 import contextvars
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
 request_id_ctx: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
 user_id_ctx: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("user_id", default=None)
@@ -106,3 +106,29 @@ def update_request_user(user) -> None:
         ip=current.get("ip", ""),
         user_agent=current.get("user_agent", ""),
     )
+
+
+class UserGate(NamedTuple):
+    """请求级用户身份摘要：id / 是否管理员 / 是否已登录，认证后计算一次供服务层复用"""
+
+    id: int
+    is_staff: bool
+    is_auth: bool
+
+
+ANONYMOUS_GATE = UserGate(0, False, False)
+
+
+def build_user_gate(user: Any) -> UserGate:
+    """根据用户对象计算身份摘要；None 或匿名用户返回 ANONYMOUS_GATE"""
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_GATE
+    return UserGate(user.id, bool(user.is_staff), True)
+
+
+def get_user_gate(user: Any) -> UserGate:
+    """读取认证阶段挂在用户上的身份摘要，缺失时（如测试直接传入用户）即时计算"""
+    gate = getattr(user, "gate", None)
+    if isinstance(gate, UserGate):
+        return gate
+    return build_user_gate(user)
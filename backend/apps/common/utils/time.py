@@ -4,8 +4,18 @@
 
 from __future__ import annotations
 
+import contextvars
 import datetime
-from typing import Union
+from typing import Optional, Union
+
+from django.utils import timezone
+
+_UTC = datetime.timezone.utc
+
+# 请求级统一时间：由 RequestContextMiddleware 在请求开始时写入，结束时清空
+_request_now_ctx: contextvars.ContextVar[Optional[datetime.datetime]] = contextvars.ContextVar(
+    "request_now", default=None
+)
 
 
 def now() -> datetime.datetime:
@@ -23,3 +33,37 @@ def to_timestamp(dt: datetime.datetime) -> int:
 def from_timestamp(ts: Union[int, float]) -> datetime.datetime:
     """从时间戳创建 datetime（UTC），用于反序列化时间字段"""
     return datetime.datetime.fromtimestamp(float(ts), tz=datetime.timezone.utc)
+
+
+def ensure_aware(value: Union[datetime.datetime, str]) -> datetime.datetime:
+    """
+    将 ISO 字符串或 datetime 统一转换为时区感知的 datetime
+    - 前端常见的 "...Z" UTC 字符串走快速路径，直接构造 UTC 时间
+    - 其余 naive 值按 Django 默认时区补齐；格式非法时抛出 ValueError
+    """
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            return datetime.datetime.fromisoformat(value[:-1]).replace(tzinfo=_UTC)
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return timezone.make_aware(value, timezone.get_default_timezone())
+    return value
+
+
+def request_now() -> datetime.datetime:
+    """
+    返回当前请求的统一时间：
+    - HTTP 请求内复用中间件记录的时间点，保证同一响应内状态判断一致
+    - 请求外（Celery/命令行）回退为实时时间
+    """
+    return _request_now_ctx.get() or timezone.now()
+
+
+def set_request_now(value: Optional[datetime.datetime] = None) -> None:
+    """记录请求开始时间，缺省取当前时间"""
+    _request_now_ctx.set(value or timezone.now())
+
+
+def clear_request_now() -> None:
+    """清空请求级时间，避免泄漏到后续请求"""
+    _request_now_ctx.set(None)
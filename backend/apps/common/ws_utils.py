@@ -30,6 +30,9 @@ def _safe_group_send(group: str, payload: dict) -> None:
     layer = get_channel_layer()
     if layer is None:
         return
+    # Redis 通道层在 Redis 宕机时会阻塞至超时，健康检查未通过则直接跳过
+    if type(layer).__module__.startswith("channels_redis") and not redis_client.healthy():
+        return
     try:
         async_to_sync(layer.group_send)(group, {"type": "broadcast", **payload})
     except Exception:
@@ -69,6 +72,15 @@ def broadcast_notify(user_id: int, payload: dict) -> None:
     _safe_group_send(f"user_{user_id}", payload)
 
 
+def broadcast_team(team_id: int, payload: dict) -> None:
+    """
+    向队伍组广播事件：一次发布覆盖全部成员连接
+    - payload 可携带 recipients，由订阅端（NotifyConsumer）按用户过滤
+    """
+    payload = {"seq": next(_seq_generator), **payload}
+    _safe_group_send(f"team_{team_id}", payload)
+
+
 def broadcast_contest(contest_slug: str, payload: dict) -> None:
     """向比赛组广播事件"""
     payload = {"seq": next(_seq_generator), **payload}
@@ -68,6 +68,12 @@ class AdminAuditMixin:
         )
 
 
+def _is_changelist_request(request) -> bool:
+    """判断当前请求是否为列表页：仅列表页裁剪字段，详情页仍需完整字段"""
+    match = getattr(request, "resolver_match", None)
+    return bool(match and (match.url_name or "").endswith("_changelist"))
+
+
 class TeamMemberInline(admin.TabularInline):
     """队伍详情页内联成员管理：集中在队伍页编辑成员与角色"""
 
@@ -78,6 +84,10 @@ class TeamMemberInline(admin.TabularInline):
     readonly_fields = ("joined_at",)
     raw_id_fields = ("user",)
 
+    def get_queryset(self, request):
+        """成员内联逐行展示用户，一次联表取出，避免每行单独查询用户"""
+        return super().get_queryset(request).select_related("user")
+
 
 class ContestAnnouncementAdminForm(forms.ModelForm):
     """比赛公告后台表单：内置字段说明，保证后台展示帮助文字"""
@@ -447,19 +457,21 @@ class ContestAdmin(AdminAuditMixin, admin.ModelAdmin):
                     base.remove(field)
             return tuple(base)
 
-        if getattr(obj, "has_started", False):
+        now = timezone.now()
+        state = obj.compute_state(now)
+        if state["has_started"]:
             for field in ("start_time", "is_team_based"):
                 if field not in base:
                     base.append(field)
             for field in ("registration_start_time", "registration_end_time"):
                 if field not in base:
                     base.append(field)
-        if getattr(obj, "has_ended", False):
+        if state["has_ended"]:
             for field in ("end_time",):
                 if field not in base:
                     base.append(field)
         freeze_time = getattr(obj, "freeze_time", None)
-        if getattr(obj, "has_ended", False) or (freeze_time and timezone.now() >= freeze_time):
+        if state["has_ended"] or (freeze_time and now >= freeze_time):
             if "freeze_time" not in base:
                 base.append("freeze_time")
         return tuple(base)
@@ -610,6 +622,7 @@ class ContestAdmin(AdminAuditMixin, admin.ModelAdmin):
 
     @admin.display(description="状态")
     def status_display(self, obj):
+        # ModelAdmin 为进程内单例，不在实例上存时间；同一请求内各行共用中间件记录的请求时间
         return determine_contest_status(obj)
 
     @admin.display(description="ID", ordering="id")
@@ -783,6 +796,13 @@ class TeamAdmin(AdminAuditMixin, admin.ModelAdmin):
                 form.base_fields[field_name].help_text = text
         return form
 
+    def get_queryset(self, request):
+        """列表页不展示简介，延迟加载长文本字段以减少传输"""
+        qs = super().get_queryset(request)
+        if _is_changelist_request(request):
+            qs = qs.defer("description", "contest__description")
+        return qs
+
     def changelist_view(self, request, extra_context=None):
         # 兼容旧参数 contest_id，并转换为 active_contest 便于使用过滤器
         contest_id = request.GET.get("contest_id")
@@ -809,6 +829,13 @@ class ContestAnnouncementAdmin(AdminAuditMixin, admin.ModelAdmin):
     ordering = ("-created_at",)
     audit_model = "ContestAnnouncement"
 
+    def get_queryset(self, request):
+        """列表页仅读取展示列，避免拉取公告正文与比赛描述"""
+        qs = super().get_queryset(request)
+        if _is_changelist_request(request):
+            qs = qs.only("id", "contest", "title", "is_active", "created_at", "contest__name", "contest__slug")
+        return qs
+
     def get_form(self, request, obj=None, **kwargs):
         """为公告字段添加帮助文字，方便运营编辑"""
         form = super().get_form(request, obj, **kwargs)
@@ -841,6 +868,11 @@ class ContestScoreboardAdmin(AdminAuditMixin, admin.ModelAdmin):
     readonly_fields = ("name", "slug", "scoreboard_full")
     fields = ("name", "slug", "scoreboard_full")
 
+    def get_queryset(self, request):
+        """排行榜仅依赖时间与赛制字段，不读取比赛描述"""
+        qs = super().get_queryset(request)
+        return qs.only("id", "name", "slug", "start_time", "end_time", "freeze_time", "is_team_based")
+
     def has_add_permission(self, request):
         return False
 
@@ -853,8 +885,12 @@ class ContestScoreboardAdmin(AdminAuditMixin, admin.ModelAdmin):
 
     @staticmethod
     def _board(obj) -> list[dict]:
-        service = ScoreboardService()
-        return service.execute(obj, ignore_freeze=True)
+        """同一行的 top1/top2/top3 共享一次榜单计算结果"""
+        board = getattr(obj, "_admin_board", None)
+        if board is None:
+            board = ScoreboardService().execute(obj, ignore_freeze=True)
+            obj._admin_board = board
+        return board
 
     def top1(self, obj):
         board = self._board(obj)
@@ -12,3 +12,7 @@ class ContestsConfig(AppConfig):
     name = 'apps.contests'  # 应用路径
     label = 'contests'  # 应用标签
     verbose_name = "Contests"  # 应用在后台显示的名称
+
+    def ready(self):
+        """加载 signals，注册比赛变更后的缓存失效处理"""
+        from . import signals  # noqa: F401  # 导入即触发信号注册
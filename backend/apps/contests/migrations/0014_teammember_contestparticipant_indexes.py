@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contests', '0013_alter_contest_registration_start_time'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['user', 'is_active', 'team'], name='teammember_user_active_team'),
+        ),
+        migrations.AddIndex(
+            model_name='contestparticipant',
+            index=models.Index(fields=['contest', 'status', 'user'], name='cp_contest_status_user'),
+        ),
+    ]
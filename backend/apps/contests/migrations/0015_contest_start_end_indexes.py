@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contests', '0014_teammember_contestparticipant_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contest',
+            index=models.Index(fields=['-start_time', 'end_time'], name='contest_start_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contest',
+            index=models.Index(fields=['end_time', '-start_time'], name='contest_end_start_idx'),
+        ),
+    ]
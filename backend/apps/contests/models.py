@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+from secrets import token_urlsafe
+
 from django.db import models
+from django.db.models import Case, Value, When
+from django.db.models.functions import Now
 from django.utils import timezone
 from django.conf import settings
-from django.utils.text import slugify
 
 # 模型文件：负责比赛、公告、队伍与队员的数据结构定义，不承载业务流程
 
 User = settings.AUTH_USER_MODEL
 
 
+def contest_status_case(prefix: str = "") -> Case:
+    """
+    比赛状态的数据库表达式（未开始/进行中/已结束）
+
+    说明：
+    - 判定口径与 determine_contest_status 一致：开始前为未开始，结束时间（含）前为进行中
+    - prefix 为关联路径（如 "team__contest__"），便于在关联表查询上按比赛计算状态
+    - 使用数据库 Now()，同一查询内所有行基于同一时间点
+    """
+    now = Now()
+    return Case(
+        When(**{f"{prefix}start_time__gt": now}, then=Value("未开始")),
+        When(**{f"{prefix}end_time__gte": now}, then=Value("进行中")),
+        default=Value("已结束"),
+        output_field=models.CharField(),
+    )
+
+
+class ContestQuerySet(models.QuerySet):
+    """
+    比赛 QuerySet：封装列表场景常用的批量计算
+
+    业务场景：
+    - 比赛列表由数据库统一计算状态，整页共用同一个当前时间
+    """
+
+    def with_status(self):
+        """附加 annotated_status 字段（未开始/进行中/已结束），口径见 contest_status_case"""
+        return self.annotate(annotated_status=contest_status_case())
+
+
 class Contest(models.Model):
     """
     比赛模型：
@@ -54,14 +88,30 @@ class Contest(models.Model):
     # 记录更新时间
     updated_at = models.DateTimeField("更新时间", auto_now=True)
 
+    objects = ContestQuerySet.as_manager()
+
     class Meta:
         ordering = ["-start_time", "name"]
+        indexes = [
+            # 比赛列表按状态过滤并按开始时间倒序：进行中/未开始走前者，已结束走后者
+            models.Index(fields=["-start_time", "end_time"], name="contest_start_end_idx"),
+            models.Index(fields=["end_time", "-start_time"], name="contest_end_start_idx"),
+        ]
         verbose_name = "比赛"
         verbose_name_plural = "比赛"
 
     def __str__(self) -> str:
         return self.name
 
+    def compute_state(self, now=None) -> dict[str, bool]:
+        """一次读取时钟计算比赛状态标记，列表等批量场景可传入统一的 now"""
+        now = now or timezone.now()
+        return {
+            "is_active": self.start_time <= now <= self.end_time,
+            "has_started": now >= self.start_time,
+            "has_ended": now > self.end_time,
+        }
+
     @property
     def is_active(self) -> bool:
         """比赛是否进行中：用于接口展示和状态校验"""
@@ -128,8 +178,8 @@ class ContestAnnouncement(models.Model):
 
 
 def default_invite_token() -> str:
-    """默认邀请码生成器：使用时间戳 slug，保证初始可用"""
-    return slugify(timezone.now().isoformat())[:12]
+    """默认邀请码生成器：随机 URL 安全字符串（12 位），避免同一时刻生成重复邀请码"""
+    return token_urlsafe(9)
 
 
 class Team(models.Model):
@@ -204,6 +254,8 @@ class TeamMember(models.Model):
         indexes = [
             models.Index(fields=["team", "is_active"]),
             models.Index(fields=["team", "user", "is_active"]),
+            # 按用户查询有效队伍关系（get_membership）
+            models.Index(fields=["user", "is_active", "team"], name="teammember_user_active_team"),
         ]
         verbose_name = "参赛队伍成员"
         verbose_name_plural = "参赛队伍成员"
@@ -237,6 +289,8 @@ class ContestParticipant(models.Model):
         indexes = [
             models.Index(fields=["contest", "status"]),
             models.Index(fields=["user", "status"]),
+            # 按状态列出参赛选手（list_by_status）
+            models.Index(fields=["contest", "status", "user"], name="cp_contest_status_user"),
         ]
         verbose_name = "比赛参与记录"
         verbose_name_plural = "比赛参与记录"
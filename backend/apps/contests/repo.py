@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import json
+from functools import lru_cache
 from typing import Any, Optional
 
-from django.db import transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
 from django.utils.text import slugify
-from django.db.models import QuerySet
+from django.db.models import OuterRef, Prefetch, QuerySet, Subquery
 
 from apps.common.base.base_repo import BaseRepo
 from apps.common.exceptions import NotFoundError, ConflictError
+from apps.common.infra import redis_client
+from apps.common.pagination import keyset_filter
+from apps.common.utils.redis_keys import (
+    contest_row_key,
+    team_member_count_key,
+    user_registered_contests_key,
+)
 
 from .models import Contest, Team, TeamMember, ContestAnnouncement, ContestParticipant
 from apps.accounts.models import User
@@ -16,15 +28,139 @@ from apps.accounts.models import User
 # 仓储层：封装比赛、公告、队伍的 ORM 访问，提供业务友好的查询与写入
 
 
+@lru_cache(maxsize=256)
+def _slug_to_pk(slug: str) -> int:
+    """slug -> 主键的进程内缓存；未命中抛 DoesNotExist（异常不会被 lru_cache 缓存）"""
+    pk = Contest.objects.filter(slug=slug).values_list("pk", flat=True).first()  # type: ignore[attr-defined]
+    if pk is None:
+        raise Contest.DoesNotExist  # type: ignore[attr-defined]
+    return pk
+
+
+def clear_slug_cache() -> None:
+    """比赛保存/删除后清空 slug 映射缓存，由 signals 调用"""
+    _slug_to_pk.cache_clear()
+
+
+@lru_cache(maxsize=4096)
+def team_contest_id(team_id: int) -> int:
+    """队伍 id -> 所属比赛 id 的进程内缓存（队伍创建后不会更换比赛）；队伍不存在时抛 DoesNotExist"""
+    contest_id = Team.objects.filter(pk=team_id).values_list("contest_id", flat=True).first()  # type: ignore[attr-defined]
+    if contest_id is None:
+        raise Team.DoesNotExist  # type: ignore[attr-defined]
+    return contest_id
+
+
+# 比赛行缓存的字段清单与需要还原的时间字段
+_CONTEST_FIELDS = tuple(Contest._meta.concrete_fields)  # type: ignore[attr-defined]
+_CONTEST_DATETIME_FIELDS = frozenset(
+    f.attname for f in _CONTEST_FIELDS if isinstance(f, models.DateTimeField)
+)
+
+
 class ContestRepo(BaseRepo[Contest]):
     """比赛仓储：提供 slug 查询等快捷方法"""
     model = Contest
 
-    def get_by_slug(self, slug: str) -> Contest:
-        """通过 slug 获取比赛，未找到抛业务级 404"""
+    #: 轻量查询字段：仅覆盖鉴权与状态判断所需列，不读取比赛描述
+    LIGHT_FIELDS = (
+        "id",
+        "slug",
+        "name",
+        "start_time",
+        "end_time",
+        "freeze_time",
+        "is_team_based",
+        "visibility",
+    )
+
+    #: 列表摘要字段：与 serialize_contest 输出一一对应，不读取创建/更新时间等列表用不到的列
+    SUMMARY_FIELDS = (
+        "id",
+        "name",
+        "slug",
+        "description",
+        "visibility",
+        "start_time",
+        "end_time",
+        "freeze_time",
+        "registration_start_time",
+        "registration_end_time",
+        "is_team_based",
+        "max_team_members",
+    )
+
+    #: 比赛行缓存时长（秒）；比赛保存/删除时由 signals 主动失效
+    ROW_CACHE_TTL = 300
+
+    def get_by_slug(self, slug: str, *, cached: bool = True) -> Contest:
+        """
+        通过 slug 获取比赛，未找到抛业务级 404
+        - cached=True：优先读取 Redis 中的比赛行缓存，未命中回源并回填
+        - 需要在最新数据上修改比赛时传 cached=False 直接读库
+        """
         # 提供统一的比赛获取入口，视图与服务层复用
+        if cached:
+            try:
+                contest = self._load_cached_row(_slug_to_pk(slug))
+            except Contest.DoesNotExist:  # type: ignore[attr-defined]
+                contest = None
+            # slug 已被其他进程修改时缓存行与入参不一致，按未命中处理
+            if contest is not None and contest.slug == slug:
+                return contest
+        contest = self._get_by_slug(slug, queryset=self.get_queryset())
+        if cached:
+            self._store_cached_row(contest)
+        return contest
+
+    @staticmethod
+    def _load_cached_row(pk: int) -> Optional[Contest]:
+        """从 Redis 还原比赛实例（from_db 构造，后续可正常保存）；缺失或解析失败返回 None"""
+        raw = redis_client.get(contest_row_key(pk))
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            names = [f.attname for f in _CONTEST_FIELDS]
+            values = [
+                parse_datetime(data[name]) if name in _CONTEST_DATETIME_FIELDS and data[name] else data[name]
+                for name in names
+            ]
+        except (TypeError, ValueError, KeyError):
+            return None
+        return Contest.from_db(DEFAULT_DB_ALIAS, names, values)  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _store_cached_row(contest: Contest) -> None:
+        """将比赛全部字段写入 Redis 行缓存"""
+        data = {f.attname: getattr(contest, f.attname) for f in _CONTEST_FIELDS}
+        redis_client.set(
+            contest_row_key(contest.pk),
+            json.dumps(data, cls=DjangoJSONEncoder),
+            ex=ContestRepo.ROW_CACHE_TTL,
+        )
+
+    @staticmethod
+    def clear_cached_row(pk: int) -> None:
+        """失效比赛行缓存，由 signals 在比赛保存/删除后调用"""
+        redis_client.delete(contest_row_key(pk))
+
+    def get_by_slug_light(self, slug: str) -> Contest:
+        """通过 slug 获取仅含鉴权/状态字段的比赛，用于不需要描述等长字段的接口"""
+        return self._get_by_slug(slug, queryset=self.get_queryset().only(*self.LIGHT_FIELDS))
+
+    @staticmethod
+    def _get_by_slug(slug: str, *, queryset: QuerySet[Contest]) -> Contest:
+        """先走 slug -> 主键缓存再按主键读取；其他进程修改 slug 导致缓存过期时回源重查"""
+        try:
+            contest = queryset.get(pk=_slug_to_pk(slug))
+            if contest.slug == slug:
+                return contest
+        except Contest.DoesNotExist:  # type: ignore[attr-defined]
+            pass
+        clear_slug_cache()
         try:
-            return self.filter(slug=slug).get()
+            return queryset.get(pk=_slug_to_pk(slug))
         except Contest.DoesNotExist as exc:  # type: ignore[attr-defined]
             raise NotFoundError(message="比赛不存在") from exc
 
@@ -34,10 +170,48 @@ class ContestAnnouncementRepo(BaseRepo[ContestAnnouncement]):
 
     model = ContestAnnouncement
 
-    def list_active(self, contest: Contest):
-        """获取比赛下所有有效公告，按创建时间倒序"""
+    #: 列表序列化所需字段：关联比赛仅取 slug，正文留给详情接口，列表只展示摘要
+    LIST_FIELDS = (
+        "id",
+        "contest",
+        "title",
+        "summary",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "contest__slug",
+    )
+
+    #: 只读列表的取值字段：比赛由调用方给定，不再关联比赛表；同样不读取正文
+    VALUE_FIELDS = ("id", "title", "summary", "is_active", "created_at", "updated_at")
+
+    def list_active(
+            self,
+            contest: Contest,
+            *,
+            before=None,
+            before_id: int | None = None,
+            limit: int | None = None,
+            as_values: bool = False,
+    ):
+        """
+        获取比赛下有效公告，按 (创建时间, id) 倒序
+        - before/before_id：键集分页游标，仅返回 (created_at, id) 早于游标的公告（命中 contest/is_active/created_at 索引）
+        - limit：给定时直接返回列表，未给定时返回 QuerySet 供调用方继续分页
+        - as_values：返回字典行（VALUE_FIELDS），只读列表不构造模型实例
+        """
         # 仅返回 is_active=True 的公告，供前台列表展示
-        return self.filter(contest=contest, is_active=True).select_related("contest").order_by("-created_at")
+        qs = self.filter(contest=contest, is_active=True)
+        if as_values:
+            qs = qs.values(*self.VALUE_FIELDS)
+        else:
+            qs = qs.select_related("contest").only(*self.LIST_FIELDS)
+        if before is not None:
+            qs = qs.filter(keyset_filter("created_at", before, before_id))
+        qs = qs.order_by("-created_at", "-id")
+        if limit is not None:
+            return list(qs[:limit])
+        return qs
 
     def get_by_id(self, pk: Any, *, queryset: Optional[QuerySet[ContestAnnouncement]] = None) -> ContestAnnouncement:
         """根据 ID 获取公告，未找到抛业务级 404"""
@@ -91,6 +265,17 @@ class TeamRepo(BaseRepo[Team]):
         """常用列表查询带上外键，减少 N+1"""
         return self.filter(**kwargs).select_related("contest", "captain")
 
+    @staticmethod
+    def prefetch_active_members(queryset: QuerySet[Team]) -> QuerySet[Team]:
+        """为队伍列表批量预取有效成员（含用户），结果挂在 members_prefetched 上供序列化使用"""
+        return queryset.prefetch_related(
+            Prefetch(
+                "members",
+                queryset=TeamMember.objects.filter(is_active=True).select_related("user").order_by("joined_at", "id"),
+                to_attr="members_prefetched",
+            )
+        )
+
     @staticmethod
     def reset_invite_token(team: Team, *, token: str) -> Team:
         """重置队伍邀请码"""
@@ -126,17 +311,69 @@ class TeamMemberRepo(BaseRepo[TeamMember]):
             .first()
         )
 
+    # 成员数缓存时长：写入后由信号失效，TTL 兜底并发回填的旧值
+    MEMBER_COUNT_CACHE_TTL = 60
+
+    def active_count(self, team: Team) -> int:
+        """
+        获取队伍有效成员数：
+        - 优先读取 Redis 计数缓存
+        - 未命中或 Redis 不可用时回退 SQL COUNT，并以 SET NX 回填
+        """
+        key = team_member_count_key(team.id)
+        cached = redis_client.get(key)
+        if cached is not None:
+            try:
+                return int(cached)
+            except (TypeError, ValueError):
+                pass
+        count = team.member_count
+        redis_client.set(key, count, ex=self.MEMBER_COUNT_CACHE_TTL, nx=True)
+        return count
+
     @transaction.atomic
     def remove_member(self, membership: TeamMember) -> None:
         """移除成员：在事务内标记失效，供退出/解散使用"""
         membership.is_active = False
         membership.save(update_fields=["is_active"])
 
+    def deactivate_all(self, team: Team) -> int:
+        """
+        单条 UPDATE 将队伍全部有效成员标记失效，返回影响行数
+        - 批量更新不触发 post_save 信号，成员数缓存在此显式清除（提交后再清一次）
+        """
+        updated = self.filter(team=team, is_active=True).update(is_active=False)
+        self.invalidate_active_count(team.id)
+        return updated
+
+    @staticmethod
+    def invalidate_active_count(team_id: int) -> None:
+        """
+        清除队伍成员数缓存：供不触发 post_save 的批量 UPDATE 使用
+        - 立即清一次，提交后再清一次，避免事务内回填的旧计数残留
+        """
+        key = team_member_count_key(team_id)
+        redis_client.delete(key)
+        transaction.on_commit(lambda: redis_client.delete(key))
+
     def active_members(self, team: Team):
         """获取队伍当前有效成员列表，常用于解散或统计"""
         # 获取队伍当前有效成员列表
         return self.filter(team=team, is_active=True).select_related("user", "team", "team__contest")
 
+    def active_member_rows(self, team: Team):
+        """获取队伍有效成员的精简行（仅序列化所需列 + 用户名），供快照与通知共用一次查询"""
+        return (
+            self.filter(team=team, is_active=True)
+            .select_related("user")
+            .only("id", "team_id", "user_id", "role", "is_active", "joined_at", "user__username")
+            .order_by("joined_at", "id")
+        )
+
+    def active_member_user_ids(self, team: Team):
+        """仅获取队伍有效成员的用户 id，供通知扇出使用，无需联表加载用户"""
+        return self.filter(team=team, is_active=True).values_list("user_id", flat=True)
+
 
 class ContestParticipantRepo(BaseRepo[ContestParticipant]):
     """比赛参与仓储：记录用户参赛状态，供后台筛选与展示"""
@@ -148,6 +385,29 @@ class ContestParticipantRepo(BaseRepo[ContestParticipant]):
         ContestParticipant.Status.FINISHED: 3,
     }
 
+    # 已报名集合缓存时长；报名记录几乎只增不减，删除时由信号移除
+    REGISTERED_CACHE_TTL = 3600
+
+    def is_registered(self, contest: Contest, user: User) -> bool:
+        """
+        判断用户是否已报名：
+        - 先查 Redis 已报名集合，命中直接返回
+        - 未命中或 Redis 不可用时回退 DB，并将已报名结果回填集合
+        """
+        key = user_registered_contests_key(user.id)
+        if redis_client.sismember(key, contest.id):
+            return True
+        registered = self.filter(contest=contest, user=user).exists()
+        if registered:
+            redis_client.sadd(key, contest.id, ex=self.REGISTERED_CACHE_TTL)
+        return registered
+
+    def _remember_registered(self, contest: Contest, user: User) -> None:
+        """事务提交后写入已报名集合，避免回滚后缓存残留"""
+        key = user_registered_contests_key(user.id)
+        contest_id = contest.id
+        transaction.on_commit(lambda: redis_client.sadd(key, contest_id, ex=self.REGISTERED_CACHE_TTL))
+
     def ensure_status(self, contest: Contest, user: User, status: str, *, is_valid: bool | None = None) -> ContestParticipant:
         """确保存在参与记录，并按优先级更新状态/有效标记"""
         defaults = {"status": status}
@@ -157,7 +417,95 @@ class ContestParticipantRepo(BaseRepo[ContestParticipant]):
             contest=contest, user=user, defaults=defaults
         )
         if created:
+            self._remember_registered(contest, user)
             return obj
+        return self.update_status(obj, status, is_valid=is_valid)
+
+    #: 随成员关系一并取出的报名字段（子查询注解 -> 还原为 ContestParticipant）
+    CONTEXT_FIELDS = ("id", "status", "is_valid")
+
+    def _participant_from_context(self, contest_id: int, user_id: int, values) -> ContestParticipant:
+        """
+        由子查询注解还原报名记录（其余列延迟加载）：
+        - from_db 按模型具体字段顺序逐个对位赋值，列名与取值须按该顺序排列，否则主键/外键会错位
+        - 还原后的对象可直接 save(update_fields=...)，写回的就是这条报名记录
+        """
+        loaded = {"contest_id": contest_id, "user_id": user_id, **dict(zip(self.CONTEXT_FIELDS, values))}
+        names = [f.attname for f in self.model._meta.concrete_fields if f.attname in loaded]  # type: ignore[attr-defined]
+        return self.model.from_db(DEFAULT_DB_ALIAS, names, [loaded[name] for name in names])  # type: ignore[attr-defined]
+
+    def get_context(self, contest: Contest, user: User) -> tuple[Optional[ContestParticipant], Optional[TeamMember]]:
+        """
+        一次查询取出用户在比赛中的报名记录与有效队伍关系：
+        - 以成员关系为主查询（联表队伍/比赛/用户），报名字段通过子查询注解带出
+        - 用户未组队时回退为单独查询报名记录，两种情况均只发出一条 SQL
+        """
+        participant_qs = self.model.objects.filter(contest=contest, user=user)  # type: ignore[attr-defined]
+        membership = (
+            TeamMember.objects.filter(team__contest=contest, user=user, is_active=True)  # type: ignore[attr-defined]
+            .select_related("team", "team__contest", "user")
+            .annotate(
+                **{
+                    f"participant_{name}": Subquery(participant_qs.values(name)[:1])
+                    for name in self.CONTEXT_FIELDS
+                }
+            )
+            .first()
+        )
+        if membership is None:
+            return participant_qs.first(), None
+        if membership.participant_id is None:
+            return None, membership
+        participant = self._participant_from_context(
+            contest.id,
+            user.id,
+            [getattr(membership, f"participant_{name}") for name in self.CONTEXT_FIELDS],
+        )
+        return participant, membership
+
+    def bulk_context(
+            self, contest_ids: list[int], user_id: int
+    ) -> dict[int, tuple[Optional[ContestParticipant], Optional[TeamMember]]]:
+        """
+        一次查询取出用户在多场比赛中的报名记录与有效队伍关系（比赛 id -> (报名, 成员)）：
+        - 以比赛为主查询，报名字段与所在队伍 id/名称均通过相关子查询注解带出
+        - 还原的对象仅含附加字段构造所需的列（报名 status/is_valid，队伍 id/名称）
+        """
+        participant_qs = self.model.objects.filter(contest=OuterRef("pk"), user_id=user_id)  # type: ignore[attr-defined]
+        member_qs = TeamMember.objects.filter(  # type: ignore[attr-defined]
+            team__contest=OuterRef("pk"), user_id=user_id, is_active=True
+        )
+        rows = (
+            Contest.objects.filter(id__in=contest_ids)  # type: ignore[attr-defined]
+            .annotate(
+                **{
+                    f"participant_{name}": Subquery(participant_qs.values(name)[:1])
+                    for name in self.CONTEXT_FIELDS
+                },
+                member_team_id=Subquery(member_qs.values("team_id")[:1]),
+                member_team_name=Subquery(member_qs.values("team__name")[:1]),
+            )
+            .values_list(
+                "id",
+                *(f"participant_{name}" for name in self.CONTEXT_FIELDS),
+                "member_team_id",
+                "member_team_name",
+            )
+        )
+        result: dict[int, tuple[Optional[ContestParticipant], Optional[TeamMember]]] = {}
+        for contest_id, *participant_values, team_id, team_name in rows:
+            participant = None
+            if participant_values[0] is not None:
+                participant = self._participant_from_context(contest_id, user_id, participant_values)
+            membership = None
+            if team_id is not None:
+                membership = TeamMember(user_id=user_id, is_active=True)
+                membership.team = Team(id=team_id, name=team_name, contest_id=contest_id)
+            result[contest_id] = (participant, membership)
+        return result
+
+    def update_status(self, obj: ContestParticipant, status: str, *, is_valid: bool | None = None) -> ContestParticipant:
+        """在已有参与记录上按优先级推进状态/更新有效标记，无变化时不写库"""
         current_priority = self.STATUS_PRIORITY.get(obj.status, 0)
         new_priority = self.STATUS_PRIORITY.get(status, 0)
         changed = False
@@ -171,6 +519,29 @@ class ContestParticipantRepo(BaseRepo[ContestParticipant]):
             obj.save(update_fields=["status", "is_valid", "updated_at"])
         return obj
 
+    def bulk_promote(self, contest: Contest, from_statuses: list[str], to_status: str) -> int:
+        """批量推进参与状态：单条 UPDATE 完成，返回受影响行数"""
+        return self.filter(contest=contest, status__in=from_statuses).update(
+            status=to_status,
+            updated_at=timezone.now(),
+        )
+
+    def bulk_ensure(self, contest: Contest, users: list[User], status: str) -> None:
+        """批量确保参与记录存在：缺失的批量插入，已有记录仅按优先级向前推进"""
+        if not users:
+            return
+        self.model.objects.bulk_create(  # type: ignore[attr-defined]
+            [self.model(contest=contest, user=user, status=status) for user in users],
+            ignore_conflicts=True,
+        )
+        new_priority = self.STATUS_PRIORITY.get(status, 0)
+        lower_statuses = [key for key, priority in self.STATUS_PRIORITY.items() if priority < new_priority]
+        if lower_statuses:
+            self.filter(contest=contest, user__in=users, status__in=lower_statuses).update(
+                status=status,
+                updated_at=timezone.now(),
+            )
+
     def list_by_status(self, *, contest: Contest, status: str):
         """按状态列出参赛记录"""
         return (
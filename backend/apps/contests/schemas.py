@@ -6,17 +6,16 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import ClassVar, Optional
 
-from django.utils import timezone
-
 from apps.common.base.base_schema import BaseSchema
 from apps.common.exceptions import ValidationError
+from apps.common.utils.time import ensure_aware
 from apps.common.utils.validators import forbid_dangerous_html
 
 
 # Schema 层：负责请求入参的结构化与校验，禁止写业务逻辑
 
 
-@dataclass
+@dataclass(slots=True)
 class ContestCreateSchema(BaseSchema[None]):
     """
     创建比赛入参：
@@ -24,6 +23,23 @@ class ContestCreateSchema(BaseSchema[None]):
     - 自动校验时间合法性与人数上限
     """
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("name", "比赛名称不能为空"),
+        ("slug", "比赛标识不能为空"),
+    )
+    DB_FIELDS: ClassVar[tuple[str, ...]] = (
+        "name",
+        "slug",
+        "description",
+        "visibility",
+        "start_time",
+        "end_time",
+        "freeze_time",
+        "registration_start_time",
+        "registration_end_time",
+        "is_team_based",
+        "max_team_members",
+    )
     # 比赛名称
     name: str
     # 比赛标识 slug
@@ -53,21 +69,15 @@ class ContestCreateSchema(BaseSchema[None]):
 
         def ensure_dt(value: datetime | str | None) -> datetime:
             # 将字符串或 naive datetime 统一转换为时区感知的 datetime
-            if isinstance(value, str):
-                dt = datetime.fromisoformat(value)
-            else:
-                dt = value  # type: ignore[assignment]
-            if dt is None:
+            if value is None:
                 raise ValidationError(message="须指定比赛的开始和结束时间")
-            if timezone.is_naive(dt):
-                dt = timezone.make_aware(dt, timezone.get_default_timezone())
-            return dt
+            try:
+                return ensure_aware(value)
+            except ValueError as exc:
+                raise ValidationError(message="时间格式不正确") from exc
 
-        if not self.name:
-            raise ValidationError(message="比赛名称不能为空")
+        self.check_required()
         forbid_dangerous_html(self.name, field_name="比赛名称")
-        if not self.slug:
-            raise ValidationError(message="比赛标识不能为空")
         if self.description:
             forbid_dangerous_html(self.description, field_name="比赛描述")
         self.start_time = ensure_dt(self.start_time)
@@ -90,23 +100,29 @@ class ContestCreateSchema(BaseSchema[None]):
                 raise ValidationError(message="封榜时间必须介于比赛时间范围内")
         if self.max_team_members < 1:
             raise ValidationError(message="队伍人数下限为 1")
-        cleaned_categories: list[str] = []
-        for name in self.categories:
-            name_str = str(name).strip()
-            if not name_str:
-                continue
-            if name_str in cleaned_categories:
-                continue
-            cleaned_categories.append(name_str)
-        self.categories = cleaned_categories
-
-
-@dataclass
+        # dict.fromkeys 保序去重，避免列表 in 判断带来的 O(n²) 扫描
+        self.categories = list(dict.fromkeys(s for s in (str(n).strip() for n in self.categories) if s))
+
+
+@dataclass(slots=True)
 class ContestUpdateSchema(BaseSchema[None]):
     """
     更新比赛入参：支持部分字段更新，校验时间顺序与人数上限
     """
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (("contest_slug", "缺少比赛标识"),)
+    DB_FIELDS: ClassVar[tuple[str, ...]] = (
+        "name",
+        "description",
+        "visibility",
+        "start_time",
+        "end_time",
+        "freeze_time",
+        "registration_start_time",
+        "registration_end_time",
+        "is_team_based",
+        "max_team_members",
+    )
     # 比赛标识
     contest_slug: str
     # 比赛名称
@@ -131,8 +147,7 @@ class ContestUpdateSchema(BaseSchema[None]):
 
     def validate(self) -> None:
         """基础校验：确保存在比赛标识，队伍人数合法"""
-        if not self.contest_slug:
-            raise ValidationError(message="缺少比赛标识")
+        self.check_required()
         if self.name:
             forbid_dangerous_html(self.name, field_name="比赛名称")
         if self.description:
@@ -141,12 +156,19 @@ class ContestUpdateSchema(BaseSchema[None]):
             raise ValidationError(message="队伍人数下限为 1")
 
 
-@dataclass
+@dataclass(slots=True)
 class AnnouncementCreateSchema(BaseSchema[None]):
     """
     创建或维护比赛公告的入参
     """
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("contest_slug", "缺少比赛标识"),
+        ("title", "公告标题不能为空"),
+        ("summary", "公告摘要不能为空"),
+        ("content", "公告内容不能为空"),
+    )
+    DB_FIELDS: ClassVar[tuple[str, ...]] = ("title", "summary", "content", "is_active")
     # 比赛标识
     contest_slug: str
     # 公告标题
@@ -160,23 +182,17 @@ class AnnouncementCreateSchema(BaseSchema[None]):
 
     def validate(self) -> None:
         """校验公告基础字段"""
-        if not self.contest_slug:
-            raise ValidationError(message="缺少比赛标识")
-        if not self.title:
-            raise ValidationError(message="公告标题不能为空")
+        self.check_required()
         forbid_dangerous_html(self.title, field_name="公告标题")
-        if not self.summary:
-            raise ValidationError(message="公告摘要不能为空")
         forbid_dangerous_html(self.summary, field_name="公告摘要")
-        if not self.content:
-            raise ValidationError(message="公告内容不能为空")
         forbid_dangerous_html(self.content, field_name="公告内容")
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamCreateSchema(BaseSchema[None]):
     """创建队伍入参：包含比赛标识与队伍信息"""
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (("name", "队伍名称不能为空"),)
     # 比赛标识
     contest_slug: str
     # 队伍名称
@@ -186,17 +202,17 @@ class TeamCreateSchema(BaseSchema[None]):
 
     def validate(self) -> None:
         """校验队伍名称必填"""
-        if not self.name:
-            raise ValidationError(message="队伍名称不能为空")
+        self.check_required()
         forbid_dangerous_html(self.name, field_name="队伍名称")
         if self.description:
             forbid_dangerous_html(self.description, field_name="队伍简介")
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamJoinSchema(BaseSchema[None]):
     """加入队伍入参：通过比赛标识与邀请码"""
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (("invite_token", "请输入队伍邀请码"),)
     # 比赛标识
     contest_slug: str
     # 队伍邀请码
@@ -204,24 +220,23 @@ class TeamJoinSchema(BaseSchema[None]):
 
     def validate(self) -> None:
         """校验邀请码必填"""
-        if not self.invite_token:
-            raise ValidationError(message="请输入队伍邀请码")
+        self.check_required()
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamLeaveSchema(BaseSchema[None]):
     """退出队伍入参：仅需比赛标识"""
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (("contest_slug", "缺少比赛标识"),)
     # 比赛标识
     contest_slug: str
 
     def validate(self) -> None:
         """校验比赛标识必填"""
-        if not self.contest_slug:
-            raise ValidationError(message="缺少比赛标识")
+        self.check_required()
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamDisbandSchema(BaseSchema[None]):
     """解散队伍入参：仅管理员或队长使用"""
     auto_validate: ClassVar[bool] = True
@@ -234,7 +249,7 @@ class TeamDisbandSchema(BaseSchema[None]):
             raise ValidationError(message="非法的队伍 ID")
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamInviteResetSchema(BaseSchema[None]):
     """
     重置队伍邀请码入参
@@ -249,7 +264,7 @@ class TeamInviteResetSchema(BaseSchema[None]):
             raise ValidationError(message="非法的队伍 ID")
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamTransferSchema(BaseSchema[None]):
     """
     队长移交入参
@@ -268,25 +283,17 @@ class TeamTransferSchema(BaseSchema[None]):
             raise ValidationError(message="非法的队员 ID")
 
 
-@dataclass
+@dataclass(slots=True)
 class ContestCategoryUpdateSchema(BaseSchema[None]):
     """
     比赛题目分类更新入参：列表传入分类名称集合
     """
 
     auto_validate: ClassVar[bool] = True
+    REQUIRED_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (("contest_slug", "缺少比赛标识"),)
     contest_slug: str
     categories: list[str] = field(default_factory=list)
 
     def validate(self) -> None:
-        if not self.contest_slug:
-            raise ValidationError(message="缺少比赛标识")
-        cleaned: list[str] = []
-        for name in self.categories:
-            value = str(name).strip()
-            if not value:
-                continue
-            if value in cleaned:
-                continue
-            cleaned.append(value)
-        self.categories = cleaned
+        self.check_required()
+        self.categories = list(dict.fromkeys(s for s in (str(n).strip() for n in self.categories) if s))
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-import secrets
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+from operator import attrgetter
 from typing import Optional
 
 from datetime import datetime
@@ -14,8 +20,10 @@ from apps.common.exceptions import (
     NotFoundError,
     ConflictError,
     PermissionDeniedError,
+    CacheUnavailableError,
 )
 from django.db import transaction
+from django.db.models import Case, Count, Max, Sum, Value, When
 from apps.accounts.models import User
 from apps.challenges.models import ChallengeSolve
 from apps.challenges.repo import (
@@ -27,14 +35,21 @@ from apps.challenges.repo import (
 from apps.challenges.serializers import serialize_challenge, serialize_category
 from apps.submissions.repo import SubmissionRepo
 from apps.common.infra import redis_client
-from apps.common.utils.redis_keys import scoreboard_key
+from apps.common.utils.redis_keys import (
+    contest_categories_key,
+    contest_user_fields_key,
+    contest_user_fields_version_key,
+    scoreboard_key,
+)
+from apps.common.utils.request_context import UserGate, get_user_gate
+from apps.common.utils.time import ensure_aware, request_now
 from apps.common.ws_utils import broadcast_contest, broadcast_notify
 from apps.common.infra.logger import get_logger, logger_extra
 from apps.notifications.services import fanout_notifications, build_dedup_key
 from apps.notifications.models import Notification
 from apps.accounts.models import User
 
-from .models import Contest, Team, TeamMember, ContestAnnouncement, ContestParticipant
+from .models import Contest, Team, TeamMember, ContestAnnouncement, ContestParticipant, default_invite_token
 from .repo import (
     ContestRepo,
     TeamRepo,
@@ -60,9 +75,62 @@ from .schemas import (
 logger = get_logger(__name__)
 
 
-def _get_id(obj):
-    """安全获取对象 id，避免静态分析器误报"""
-    return getattr(obj, "id", None)
+# 序列化字段清单：attrgetter 一次取出全部属性，避免逐字段 getattr 与字典字面量构造
+_CONTEST_KEYS = (
+    "id",
+    "name",
+    "slug",
+    "description",
+    "visibility",
+    "start_time",
+    "end_time",
+    "freeze_time",
+    "registration_start_time",
+    "registration_end_time",
+    "is_team_based",
+    "max_team_members",
+    "is_active",
+)
+_get_contest_fields = attrgetter(*_CONTEST_KEYS)
+_ANNOUNCEMENT_KEYS = ("id", "title", "summary", "content", "is_active", "created_at", "updated_at")
+_get_announcement_fields = attrgetter(*_ANNOUNCEMENT_KEYS)
+# 列表只展示摘要，不返回正文（正文见公告详情）
+_ANNOUNCEMENT_LIST_KEYS = tuple(key for key in _ANNOUNCEMENT_KEYS if key != "content")
+_TEAM_KEYS = ("id", "name", "slug", "description", "captain_id", "invite_token", "is_active")
+_get_team_fields = attrgetter(*_TEAM_KEYS)
+_TEAM_MEMBER_KEYS = ("role", "is_active", "joined_at")
+_get_team_member_fields = attrgetter(*_TEAM_MEMBER_KEYS)
+# 仓储无状态，序列化未注入仓储时共用该实例，避免逐队构造
+_shared_member_repo = TeamMemberRepo()
+
+
+# 副状态判定：比赛时间阶段（未封榜/封榜中/已结束）
+_PHASE_OPEN, _PHASE_FROZEN, _PHASE_FINISHED = 0, 1, 2
+
+
+def _resolve_badge(registered: bool, team_missing: bool, reg_closed: bool, before_start: bool, phase: int) -> str:
+    """副状态判定规则，按优先级自上而下；仅在导入时展开为 _BADGE_TABLE"""
+    if not registered:
+        # 未报名场景：区分报名是否已截止
+        return "registration_closed" if reg_closed and before_start else "unregistered"
+    if team_missing and reg_closed:
+        return "registration_invalid"
+    if team_missing and before_start:
+        return "team_missing"
+    if phase == _PHASE_FROZEN:
+        return "frozen"
+    if phase == _PHASE_FINISHED:
+        return "finished"
+    return "registered"
+
+
+# (已报名, 缺少队伍, 报名已截止, 未开赛, 阶段) -> 副状态；运行时只做一次查表
+_BADGE_TABLE: dict[tuple[bool, bool, bool, bool, int], str] = {
+    key: _resolve_badge(*key)
+    for key in product(
+        (False, True), (False, True), (False, True), (False, True), (_PHASE_OPEN, _PHASE_FROZEN, _PHASE_FINISHED)
+    )
+}
 
 
 def determine_contest_status(contest: Contest, *, now: datetime | None = None) -> str:
@@ -72,7 +140,7 @@ def determine_contest_status(contest: Contest, *, now: datetime | None = None) -
     - 进行中：已开赛且未结束
     - 已结束：当前时间晚于结束时间
     """
-    reference = now or timezone.now()
+    reference = now or request_now()
     if reference < contest.start_time:
         return "未开始"
     if reference <= contest.end_time:
@@ -84,73 +152,83 @@ def serialize_contest(
         contest: Contest,
         *,
         categories: list | None = None,
+        category_payload: list[dict] | None = None,
+        extra: dict | None = None,
 ) -> dict:
     """比赛序列化：提供比赛基础信息与状态，用于 API 返回"""
-    data = {
-        "id": getattr(contest, "id", None),
-        "name": contest.name,
-        "slug": contest.slug,
-        "description": contest.description,
-        "visibility": contest.visibility,
-        "start_time": contest.start_time,
-        "end_time": contest.end_time,
-        "freeze_time": contest.freeze_time,
-        "registration_start_time": contest.registration_start_time,
-        "registration_end_time": contest.registration_end_time,
-        "is_team_based": contest.is_team_based,
-        "max_team_members": contest.max_team_members,
-        "is_active": contest.is_active,
-        "status": determine_contest_status(contest),
-    }
-    if categories is not None:
+    data = dict(zip(_CONTEST_KEYS, _get_contest_fields(contest)))
+    # 列表查询已由数据库附加状态时直接复用，否则按当前时间计算
+    data["status"] = getattr(contest, "annotated_status", None) or determine_contest_status(contest)
+    if category_payload is not None:
+        # 已序列化（通常来自缓存）的分类直接复用
+        data["categories"] = category_payload
+    elif categories is not None:
         data["categories"] = [serialize_category(cat) for cat in categories]
+    if extra:
+        # 附加字段（如当前用户的报名/队伍标记）直接并入，避免调用方二次遍历
+        data.update(extra)
     return data
 
 
 def serialize_announcement(announcement: ContestAnnouncement) -> dict:
     """公告序列化：返回基础信息与时间戳"""
-    return {
-        "id": getattr(announcement, "id", None),
-        "contest": getattr(announcement.contest, "slug", None),
-        "title": announcement.title,
-        "summary": announcement.summary,
-        "content": announcement.content,
-        "is_active": announcement.is_active,
-        "created_at": announcement.created_at,
-        "updated_at": announcement.updated_at,
-    }
+    data = dict(zip(_ANNOUNCEMENT_KEYS, _get_announcement_fields(announcement)))
+    data["contest"] = announcement.contest.slug
+    return data
 
 
-def serialize_team(team: Team) -> dict:
-    """队伍序列化：包含队长、邀请码、成员数量等"""
-    member_count = getattr(team, "active_member_count", None)
-    if member_count is None:
-        member_count = team.member_count
-    payload = {
-        "id": getattr(team, "id", None),
-        "contest": getattr(team.contest, "slug", None),
-        "name": team.name,
-        "slug": team.slug,
-        "description": team.description,
-        "captain_id": getattr(team, "captain_id", None),
-        "invite_token": team.invite_token,
-        "member_count": member_count,
-        "is_active": team.is_active,
-    }
-    members = getattr(team, "members_cache", None) or getattr(team, "members_prefetched", None)
+def serialize_announcement_row(row: dict, contest_slug: str) -> dict:
+    """公告序列化（字典行版本）：用于 values() 查询的只读列表，字段同 serialize_announcement 但不含正文"""
+    data = {key: row[key] for key in _ANNOUNCEMENT_LIST_KEYS}
+    data["contest"] = contest_slug
+    return data
+
+
+def serialize_team(
+        team: Team,
+        *,
+        fetch_members: bool = False,
+        member_repo: TeamMemberRepo | None = None,
+) -> dict:
+    """
+    队伍序列化：包含队长、邀请码、成员数量等
+    - 列表场景需通过 TeamRepo.prefetch_active_members 预取成员，避免逐队查询
+    - 单队伍场景（我的队伍、创建/加入后回显）可显式传入 fetch_members=True 回查成员
+    - 成员未预取且未标注人数时，人数由 member_repo（缺省为模块共享实例）读计数缓存
+    """
+    members = getattr(team, "members_cache", None)
     if members is None:
-        # 避免大量查询，只有在极少数（如我的队伍）场景下读取成员
-        try:
+        members = getattr(team, "members_prefetched", None)
+    # 成员列表是否为全部有效成员（预取或回查）；为 True 时空列表即代表 0 人
+    members_loaded = members is not None
+    if members is None:
+        if fetch_members:
             members = list(team.members.filter(is_active=True).select_related("user"))
-        except Exception:
+            members_loaded = True
+        else:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "队伍序列化缺少预取成员，已省略成员列表",
+                    extra=logger_extra({"team_id": team.id}),
+                )
             members = []
+    member_count = getattr(team, "active_member_count", None)
+    if member_count is None:
+        # 已有完整成员列表时人数直接取长度（含 0）；否则走计数缓存，避免 COUNT 查询
+        if members_loaded:
+            member_count = len(members)
+        else:
+            member_count = (member_repo or _shared_member_repo).active_count(team)
+    payload = dict(zip(_TEAM_KEYS, _get_team_fields(team)))
+    payload["contest"] = team.contest.slug
+    payload["member_count"] = member_count
     if members:
         payload["members"] = [
             {
-                "id": getattr(m, "user_id", None),
-                "username": getattr(getattr(m, "user", None), "username", None),
-                "joined_at": getattr(m, "joined_at", None),
-                "role": getattr(m, "role", None),
+                "id": m.user_id,
+                "username": m.user.username,
+                "joined_at": m.joined_at,
+                "role": m.role,
             }
             for m in members
         ]
@@ -161,6 +239,12 @@ class ContestContextService(BaseService[Contest]):
     """
     提供统一的比赛上下文（状态校验、成员关系等）
     """
+    # 用户附加字段缓存时长：副状态随时间推进变化，仅做短期缓存
+    user_fields_cache_ttl: int = getattr(settings, "CONTEST_USER_FIELDS_CACHE_TTL", 30)
+    # 附加字段版本号保留时长：远大于字段缓存时长，过期归零时旧版本缓存早已过期
+    user_fields_version_ttl: int = 24 * 3600
+    # 题目分类缓存时长：分类极少变动，写入时主动失效
+    category_cache_ttl: int = getattr(settings, "CONTEST_CATEGORY_CACHE_TTL", 600)
 
     def __init__(
             self,
@@ -183,6 +267,10 @@ class ContestContextService(BaseService[Contest]):
         """根据 slug 获取比赛对象"""
         return self.contest_repo.get_by_slug(slug)
 
+    def get_contest_light(self, slug: str) -> Contest:
+        """根据 slug 获取仅含鉴权/状态字段的比赛对象，适用于不返回比赛详情的接口"""
+        return self.contest_repo.get_by_slug_light(slug)
+
     @staticmethod
     def ensure_contest_started(contest: Contest) -> None:
         """校验比赛已开赛，否则抛业务校验错误"""
@@ -205,15 +293,21 @@ class ContestContextService(BaseService[Contest]):
         校验比赛可见性：
         - 公开比赛直接放行
         - 私有比赛需登录且是管理员或已报名/加入队伍的选手
+        - 通过校验的用户记在比赛实例上，同一请求内视图与服务层重复校验时不再查询报名表
         """
         if contest.visibility == Contest.Visibility.PUBLIC:
             return
-        if getattr(user, "is_staff", False):
+        gate = get_user_gate(user)
+        if gate.is_staff:
             return
-        if not getattr(user, "is_authenticated", False):
+        if not gate.is_auth:
             raise PermissionDeniedError(message="比赛未公开，需登录访问")
-        if not self.participant_repo.filter(contest=contest, user=user, is_valid=True).exists():
+        checked = contest.__dict__.setdefault("_visible_user_ids", set())
+        if gate.id in checked:
+            return
+        if not self.participant_repo.filter(contest=contest, user_id=gate.id, is_valid=True).exists():
             raise PermissionDeniedError(message="比赛未公开，暂无访问权限")
+        checked.add(gate.id)
 
     def get_user_membership(self, contest: Contest, user: User):
         """查询用户在比赛中的队伍关系"""
@@ -224,16 +318,43 @@ class ContestContextService(BaseService[Contest]):
         membership = self.get_user_membership(contest=contest, user=user)
         return membership.team if membership else None
 
+    @staticmethod
+    def _participation_status(contest: Contest) -> str:
+        """按比赛阶段确定参与状态"""
+        if contest.has_ended:
+            return ContestParticipant.Status.FINISHED
+        if contest.has_started:
+            return ContestParticipant.Status.RUNNING
+        return ContestParticipant.Status.REGISTERED
+
+    def get_user_context(
+            self, contest: Contest, user: User
+    ) -> tuple[ContestParticipant | None, TeamMember | None]:
+        """
+        详情页使用：一次查询取出报名记录与队伍关系，并顺带推进已有报名的参与状态
+        - 管理员不参赛，不返回报名记录
+        """
+        gate = get_user_gate(user)
+        if not gate.is_auth:
+            return None, None
+        participant, membership = self.participant_repo.get_context(contest, user)
+        if gate.is_staff:
+            return None, membership
+        if participant is not None:
+            participant = self.participant_repo.update_status(
+                participant,
+                self._participation_status(contest),
+                is_valid=bool(membership) or not contest.is_team_based,
+            )
+        return participant, membership
+
     def mark_participation(self, contest: Contest, user: User, *,
                            allow_create: bool = False) -> ContestParticipant | None:
         """记录用户在比赛中的参与状态，用于后台筛选与参赛选手列表"""
-        if not user.is_authenticated or user.is_staff:
+        gate = get_user_gate(user)
+        if not gate.is_auth or gate.is_staff:
             return None
-        status = ContestParticipant.Status.REGISTERED
-        if contest.has_ended:
-            status = ContestParticipant.Status.FINISHED
-        elif contest.has_started:
-            status = ContestParticipant.Status.RUNNING
+        status = self._participation_status(contest)
         if allow_create:
             membership = self.member_repo.get_membership(contest=contest, user=user)
             return self.participant_repo.ensure_status(
@@ -242,24 +363,43 @@ class ContestContextService(BaseService[Contest]):
                 status,
                 is_valid=bool(membership) or not contest.is_team_based,
             )
+        # 仅更新已有记录：取出的记录直接用于推进状态，不再经 get_or_create 二次查询
+        # 此处有意不走 participant_repo.is_registered：已报名集合只缓存命中结果，命中后仍要取记录行，
+        # 未命中又要回退 DB，先查集合只会多一次 Redis 往返而省不掉任何查询；
+        # 只需布尔结果的建队/入队校验仍使用 is_registered
         existing = self.participant_repo.filter(contest=contest, user=user).first()
-        if not existing:
+        if existing is None:
             return None
         membership = self.member_repo.get_membership(contest=contest, user=user)
-        return self.participant_repo.ensure_status(
-            contest,
-            user,
+        return self.participant_repo.update_status(
+            existing,
             status,
             is_valid=bool(membership) or not contest.is_team_based,
         )
 
+    def sync_participant_statuses(self, contest: Contest) -> int:
+        """按比赛阶段批量推进参与状态（开赛 -> 进行中，结束 -> 已结束），供定时任务调用"""
+        if contest.has_ended:
+            return self.participant_repo.bulk_promote(
+                contest,
+                [ContestParticipant.Status.REGISTERED, ContestParticipant.Status.RUNNING],
+                ContestParticipant.Status.FINISHED,
+            )
+        if contest.has_started:
+            return self.participant_repo.bulk_promote(
+                contest,
+                [ContestParticipant.Status.REGISTERED],
+                ContestParticipant.Status.RUNNING,
+            )
+        return 0
+
     def ensure_registered(self, contest: Contest, user: User) -> ContestParticipant:
         """显式报名：创建或更新报名状态"""
-        if user.is_staff:
+        if get_user_gate(user).is_staff:
             raise PermissionDeniedError(message="管理员不能报名参赛")
         if contest.has_ended:
             raise ConflictError(message="比赛已结束，无法报名")
-        now = timezone.now()
+        now = request_now()
         reg_start = getattr(contest, "registration_start_time", None)
         reg_end = getattr(contest, "registration_end_time", None) or contest.end_time
         if reg_start and now < reg_start:
@@ -277,35 +417,27 @@ class ContestContextService(BaseService[Contest]):
             *,
             participant: ContestParticipant | None = None,
             membership: TeamMember | None = None,
+            now: datetime | None = None,
     ) -> str:
-        """根据比赛与当前用户的报名/组队情况生成副状态标识"""
-        now = timezone.now()
-        registered = participant is not None
-        reg_end = contest.registration_end_time or contest.start_time
-        start = contest.start_time
-        end = contest.end_time
+        """根据比赛与当前用户的报名/组队情况生成副状态标识；批量场景可传入统一的 now"""
+        now = now or request_now()
         freeze = contest.freeze_time
-        team_missing = contest.is_team_based and membership is None
-
-        if not registered:
-            # 未报名场景：区分报名是否已截止
-            if reg_end and start and now > reg_end and now < start:
-                return "registration_closed"
-            return "unregistered"
-
-        if reg_end and start and now > reg_end and now < start and not registered:
-            return "registration_closed"
-        if registered and team_missing and reg_end and now > reg_end:
-            return "registration_invalid"
-        if registered and team_missing and start and now < start:
-            return "team_missing"
-        if registered and freeze and now >= freeze and (end is None or now <= end):
-            return "frozen"
-        if registered and end and now > end:
-            return "finished"
-        if registered:
-            return "registered"
-        return ""
+        if now > contest.end_time:
+            phase = _PHASE_FINISHED
+        elif freeze and now >= freeze:
+            phase = _PHASE_FROZEN
+        else:
+            phase = _PHASE_OPEN
+        reg_end = contest.registration_end_time or contest.start_time
+        return _BADGE_TABLE[
+            (
+                participant is not None,
+                contest.is_team_based and membership is None,
+                now > reg_end,
+                now < contest.start_time,
+                phase,
+            )
+        ]
 
     def build_user_contest_fields(
             self,
@@ -313,50 +445,160 @@ class ContestContextService(BaseService[Contest]):
             *,
             participant: ContestParticipant | None = None,
             membership: TeamMember | None = None,
+            now: datetime | None = None,
     ) -> dict:
         """统一构造与用户相关的比赛附加字段，便于列表与详情复用"""
         registered = participant is not None
         registration_valid = bool(participant.is_valid) if participant is not None else False
         team = membership.team if membership else None
-        badge = self._compute_user_badge(contest, participant=participant, membership=membership)
+        badge = self._compute_user_badge(contest, participant=participant, membership=membership, now=now)
         return {
             "registration_status": registered,
             "registration_valid": registration_valid,
-            "my_team_id": getattr(team, "id", None),
-            "my_team_name": getattr(team, "name", None),
+            "my_team_id": membership.team_id if membership else None,
+            "my_team_name": team.name if team else None,
             "user_badge": badge,
         }
 
+    def bulk_user_contest_fields(self, contests: list[Contest], gate: UserGate) -> dict[int, dict]:
+        """
+        批量构造当前用户在多场比赛下的附加字段（比赛 id -> 字段）：
+        - 比赛版本号与用户缓存一次 MGET 读出，缓存记录的版本与比赛当前版本一致才算命中
+        - 仅对未命中的比赛查询报名与队伍关系，计算结果经 pipeline 一次回写缓存
+        - 报名/成员变化由信号删除该用户的键，比赛/队伍变化自增版本号整场失效
+        - 仅依赖身份摘要中的用户 id，无需加载 ORM 用户对象
+        """
+        if not contests:
+            return {}
+        user_id = gate.id
+        count = len(contests)
+        keys = [contest_user_fields_key(c.id, user_id) for c in contests]
+        values = redis_client.mget_json([contest_user_fields_version_key(c.id) for c in contests] + keys)
+        result: dict[int, dict] = {}
+        missing: list[tuple[Contest, str, int]] = []
+        # 比赛、缓存键、版本号与缓存值按下标一一对应，直接并行遍历
+        for contest, key, version, cached in zip(contests, keys, values[:count], values[count:]):
+            version = version if isinstance(version, int) else 0
+            if isinstance(cached, dict) and cached.get("v") == version:
+                result[contest.id] = cached["fields"]
+            else:
+                missing.append((contest, key, version))
+        if not missing:
+            return result
+        # 报名与队伍关系经相关子查询一次取出，不再分别查询参赛表与成员表
+        contexts = self.participant_repo.bulk_context([c.id for c, _, _ in missing], user_id)
+        now = request_now()
+        to_cache: dict[str, dict] = {}
+        for contest, key, version in missing:
+            participant, membership = contexts.get(contest.id, (None, None))
+            fields = self.build_user_contest_fields(
+                contest,
+                participant=participant,
+                membership=membership,
+                now=now,
+            )
+            result[contest.id] = fields
+            # 记录读取时的版本：计算期间整场失效的话，写入的就是旧版本，下次读取自然判为未命中
+            to_cache[key] = {"v": version, "fields": fields}
+        redis_client.set_many_json(to_cache, ex=self.user_fields_cache_ttl)
+        return result
+
+    @classmethod
+    def invalidate_user_contest_fields(cls, contest_id: int, user_id: int | None = None) -> None:
+        """
+        失效用户附加字段缓存：
+        - 指定用户时直接删除该用户的键
+        - 否则自增比赛版本号（单条 INCR），整场旧缓存读取时判为未命中，无需 SCAN 全库
+        """
+        if user_id is not None:
+            redis_client.delete(contest_user_fields_key(contest_id, user_id))
+            return
+        try:
+            redis_client.incr(contest_user_fields_version_key(contest_id), ex=cls.user_fields_version_ttl)
+        except CacheUnavailableError:
+            # Redis 不可用时缓存同样读不到，短 TTL 兜底
+            pass
+
     def perform(self, *args, **kwargs) -> Contest:
         """ContextService 不提供通用执行入口，防止误用 execute"""
         raise NotImplementedError("ContestContextService does not support execute()")
 
-    def list_announcements(self, contest: Contest):
-        """获取比赛公告列表（仅返回有效公告）"""
-        return self.announcement_repo.list_active(contest)
+    def list_announcements(
+            self, contest: Contest, *, before=None, before_id: int | None = None, limit: int | None = None
+    ):
+        """获取比赛公告列表（仅返回有效公告），支持 (创建时间, id) 键集分页"""
+        return self.announcement_repo.list_active(contest, before=before, before_id=before_id, limit=limit)
+
+    def list_announcement_values(
+            self, contest: Contest, *, before=None, before_id: int | None = None, limit: int | None = None
+    ):
+        """同 list_announcements，但返回字典行，配合 serialize_announcement_row 用于只读列表"""
+        return self.announcement_repo.list_active(
+            contest, before=before, before_id=before_id, limit=limit, as_values=True
+        )
 
     def list_categories(self, contest: Contest):
-        """返回比赛下配置的题目分类"""
-        return self.category_repo.list_by_contest(contest)
+        """返回比赛下配置的题目分类；结果挂在比赛实例上，同一请求内重复调用不再查询"""
+        categories = getattr(contest, "_categories_cache", None)
+        if categories is None:
+            categories = list(self.category_repo.list_by_contest(contest))
+            contest._categories_cache = categories
+        return categories
+
+    def list_category_payload(self, contest: Contest) -> list[dict]:
+        """
+        返回比赛题目分类的序列化结果：
+        - 先看比赛实例上的请求内缓存，再读 Redis 缓存，分类或比赛变更时失效
+        - 两级都未命中才查询并回填
+        """
+        payload = getattr(contest, "_category_payload_cache", None)
+        if payload is not None:
+            return payload
+        key = contest_categories_key(contest.id)
+        payload = redis_client.get_json(key)
+        if not isinstance(payload, list):
+            payload = [serialize_category(cat) for cat in self.list_categories(contest)]
+            redis_client.set_json(key, payload, ex=self.category_cache_ttl)
+        contest._category_payload_cache = payload
+        return payload
+
+    @staticmethod
+    def invalidate_category_cache(contest_id: int) -> None:
+        """
+        失效比赛题目分类缓存
+        - 调用方多在事务内：立即清一次，提交后再清一次，避免提交前被并发读取回填的旧分类残留
+        """
+        key = contest_categories_key(contest_id)
+        redis_client.delete(key)
+        transaction.on_commit(lambda: redis_client.delete(key))
 
 
 def serialize_team_member(member: TeamMember) -> dict:
     """队伍成员序列化：导出场景下附带用户基础标识"""
-    user_id = getattr(member, "user_id", None)
-    username = getattr(getattr(member, "user", None), "username", None) if user_id else None
-    return {
-        "user_id": user_id,
-        "username": username,
-        "role": member.role,
-        "is_active": member.is_active,
-        "joined_at": member.joined_at,
-    }
+    user_id = member.user_id
+    username = member.user.username if user_id else None
+    data = {"user_id": user_id, "username": username}
+    data.update(zip(_TEAM_MEMBER_KEYS, _get_team_member_fields(member)))
+    return data
 
 
-def build_team_member_snapshot(member_repo: TeamMemberRepo, team: Team, *, limit: int = 20) -> dict:
-    """构造队伍成员快照：包含成员列表与总人数，便于 WebSocket 推送"""
-    active_members = list(member_repo.active_members(team)[:limit])
-    member_count = team.member_count
+def build_team_member_snapshot(
+        member_repo: TeamMemberRepo,
+        team: Team,
+        *,
+        limit: int = 20,
+        members: list[TeamMember] | None = None,
+) -> dict:
+    """
+    构造队伍成员快照：包含成员列表与总人数，便于 WebSocket 推送
+    - 调用方已取出全部有效成员时传入 members，直接截取并以其长度作为人数，不再查询
+    """
+    if members is not None:
+        active_members = members[:limit]
+        member_count = len(members)
+    else:
+        active_members = list(member_repo.active_member_rows(team)[:limit])
+        member_count = member_repo.active_count(team)
     return {
         "member_count": member_count,
         "members": [serialize_team_member(m) for m in active_members],
@@ -374,27 +616,30 @@ class CreateContestService(BaseService[Contest]):
 
     def perform(self, schema: ContestCreateSchema) -> Contest:
         """将校验后的比赛入参写入数据库，生成新的比赛记录"""
-        # 将 Schema 转为字典，去除无关字段后落库
-        data = schema.to_dict(exclude_none=True)
-        data.pop("contest_slug", None)
-        categories = data.pop("categories", [])
+        # 仅导出比赛列字段落库，分类单独同步
+        data = schema.to_db_dict()
+        categories = list(schema.categories or [])
         contest = self.repo.create(data)
         if categories:
             self.category_repo.sync_for_contest(contest=contest, categories=categories)
-        logger.info("创建比赛", extra=logger_extra({"contest": contest.slug}))
-        # 系统通知：新比赛发布
-        users = list(User.objects.filter(is_active=True, is_staff=False))
-        if users:
-            dedup = build_dedup_key(type=Notification.Type.CONTEST_NEW, contest=contest)
-            fanout_notifications(
-                users,
-                type=Notification.Type.CONTEST_NEW,
-                title=f"新比赛发布：{contest.name}",
-                body=f"开赛时间：{contest.start_time}",
-                payload={"contest": contest.slug},
-                contest=contest,
-                dedup_key=dedup,
-            )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("创建比赛", extra=logger_extra({"contest": contest.slug}))
+        # 系统通知：新比赛发布；按批流式读取用户 id，内存占用不随用户总量增长
+        user_ids = (
+            User.objects.filter(is_active=True, is_staff=False)
+            .values_list("id", flat=True)
+            .iterator(chunk_size=10000)
+        )
+        dedup = build_dedup_key(type=Notification.Type.CONTEST_NEW, contest=contest)
+        fanout_notifications(
+            user_ids=user_ids,
+            type=Notification.Type.CONTEST_NEW,
+            title=f"新比赛发布：{contest.name}",
+            body=f"开赛时间：{contest.start_time}",
+            payload={"contest": contest.slug},
+            contest=contest,
+            dedup_key=dedup,
+        )
         return contest
 
 
@@ -406,22 +651,19 @@ class ContestUpdateService(BaseService[Contest]):
 
     @transaction.atomic
     def perform(self, schema: ContestUpdateSchema) -> Contest:
-        contest = self.repo.get_by_slug(schema.contest_slug)
+        contest = self.repo.get_by_slug(schema.contest_slug, cached=False)
         if contest.has_ended:
             raise ConflictError(message="比赛已结束，无法修改")
-        now = timezone.now()
+        now = request_now()
 
         def ensure_dt(value: datetime | str | None) -> datetime:
             # 将字符串或 naive datetime 统一转换为时区感知的 datetime
             if value is None:
                 raise ValidationError(message="时间字段不能为空")
-            if isinstance(value, str):
-                dt = datetime.fromisoformat(value)
-            else:
-                dt = value
-            if timezone.is_naive(dt):
-                dt = timezone.make_aware(dt, timezone.get_default_timezone())
-            return dt
+            try:
+                return ensure_aware(value)
+            except ValueError as exc:
+                raise ValidationError(message="时间格式不正确") from exc
 
         # 计算更新后的时间窗口用于校验
         start_time = ensure_dt(schema.start_time) if schema.start_time is not None else contest.start_time
@@ -470,8 +712,7 @@ class ContestUpdateService(BaseService[Contest]):
         if schema.registration_end_time is not None and reg_end_time and reg_end_time < now:
             raise ConflictError(message="报名截止时间不能早于当前时间，如需提前截止请设置为当前时间或更晚")
 
-        update_payload = schema.to_dict(exclude_none=True)
-        update_payload.pop("contest_slug", None)
+        update_payload = schema.to_db_dict()
         # 时间字段使用上方规范化结果，避免字符串直接落库
         if schema.start_time is not None:
             update_payload["start_time"] = start_time
@@ -484,10 +725,11 @@ class ContestUpdateService(BaseService[Contest]):
         if schema.registration_end_time is not None:
             update_payload["registration_end_time"] = reg_end_time
         contest = self.repo.update(contest, update_payload)
-        logger.info(
-            "更新比赛",
-            extra=logger_extra({"contest": contest.slug}),
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "更新比赛",
+                extra=logger_extra({"contest": contest.slug}),
+            )
         return contest
 
 
@@ -512,41 +754,43 @@ class ContestAnnouncementService(BaseService[ContestAnnouncement]):
     def perform(self, schema: AnnouncementCreateSchema) -> ContestAnnouncement:
         """根据比赛标识创建公告，保持公告与比赛的关联关系"""
         contest = self.contest_repo.get_by_slug(schema.contest_slug)
-        payload = schema.to_dict(exclude_none=True)
-        payload.pop("contest_slug", None)
+        payload = schema.to_db_dict()
         payload["contest"] = contest
         announcement = self.announcement_repo.create(payload)
-        logger.info(
-            "创建比赛公告",
-            extra=logger_extra({"contest": contest.slug, "announcement": getattr(announcement, "id", None)}),
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "创建比赛公告",
+                extra=logger_extra({"contest": contest.slug, "announcement": announcement.id}),
+            )
         # WebSocket 广播公告发布
         broadcast_contest(
             contest.slug,
             {
                 "event": "announcement_published",
                 "contest": contest.slug,
-                "announcement_id": getattr(announcement, "id", None),
+                "announcement_id": announcement.id,
                 "title": announcement.title,
             },
         )
         # 系统通知：推送给报名有效的参赛选手
-        participants = list(self.participant_repo.filter(contest=contest, is_valid=True).select_related("user"))
-        if participants:
+        # 仅取用户 id 批量写入，避免为扇出加载整行参赛记录与用户对象
+        user_ids = list(
+            self.participant_repo.filter(contest=contest, is_valid=True).values_list("user_id", flat=True)
+        )
+        if user_ids:
             dedup = build_dedup_key(
                 type=Notification.Type.CONTEST_ANNOUNCEMENT_NEW,
                 contest=contest,
-                extra=str(getattr(announcement, "id", None)),
+                extra=str(announcement.id),
             )
-            users = [p.user for p in participants if getattr(p, "user", None)]
             fanout_notifications(
-                users,
+                user_ids=user_ids,
                 type=Notification.Type.CONTEST_ANNOUNCEMENT_NEW,
                 title=f"比赛公告：{announcement.title}",
                 body=announcement.summary or announcement.title,
                 payload={
                     "contest": contest.slug,
-                    "announcement_id": getattr(announcement, "id", None),
+                    "announcement_id": announcement.id,
                 },
                 contest=contest,
                 dedup_key=dedup,
@@ -570,6 +814,8 @@ class ContestCategoryUpdateService(BaseService[list]):
     def perform(self, schema: ContestCategoryUpdateSchema) -> list:
         contest = self.contest_repo.get_by_slug(schema.contest_slug)
         categories = self.category_repo.sync_for_contest(contest=contest, categories=schema.categories or [])
+        # 同步可能走批量写入不触发信号，这里显式失效分类缓存
+        ContestContextService.invalidate_category_cache(contest.id)
         return categories
 
 
@@ -598,63 +844,49 @@ class TeamCreateService(BaseService[Team]):
         """以当前用户为队长创建队伍，完成唯一 slug 与成员记录写入"""
         # 1) 获取比赛并校验管理员不可参赛、比赛允许组队、未结束
         contest = self.contest_repo.get_by_slug(schema.contest_slug)
-        if user.is_staff:
+        gate = get_user_gate(user)
+        if gate.is_staff:
             raise ValidationError(message="管理员账号无法参与比赛")
         if not contest.is_team_based:
             raise ValidationError(message="该比赛不支持组队")
         if contest.has_ended:
             raise ConflictError(message="比赛已结束，无法创建队伍")
         # 0) 报名校验：需先显式报名
-        if not self.participant_repo.filter(contest=contest, user=user).exists():
+        if not self.participant_repo.is_registered(contest, user):
             raise ValidationError(message="请先报名参赛后再创建队伍")
         # 2) 校验用户尚未加入该比赛的任何队伍
         existing = self.member_repo.get_membership(contest=contest, user=user)
         if existing:
             raise ConflictError(message="您已加入该比赛的队伍")
         # 3) 创建队伍并写入队长成员记录
-        user_id = getattr(user, "id", None)
+        user_id = gate.id
         team = self.team_repo.create_team(
             contest=contest,
             captain=user,
             name=schema.name,
             description=schema.description,
         )
-        captain_member = self.member_repo.create_member(team=team, user=user, role=TeamMember.Role.CAPTAIN)
+        self.member_repo.create_member(team=team, user=user, role=TeamMember.Role.CAPTAIN)
         self.participant_repo.ensure_status(
             contest,
             user,
             ContestParticipant.Status.RUNNING if contest.has_started else ContestParticipant.Status.REGISTERED,
             is_valid=True,
         )
-        team_id = getattr(team, "id", None)
-        logger.info(
-            "创建队伍",
-            extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
-        )
-        snapshot = build_team_member_snapshot(self.member_repo, team, limit=20)
-        captain_payload = serialize_team_member(captain_member)
-        broadcast_contest(
-            contest.slug,
-            {
-                "event": "team_created",
-                "contest": contest.slug,
-                "team": team.slug,
-                "team_id": team_id,
-                "user_id": user_id,
-                "member": captain_payload,
-                **snapshot,
-            },
-        )
-        broadcast_notify(
-            user_id,
-            {
-                "event": "team_created",
-                "contest": contest.slug,
-                "team": team.slug,
-                "team_id": team_id,
-                "member": captain_payload,
-                **snapshot,
-            },
+        team_id = team.id
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "创建队伍",
+                extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
+            )
+        # 广播与通知移至提交后的异步任务，接口在写库后即可返回
+        from .tasks import TEAM_CREATED, enqueue_team_event  # 延迟导入避免循环
+
+        contest_id = contest.id
+        # robust：提交后回调出错只记日志，不把已提交的写入变成 500
+        transaction.on_commit(
+            lambda: enqueue_team_event(team_id, user_id, contest_id, event=TEAM_CREATED),
+            robust=True,
         )
         return team
 
@@ -683,12 +915,13 @@ class TeamJoinService(BaseService[TeamMember]):
         """校验并将用户加入目标队伍，返回成员关系记录"""
         # 1) 获取比赛并禁止管理员加入
         contest = self.contest_repo.get_by_slug(schema.contest_slug)
-        if user.is_staff:
+        gate = get_user_gate(user)
+        if gate.is_staff:
             raise ValidationError(message="管理员账号无法加入队伍")
         if contest.has_ended:
             raise ConflictError(message="比赛已结束，无法加入队伍")
         # 报名校验：需先显式报名
-        if not self.participant_repo.filter(contest=contest, user=user).exists():
+        if not self.participant_repo.is_registered(contest, user):
             raise ValidationError(message="请先报名参赛后再加入队伍")
         # 2) 根据邀请码查找队伍
         team = (
@@ -698,26 +931,29 @@ class TeamJoinService(BaseService[TeamMember]):
         )
         if team is None:
             raise NotFoundError(message="邀请码无效")
-        user_id = getattr(user, "id", None)
-        team_id = getattr(team, "id", None)
+        user_id = gate.id
+        team_id = team.id
         # 3) 校验人数上限、用户未在其他队伍、比赛未结束
-        if team.member_count >= contest.max_team_members:
-            logger.warning(
-                "加入队伍失败：人数已满",
-                extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
-            )
+        if self.member_repo.active_count(team) >= contest.max_team_members:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "加入队伍失败：人数已满",
+                    extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
+                )
             raise ConflictError(message="队伍人数已满")
         if self.member_repo.get_membership(contest=contest, user=user):
-            logger.warning(
-                "加入队伍失败：已在队伍",
-                extra=logger_extra({"contest": contest.slug, "user_id": user_id}),
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "加入队伍失败：已在队伍",
+                    extra=logger_extra({"contest": contest.slug, "user_id": user_id}),
+                )
             raise ConflictError(message="您已经加入了一支队伍")
         if contest.has_ended:
-            logger.warning(
-                "加入队伍失败：比赛已结束",
-                extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "加入队伍失败：比赛已结束",
+                    extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
+                )
             raise ConflictError(message="比赛已结束，无法加入队伍")
         member = self.member_repo.create_member(team=team, user=user, role=TeamMember.Role.MEMBER)
         self.participant_repo.ensure_status(
@@ -726,59 +962,17 @@ class TeamJoinService(BaseService[TeamMember]):
             ContestParticipant.Status.RUNNING if contest.has_started else ContestParticipant.Status.REGISTERED,
             is_valid=True,
         )
-        logger.info(
-            "加入队伍",
-            extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
-        )
-        snapshot = build_team_member_snapshot(self.member_repo, team, limit=20)
-        member_payload = serialize_team_member(member)
-        broadcast_contest(
-            contest.slug,
-            {
-                "event": "team_joined",
-                "contest": contest.slug,
-                "team": team.slug,
-                "team_id": team_id,
-                "user_id": user_id,
-                "member": member_payload,
-                **snapshot,
-            },
-        )
-        broadcast_notify(
-            user_id,
-            {
-                "event": "team_joined",
-                "contest": contest.slug,
-                "team": team.slug,
-                "team_id": team_id,
-                "member": member_payload,
-                **snapshot,
-            },
-        )
-        # 系统通知：队员加入队伍
-        members = list(self.member_repo.active_members(team))
-        if members:
-            dedup = build_dedup_key(
-                type=Notification.Type.TEAM_MEMBER_JOINED,
-                contest=contest,
-                team=team,
-                extra=str(user_id),
-            )
-            fanout_notifications(
-                [m.user for m in members if getattr(m, "user", None)],
-                type=Notification.Type.TEAM_MEMBER_JOINED,
-                title=f"{getattr(user, 'username', '成员')} 加入队伍",
-                body=team.name,
-                payload={
-                    "contest": contest.slug,
-                    "team": team.slug,
-                    "team_id": team_id,
-                    "user_id": user_id,
-                },
-                contest=contest,
-                team=team,
-                dedup_key=dedup,
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "加入队伍",
+                extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
             )
+        # 成员快照、广播与系统通知移至提交后的异步任务；事务回滚时不会投递
+        from .tasks import enqueue_team_event  # 延迟导入避免循环
+
+        contest_id = contest.id
+        # robust：提交后回调出错只记日志，不把已提交的写入变成 500
+        transaction.on_commit(lambda: enqueue_team_event(team_id, user_id, contest_id), robust=True)
         return member
 
 
@@ -817,25 +1011,29 @@ class TeamLeaveService(BaseService[None]):
         membership = self.member_repo.get_membership(contest=contest, user=user)
         if not membership:
             raise NotFoundError(message="你尚未加入任何队伍")
-        user_id = getattr(user, "id", None)
+        user_id = user.id
         # 2) 队长且队伍多人时禁止直接退出
         if membership.role == TeamMember.Role.CAPTAIN:
             team = membership.team
-            if team.member_count > 1:
-                logger.warning(
-                    "退出队伍失败：队长且队伍多人",
-                    extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
-                )
+            if self.member_repo.active_count(team) > 1:
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "退出队伍失败：队长且队伍多人",
+                        extra=logger_extra({"contest": contest.slug, "team": team.slug, "user_id": user_id}),
+                    )
                 raise ConflictError(message="队长请先将队伍解散或移交队长后再退出")
         # 3) 标记成员无效
         member_payload = serialize_team_member(membership)
         self.member_repo.remove_member(membership)
-        logger.info(
-            "退出队伍",
-            extra=logger_extra({"contest": contest.slug, "team": membership.team.slug, "user_id": user_id}),
-        )
-        snapshot = build_team_member_snapshot(self.member_repo, membership.team, limit=20)
-        team_id = getattr(membership.team, "id", None)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "退出队伍",
+                extra=logger_extra({"contest": contest.slug, "team": membership.team.slug, "user_id": user_id}),
+            )
+        # 剩余成员一次取出，快照与通知接收者共用
+        remaining = list(self.member_repo.active_member_rows(membership.team))
+        snapshot = build_team_member_snapshot(self.member_repo, membership.team, limit=20, members=remaining)
+        team_id = membership.team_id
         broadcast_contest(
             contest.slug,
             {
@@ -859,8 +1057,8 @@ class TeamLeaveService(BaseService[None]):
                 **snapshot,
             },
         )
-        members = list(self.member_repo.active_members(membership.team))
-        if members:
+        member_user_ids = [m.user_id for m in remaining]
+        if member_user_ids:
             dedup = build_dedup_key(
                 type=Notification.Type.TEAM_MEMBER_LEFT,
                 contest=contest,
@@ -868,7 +1066,7 @@ class TeamLeaveService(BaseService[None]):
                 extra=str(user_id),
             )
             fanout_notifications(
-                [m.user for m in members if getattr(m, "user", None)],
+                user_ids=member_user_ids,
                 type=Notification.Type.TEAM_MEMBER_LEFT,
                 title=f"{getattr(user, 'username', '成员')} 退出队伍",
                 body=membership.team.name,
@@ -881,6 +1079,7 @@ class TeamLeaveService(BaseService[None]):
                 contest=contest,
                 team=membership.team,
                 dedup_key=dedup,
+                team_channel=True,
             )
 
 
@@ -902,33 +1101,33 @@ class TeamDisbandService(BaseService[Team]):
         self.member_repo = member_repo or TeamMemberRepo()
 
     def perform(self, user: User, schema: TeamDisbandSchema) -> Team:
-        """解散目标队伍，逐个成员失效并关闭队伍记录"""
+        """解散目标队伍，批量标记成员失效并关闭队伍记录"""
         # 1) 校验权限：仅队长或管理员
         team = self.team_repo.get_by_id(schema.team_id)
-        user_id = getattr(user, "id", None)
-        if not (user.is_staff or getattr(team, "captain_id", None) == user_id):
+        gate = get_user_gate(user)
+        user_id = gate.id
+        if not (gate.is_staff or team.captain_id == user_id):
             raise PermissionDeniedError(message="只有队长或管理员可以解散队伍")
-        member_objs = list(self.member_repo.active_members(team))
+        member_objs = list(self.member_repo.active_member_rows(team))
         members_before = [serialize_team_member(m) for m in member_objs]
-        # 2) 标记所有成员失效
-        for member in self.member_repo.active_members(team):
-            member.is_active = False
-            member.save(update_fields=["is_active"])
-        # 3) 关闭队伍并重置邀请码，避免复用
+        # 2) 单条 UPDATE 标记所有成员失效；成员快照已在上方取出，供广播与通知复用
+        self.member_repo.deactivate_all(team)
+        # 3) 关闭队伍并重置邀请码，避免复用（队伍保存信号会失效整场比赛的用户附加字段）
         team.is_active = False
-        team.invite_token = secrets.token_hex(4)
+        team.invite_token = default_invite_token()
         team.save(update_fields=["is_active", "invite_token", "updated_at"])
-        logger.info(
-            "解散队伍",
-            extra=logger_extra({"team": team.slug, "contest": getattr(team.contest, 'slug', None),
-                                "user_id": user_id}),
-        )
-        team_id = getattr(team, "id", None)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "解散队伍",
+                extra=logger_extra({"team": team.slug, "contest": team.contest.slug,
+                                    "user_id": user_id}),
+            )
+        team_id = team.id
         broadcast_contest(
-            getattr(team.contest, "slug", ""),
+            team.contest.slug,
             {
                 "event": "team_disbanded",
-                "contest": getattr(team.contest, "slug", None),
+                "contest": team.contest.slug,
                 "team": team.slug,
                 "team_id": team_id,
                 "members": members_before,
@@ -938,23 +1137,24 @@ class TeamDisbandService(BaseService[Team]):
         if member_objs:
             dedup = build_dedup_key(
                 type=Notification.Type.TEAM_DISBANDED,
-                contest=getattr(team, "contest", None),
+                contest=team.contest,
                 team=team,
                 extra=str(team_id),
             )
             fanout_notifications(
-                [m.user for m in member_objs if getattr(m, "user", None)],
+                user_ids=[m.user_id for m in member_objs],
                 type=Notification.Type.TEAM_DISBANDED,
                 title="队伍已解散",
                 body=team.name,
                 payload={
-                    "contest": getattr(team.contest, "slug", None),
+                    "contest": team.contest.slug,
                     "team": team.slug,
                     "team_id": team_id,
                 },
-                contest=getattr(team, "contest", None),
+                contest=team.contest,
                 team=team,
                 dedup_key=dedup,
+                team_channel=True,
             )
         return team
 
@@ -973,52 +1173,56 @@ class TeamInviteResetService(BaseService[Team]):
         team = self.team_repo.get_by_id(schema.team_id)
         if not team.is_active:
             raise ConflictError(message="队伍已失效，无法重置邀请码")
-        user_id = getattr(user, "id", None)
-        if not (user.is_staff or getattr(team, "captain_id", None) == user_id):
+        gate = get_user_gate(user)
+        user_id = gate.id
+        if not (gate.is_staff or team.captain_id == user_id):
             raise PermissionDeniedError(message="仅队长或管理员可重置邀请码")
-        # 使用随机 token 生成新邀请码
-        token = secrets.token_hex(4)
+        # 与建队默认值同源生成新邀请码（token_urlsafe，约 72 位熵），唯一约束下碰撞可忽略
+        token = default_invite_token()
         result = self.team_repo.reset_invite_token(team, token=token)
-        logger.info(
-            "重置队伍邀请码",
-            extra=logger_extra({"team": team.slug, "contest": getattr(team.contest, 'slug', None),
-                                "user_id": user_id}),
-        )
-        team_id = getattr(team, "id", None)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "重置队伍邀请码",
+                extra=logger_extra({"team": team.slug, "contest": team.contest.slug,
+                                    "user_id": user_id}),
+            )
+        team_id = team.id
+        # 成员 id 一次取出，人数与通知接收者共用
+        member_user_ids = list(self.member_repo.active_member_user_ids(team))
         broadcast_contest(
-            getattr(team.contest, "slug", ""),
+            team.contest.slug,
             {
                 "event": "team_invite_reset",
-                "contest": getattr(team.contest, "slug", None),
+                "contest": team.contest.slug,
                 "team": team.slug,
                 "team_id": team_id,
                 "invite_token": team.invite_token,
-                "member_count": team.member_count,
+                "member_count": len(member_user_ids),
             },
         )
         # 通知队伍成员邀请码重置
-        members = list(self.member_repo.active_members(team))
-        if members:
+        if member_user_ids:
             dedup = build_dedup_key(
                 type=Notification.Type.TEAM_INVITE_RESET,
-                contest=getattr(team, "contest", None),
+                contest=team.contest,
                 team=team,
                 extra=str(team.invite_token),
             )
             fanout_notifications(
-                [m.user for m in members if getattr(m, "user", None)],
+                user_ids=member_user_ids,
                 type=Notification.Type.TEAM_INVITE_RESET,
                 title="队伍邀请码已重置",
                 body=f"{team.name} 的新邀请码：{team.invite_token}",
                 payload={
-                    "contest": getattr(team.contest, "slug", None),
+                    "contest": team.contest.slug,
                     "team": team.slug,
                     "team_id": team_id,
                     "invite_token": team.invite_token,
                 },
-                contest=getattr(team, "contest", None),
+                contest=team.contest,
                 team=team,
                 dedup_key=dedup,
+                team_channel=True,
             )
         return result
 
@@ -1026,6 +1230,9 @@ class TeamInviteResetService(BaseService[Team]):
 class TeamTransferService(BaseService[Team]):
     """队长移交：将队长角色转给指定队员"""
 
+    # 事务仅包住写操作，广播与通知在提交后执行，不占用写锁
+    atomic_enabled = False
+
     def __init__(
             self,
             team_repo: TeamRepo | None = None,
@@ -1036,54 +1243,71 @@ class TeamTransferService(BaseService[Team]):
         self.team_repo = team_repo or TeamRepo()
         self.member_repo = member_repo or TeamMemberRepo()
 
-    @transaction.atomic
     def perform(self, user: User, schema: TeamTransferSchema) -> Team:
-        """在事务内完成队长权限转移，确保成员关系与队长字段一致"""
+        """校验后在短事务内完成队长权限转移，确保成员关系与队长字段一致"""
         # 1) 校验队伍有效与操作者权限
         team = self.team_repo.get_by_id(schema.team_id)
         if not team.is_active:
             raise ConflictError(message="队伍已失效，无法移交队长")
-        user_id = getattr(user, "id", None)
-        if not (user.is_staff or getattr(team, "captain_id", None) == user_id):
+        gate = get_user_gate(user)
+        user_id = gate.id
+        if not (gate.is_staff or team.captain_id == user_id):
             raise PermissionDeniedError(message="仅队长或管理员可移交队长")
-        # 2) 查找或创建目标成员记录
         target_user = User.objects.filter(pk=schema.new_captain_id).first()
         if not target_user:
             raise NotFoundError(message="目标用户不存在")
-        target_user_id = getattr(target_user, "id", None)
-        membership = self.member_repo.filter(team=team, user_id=target_user_id).first()
-        if membership is None:
-            membership = self.member_repo.create_member(
-                team=team,
-                user=target_user,
-                role=TeamMember.Role.MEMBER,
+        target_user_id = target_user.id
+        old_captain_id = team.captain_id
+        with transaction.atomic():
+            # 2) 查找或创建目标成员记录，并确保成员有效
+            membership = self.member_repo.filter(team=team, user_id=target_user_id).first()
+            if membership is None:
+                membership = self.member_repo.create_member(
+                    team=team,
+                    user=target_user,
+                    role=TeamMember.Role.MEMBER,
+                )
+            # 3) 更新队长；新旧队长的角色与有效状态合并为一条 UPDATE ... CASE WHEN
+            team.captain_id = target_user_id
+            team.save(update_fields=["captain_id", "updated_at"])
+            self.member_repo.filter(team=team, user_id__in=[old_captain_id, target_user_id]).update(
+                role=Case(
+                    When(user_id=target_user_id, then=Value(TeamMember.Role.CAPTAIN)),
+                    default=Value(TeamMember.Role.MEMBER),
+                ),
+                is_active=True,
             )
-        # 3) 确保成员有效
-        if not membership.is_active:
+            # 批量 UPDATE 不触发成员 post_save，目标为已退队成员时有效人数会变化，显式清除计数缓存
+            self.member_repo.invalidate_active_count(team.id)
+            # 同步内存对象，供提交后的序列化使用
+            membership.role = TeamMember.Role.CAPTAIN
             membership.is_active = True
-            membership.save(update_fields=["is_active"])
-        # 更新角色与队长
-        old_captain_id = getattr(team, "captain_id", None)
-        team.captain_id = target_user_id
-        team.save(update_fields=["captain_id", "updated_at"])
-        membership.role = TeamMember.Role.CAPTAIN
-        membership.save(update_fields=["role"])
-        self.member_repo.filter(team=team, user_id=old_captain_id).update(role=TeamMember.Role.MEMBER, is_active=True)
-        snapshot = build_team_member_snapshot(self.member_repo, team, limit=20)
-        new_captain_payload = serialize_team_member(membership)
-        logger.info(
-            "移交队长",
-            extra=logger_extra(
-                {"team": team.slug, "contest": getattr(team.contest, 'slug', None), "old_captain": old_captain_id,
-                 "new_captain": target_user_id}
-            ),
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "移交队长",
+                extra=logger_extra(
+                    {"team": team.slug, "contest": team.contest.slug, "old_captain": old_captain_id,
+                     "new_captain": target_user_id}
+                ),
+            )
+        # 4) 广播与通知仅在提交成功后发出（外层无事务时立即执行）
+        transaction.on_commit(
+            lambda: self._after_transfer(team, membership, target_user, old_captain_id)
         )
-        team_id = getattr(team, "id", None)
+        return team
+
+    def _after_transfer(self, team: Team, membership: TeamMember, target_user: User, old_captain_id: int) -> None:
+        """提交后的队伍快照、广播与全队通知"""
+        team_id = team.id
+        target_user_id = target_user.id
+        members = list(self.member_repo.active_member_rows(team))
+        snapshot = build_team_member_snapshot(self.member_repo, team, limit=20, members=members)
+        new_captain_payload = serialize_team_member(membership)
         broadcast_contest(
-            getattr(team.contest, "slug", ""),
+            team.contest.slug,
             {
                 "event": "team_transferred",
-                "contest": getattr(team.contest, "slug", None),
+                "contest": team.contest.slug,
                 "team": team.slug,
                 "team_id": team_id,
                 "old_captain": old_captain_id,
@@ -1096,39 +1320,39 @@ class TeamTransferService(BaseService[Team]):
             target_user_id,
             {
                 "event": "team_transferred",
-                "contest": getattr(team.contest, "slug", None),
+                "contest": team.contest.slug,
                 "team": team.slug,
                 "team_id": team_id,
                 "member": new_captain_payload,
                 **snapshot,
             },
         )
-        # 通知全队队长变更
-        members = list(self.member_repo.active_members(team))
-        if members:
+        # 通知全队队长变更：复用快照取出的成员列表
+        member_user_ids = [m.user_id for m in members]
+        if member_user_ids:
             dedup = build_dedup_key(
                 type=Notification.Type.TEAM_CAPTAIN_TRANSFERRED,
-                contest=getattr(team, "contest", None),
+                contest=team.contest,
                 team=team,
                 extra=f"{old_captain_id}->{target_user_id}",
             )
             fanout_notifications(
-                [m.user for m in members if getattr(m, "user", None)],
+                user_ids=member_user_ids,
                 type=Notification.Type.TEAM_CAPTAIN_TRANSFERRED,
                 title="队长已变更",
-                body=f"新队长：{getattr(target_user, 'username', target_user_id)}",
+                body=f"新队长：{target_user.username}",
                 payload={
-                    "contest": getattr(team.contest, "slug", None),
+                    "contest": team.contest.slug,
                     "team": team.slug,
                     "team_id": team_id,
                     "old_captain": old_captain_id,
                     "new_captain": target_user_id,
                 },
-                contest=getattr(team, "contest", None),
+                contest=team.contest,
                 team=team,
                 dedup_key=dedup,
+                team_channel=True,
             )
-        return team
 
 
 class ScoreboardService(BaseService[list[dict]]):
@@ -1139,144 +1363,172 @@ class ScoreboardService(BaseService[list[dict]]):
     """
     atomic_enabled = False
     cache_ttl_seconds: int = getattr(settings, "SCOREBOARD_CACHE_TTL", 30)
+    # 推送摘要预切片的名次数，build_snapshot 在该范围内只需一次 GET
+    snapshot_top_n: int = 10
+    # 重建互斥锁时长（秒）与未抢到锁时等待他人重建的轮询参数
+    # 等待上限只覆盖一次聚合查询的典型耗时，超时即自行计算，避免占住请求线程
+    rebuild_lock_seconds: int = 5
+    rebuild_wait_seconds: float = 0.2
+    rebuild_poll_interval: float = 0.02
 
     def perform(self, contest: Contest, *, ignore_freeze: bool = False) -> list[dict]:
-        """计算记分板：汇总解题记录并排序"""
-        contest_id = getattr(contest, "id", None)
+        """
+        计算记分板：优先读缓存；未命中时加 SET NX 锁合并并发重建，
+        未抢到锁的请求短暂等待缓存回填，超时再自行计算
+        """
+        contest_id = contest.id
         cache_key = self.cache_key(contest_id, ignore_freeze=ignore_freeze)
         cached = redis_client.get_json(cache_key)
         if isinstance(cached, list):
             return cached
+        lock_key = f"{cache_key}:lock"
+        locked = redis_client.acquire_lock(lock_key, ex=self.rebuild_lock_seconds)
+        if not locked and redis_client.healthy():
+            cached = self._wait_for_rebuild(cache_key)
+            if cached is not None:
+                return cached
+        try:
+            result = self._build_board(contest, ignore_freeze=ignore_freeze)
+            # 完整榜单与前 N 名摘要经 pipeline 一次写回，缩短持锁期间的往返
+            redis_client.set_many_json(
+                {
+                    cache_key: result,
+                    self.top_cache_key(contest_id, ignore_freeze=ignore_freeze): result[: self.snapshot_top_n],
+                },
+                ex=self.cache_ttl_seconds,
+            )
+        finally:
+            if locked:
+                redis_client.release_lock(lock_key)
+        return result
+
+    def _wait_for_rebuild(self, cache_key: str) -> list[dict] | None:
+        """短暂等待持锁请求回填缓存，超时返回 None；单次休眠不越过截止时间"""
+        deadline = time.monotonic() + self.rebuild_wait_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(self.rebuild_poll_interval, remaining))
+            cached = redis_client.get_json(cache_key)
+            if isinstance(cached, list):
+                return cached
+        return None
 
+    @classmethod
+    def _build_board(cls, contest: Contest, *, ignore_freeze: bool = False) -> list[dict]:
+        """从数据库聚合生成完整榜单"""
         # 1) 计算封榜/截止时间，封榜后只统计封榜前的解题；否则以比赛结束时间为上限
         now = timezone.now()
         cutoff = contest.end_time
         if contest.freeze_time and now >= contest.freeze_time and not ignore_freeze:
             cutoff = min(contest.freeze_time, contest.end_time)
 
-        # 2) 查询满足时间窗口的解题，按时间排序（裁剪字段，减少 IO）
-        solve_rows = (
-            ChallengeSolve.objects.filter(challenge__contest=contest, solved_at__lte=cutoff)
-            .select_related("challenge", "team", "user")
-            .values(
-                "challenge__slug",
-                "team_id",
-                "user_id",
-                "awarded_points",
-                "bonus_points",
-                "solved_at",
-                "team__slug",
-                "team__name",
-                "user__username",
-            )
-            .order_by("solved_at")
+        # 后续仅以 values()/values_list() 投影列，所需联表由投影字段自动生成，无需 select_related
+        solves_qs = ChallengeSolve.objects.filter(challenge__contest=contest, solved_at__lte=cutoff)
+        if contest.is_team_based:
+            # 组队赛：按队伍汇总
+            group_field, identity_fields = "team_id", ("team__slug", "team__name")
+        else:
+            # 个人赛：按用户汇总
+            group_field, identity_fields = "user_id", ("user__username",)
+
+        # 2) 在数据库内按队伍/用户聚合得分与最后解题时间，并按分数降序、最后解题时间升序排名
+        ranking = (
+            solves_qs.values(group_field, *identity_fields)
+            .annotate(score=Sum("awarded_points"), bonus_score=Sum("bonus_points"), last_solve=Max("solved_at"))
+            .order_by("-score", "last_solve", group_field)
         )
-        board: dict[str, dict] = {}
-        for solve in solve_rows:
-            # 组队赛必须绑定队伍，防止脏数据混入榜单
-            if contest.is_team_based and not solve["team_id"]:
-                logger.warning(
-                    "跳过未绑定队伍的解题记录",
-                    extra=logger_extra(
-                        {
-                            "contest": getattr(contest, "slug", None),
-                            "challenge": solve.get("challenge__slug"),
-                            "user_id": solve.get("user_id"),
-                        }
-                    ),
-                )
+
+        # 3) 逐题明细仅取分组键与得分列，不再联表队伍/用户
+        solves_by_owner: defaultdict[int, list[dict]] = defaultdict(list)
+        breakdown = solves_qs.values_list(
+            group_field, "challenge__slug", "awarded_points", "bonus_points", "solved_at"
+        ).order_by("solved_at")
+        # 明细在追加时即生成最终载荷（时间直接转 ISO 字符串），排名阶段原样引用，不再二次拷贝
+        for owner_id, challenge_slug, points, bonus_points, solved_at in breakdown:
+            if owner_id is None:
                 continue
-            key: str
-            entry: dict
-            if contest.is_team_based and solve["team_id"]:
-                # 组队赛：按队伍汇总
-                key = f"team-{solve['team_id']}"
-                entry = board.setdefault(
-                    key,
-                    {
-                        "type": "team",
-                        "team": {
-                            "id": solve["team_id"],
-                            "name": solve["team__name"],
-                            "slug": solve["team__slug"],
-                        },
-                        "score": 0,
-                        "bonus_score": 0,
-                        "last_solve": solve["solved_at"],
-                        "solves": [],
-                    },
-                )
-            else:
-                # 个人赛：按用户汇总
-                key = f"user-{solve['user_id']}"
-                entry = board.setdefault(
-                    key,
-                    {
-                        "type": "user",
-                        "user": {
-                            "id": solve["user_id"],
-                            "username": solve["user__username"],
-                        },
-                        "score": 0,
-                        "bonus_score": 0,
-                        "last_solve": solve["solved_at"],
-                        "solves": [],
-                    },
-                )
-            bonus_points = solve.get("bonus_points") or 0
-            entry["score"] += solve["awarded_points"]
-            entry["bonus_score"] += bonus_points
-            entry["last_solve"] = solve["solved_at"]
-            entry["solves"].append(
+            solves_by_owner[owner_id].append(
                 {
-                    "challenge": solve["challenge__slug"],
-                    "points": solve["awarded_points"],
+                    "challenge": challenge_slug,
+                    "points": points,
                     "bonus_points": bonus_points,
-                    "base_points": solve["awarded_points"] - bonus_points,
-                    "solved_at": solve["solved_at"],
+                    "base_points": points - bonus_points,
+                    "solved_at": solved_at.isoformat(),
                 }
             )
 
-        # 3) 依据分数与最后解题时间排序并生成排名
-        sorted_entries = sorted(
-            board.values(),
-            key=lambda item: (-item["score"], item["last_solve"]),
-        )
+        # 4) 按赛制选择专用排名循环，避免逐行判断组队/个人分支
+        if contest.is_team_based:
+            return cls._rank_team_rows(contest, ranking, solves_by_owner)
+        return cls._rank_user_rows(ranking, solves_by_owner)
+
+    @staticmethod
+    def _rank_team_rows(contest: Contest, ranking, solves_by_owner: dict[int, list[dict]]) -> list[dict]:
+        """组队赛排名：跳过未绑定队伍的脏数据"""
         result: list[dict] = []
-        for idx, entry in enumerate(sorted_entries, start=1):
-            solves_payload = []
-            for solve in entry.get("solves", []):
-                solved_at = solve.get("solved_at")
-                solved_at_str = solved_at.isoformat() if hasattr(solved_at, "isoformat") else str(solved_at)
-                solves_payload.append(
-                    {
-                        "challenge": solve.get("challenge"),
-                        "points": solve.get("points"),
-                        "bonus_points": solve.get("bonus_points", 0),
-                        "base_points": solve.get("base_points"),
-                        "solved_at": solved_at_str,
-                    }
-                )
-            payload = {
-                **{k: v for k, v in entry.items() if k not in {"solves", "last_solve"}},
-                "rank": idx,
-                "solves": solves_payload,
-            }
-            result.append(payload)
-        redis_client.set_json(cache_key, result, ex=self.cache_ttl_seconds)
+        rank = 0
+        for row in ranking:
+            team_id = row["team_id"]
+            if team_id is None:
+                # 组队赛必须绑定队伍，防止脏数据混入榜单
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "跳过未绑定队伍的解题记录",
+                        extra=logger_extra({"contest": contest.slug}),
+                    )
+                continue
+            rank += 1
+            result.append(
+                {
+                    "type": "team",
+                    "team": {"id": team_id, "name": row["team__name"], "slug": row["team__slug"]},
+                    "score": row["score"] or 0,
+                    "bonus_score": row["bonus_score"] or 0,
+                    "rank": rank,
+                    "solves": solves_by_owner.get(team_id, []),
+                }
+            )
         return result
 
     @staticmethod
+    def _rank_user_rows(ranking, solves_by_owner: dict[int, list[dict]]) -> list[dict]:
+        """个人赛排名：解题记录必带用户，无需空值判断"""
+        return [
+            {
+                "type": "user",
+                "user": {"id": row["user_id"], "username": row["user__username"]},
+                "score": row["score"] or 0,
+                "bonus_score": row["bonus_score"] or 0,
+                "rank": rank,
+                "solves": solves_by_owner.get(row["user_id"], []),
+            }
+            for rank, row in enumerate(ranking, 1)
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
     def cache_key(contest_id: int, *, ignore_freeze: bool = False) -> str:
         # 生成记分板缓存键，便于缓存读写；后台忽略封榜时区分缓存键
         suffix = "admin" if ignore_freeze else "front"
         return f"{scoreboard_key(contest_id)}:{suffix}"
 
+    @classmethod
+    def top_cache_key(cls, contest_id: int, *, ignore_freeze: bool = False) -> str:
+        # 预切片的前 N 名摘要缓存键
+        return f"{cls.cache_key(contest_id, ignore_freeze=ignore_freeze)}:top{cls.snapshot_top_n}"
+
     @classmethod
     def invalidate_cache(cls, contest_id: int) -> None:
-        # 主动失效记分板缓存，供提交/判题后调用
-        redis_client.delete(cls.cache_key(contest_id))
-        redis_client.delete(cls.cache_key(contest_id, ignore_freeze=True))
+        # 主动失效记分板缓存，供提交/判题后调用；前台/后台及摘要键合并为一条 DEL
+        redis_client.delete(
+            *(
+                key
+                for ignore_freeze in (False, True)
+                for key in (
+                    cls.cache_key(contest_id, ignore_freeze=ignore_freeze),
+                    cls.top_cache_key(contest_id, ignore_freeze=ignore_freeze),
+                )
+            )
+        )
 
     def build_snapshot(
             self,
@@ -1290,8 +1542,15 @@ class ScoreboardService(BaseService[list[dict]]):
         - 默认返回前 N 名，减少前端重复拉取
         - ignore_freeze 可用于后台忽略封榜
         """
-        board = self.execute(contest, ignore_freeze=ignore_freeze)
-        entries = board if not limit or limit <= 0 else board[:limit]
+        entries = None
+        if 0 < limit <= self.snapshot_top_n:
+            # 前 N 名在重建时已单独缓存，命中时无需解码整张榜单
+            top = redis_client.get_json(self.top_cache_key(contest.id, ignore_freeze=ignore_freeze))
+            if isinstance(top, list):
+                entries = top[:limit]
+        if entries is None:
+            board = self.execute(contest, ignore_freeze=ignore_freeze)
+            entries = board if not limit or limit <= 0 else board[:limit]
         return {
             "contest": contest.slug,
             "entries": entries,
@@ -1301,6 +1560,17 @@ class ScoreboardService(BaseService[list[dict]]):
         }
 
 
+@dataclass(slots=True)
+class _ScoreTally:
+    """个人贡献累加器：按用户累计得分与解题数，排序后再生成输出字典"""
+
+    user_id: int
+    username: str | None
+    score: int = 0
+    bonus_score: int = 0
+    solves: int = 0
+
+
 class ContestExportService(BaseService[dict]):
     """
     比赛数据导出服务：
@@ -1309,6 +1579,8 @@ class ContestExportService(BaseService[dict]):
     """
 
     atomic_enabled = False
+    # 解题/提交等大表按块流式读取的批大小
+    EXPORT_CHUNK_SIZE = 2000
 
     def __init__(
             self,
@@ -1340,16 +1612,24 @@ class ContestExportService(BaseService[dict]):
 
         # 队伍与成员
         teams_payload = []
-        teams = self.team_repo.filter(contest=contest).select_related("captain")
-        members_qs = self.member_repo.filter(team__contest=contest).select_related("user", "team")
-        members_by_team: dict[int, list[TeamMember]] = {}
-        for member in members_qs:
-            members_by_team.setdefault(getattr(member, "team_id", None), []).append(member)
+        teams = self.team_repo.filter(contest=contest).select_related("contest", "captain")
+        # 成员只需序列化所需列与用户名，不再联表加载队伍及完整用户行
+        members_qs = (
+            self.member_repo.filter(team__contest=contest)
+            .select_related("user")
+            .only("id", "team_id", "user_id", "role", "is_active", "joined_at", "user__username")
+        )
+        members_by_team: defaultdict[int, list[TeamMember]] = defaultdict(list)
+        for member in members_qs.iterator(chunk_size=self.EXPORT_CHUNK_SIZE):
+            members_by_team[member.team_id].append(member)
 
         for team in teams:
-            team_id = getattr(team, "id", None)
+            team_id = team.id
+            team_members = members_by_team.get(team_id, [])
+            # 挂上真实的有效成员列表，人数由序列化按列表长度得出；导出的成员列表随后以全部成员（含已退队）覆盖
+            team.members_prefetched = [m for m in team_members if m.is_active]
             payload = serialize_team(team)
-            payload["members"] = [serialize_team_member(m) for m in members_by_team.get(team_id, [])]
+            payload["members"] = [serialize_team_member(m) for m in team_members]
             teams_payload.append(payload)
 
         # 题目列表
@@ -1360,49 +1640,72 @@ class ContestExportService(BaseService[dict]):
         )
         challenges_payload = [serialize_challenge(ch) for ch in challenges]
 
-        # 解题记录（供榜单或统计使用）
-        solves = (
+        # 解题记录（供榜单或统计使用）：只取导出列并分块流式读取，峰值内存不随记录总量增长
+        solve_rows = (
             self.solve_repo.filter(challenge__contest=contest)
-            .select_related("challenge", "user", "team")
             .order_by("solved_at")
+            .values_list(
+                "challenge__slug",
+                "user_id",
+                "user__username",
+                "team_id",
+                "awarded_points",
+                "bonus_points",
+                "solved_at",
+            )
         )
         solves_payload = [
             {
-                "challenge": getattr(solve.challenge, "slug", None),
-                "user": getattr(solve, "user_id", None),
-                "username": solve.user.username if getattr(solve, "user_id", None) else None,
-                "team": getattr(solve, "team_id", None),
-                "awarded_points": getattr(solve, "awarded_points", 0),
-                "bonus_points": getattr(solve, "bonus_points", 0),
-                "solved_at": getattr(solve, "solved_at", None),
+                "challenge": challenge_slug,
+                "user": user_id,
+                "username": username,
+                "team": team_id,
+                "awarded_points": awarded_points,
+                "bonus_points": bonus_points,
+                "solved_at": solved_at,
             }
-            for solve in solves
+            for challenge_slug, user_id, username, team_id, awarded_points, bonus_points, solved_at
+            in solve_rows.iterator(chunk_size=self.EXPORT_CHUNK_SIZE)
         ]
 
-        # 提交记录（包含正确/错误/重复）
-        submissions = (
+        # 提交记录（包含正确/错误/重复）：同样按列读取并分块迭代
+        submission_rows = (
             self.submission_repo.filter(contest=contest)
-            .select_related("challenge", "user", "team")
             .order_by("-created_at")
+            .values(
+                "id",
+                "challenge__slug",
+                "user_id",
+                "team_id",
+                "status",
+                "is_correct",
+                "awarded_points",
+                "bonus_points",
+                "blood_rank",
+                "message",
+                "solve_id",
+                "created_at",
+                "judged_at",
+            )
         )
         submissions_payload = [
             {
-                "id": getattr(sub, "id", None),
-                "contest": getattr(sub.contest, "slug", None),
-                "challenge": getattr(sub.challenge, "slug", None),
-                "user": getattr(sub, "user_id", None),
-                "team": getattr(sub, "team_id", None),
-                "status": sub.status,
-                "is_correct": sub.is_correct,
-                "awarded_points": getattr(sub, "awarded_points", 0),
-                "bonus_points": getattr(sub, "bonus_points", 0),
-                "blood_rank": getattr(sub, "blood_rank", None),
-                "message": sub.message,
-                "solve_id": getattr(sub, "solve_id", None),
-                "created_at": getattr(sub, "created_at", None),
-                "judged_at": getattr(sub, "judged_at", None),
+                "id": row["id"],
+                "contest": contest.slug,
+                "challenge": row["challenge__slug"],
+                "user": row["user_id"],
+                "team": row["team_id"],
+                "status": row["status"],
+                "is_correct": row["is_correct"],
+                "awarded_points": row["awarded_points"],
+                "bonus_points": row["bonus_points"],
+                "blood_rank": row["blood_rank"],
+                "message": row["message"],
+                "solve_id": row["solve_id"],
+                "created_at": row["created_at"],
+                "judged_at": row["judged_at"],
             }
-            for sub in submissions
+            for row in submission_rows.iterator(chunk_size=self.EXPORT_CHUNK_SIZE)
         ]
 
         # 记分板快照（与详情页相同计算逻辑）
@@ -1410,7 +1713,7 @@ class ContestExportService(BaseService[dict]):
         summary_payload = self._build_summary(contest, scoreboard_payload, solves_payload, submissions_payload)
 
         contest_categories = self.category_repo.list_by_contest(contest)
-        challenge_stats = self._build_challenge_stats(challenges_payload, submissions_payload, solves_payload)
+        challenge_stats = self._build_challenge_stats(contest, challenges_payload)
         return {
             "meta": serialize_contest(contest, categories=contest_categories),
             "overview": {
@@ -1463,40 +1766,40 @@ class ContestExportService(BaseService[dict]):
             top_user = individual_ranking[0].get("user")
 
         # 个人贡献榜（保证团队赛也有个人榜）：统计 solves 和分数
-        individual_scores: dict[int, dict] = {}
+        individual_scores: dict[int, _ScoreTally] = {}
         for solve in solves_payload:
             user_id = solve.get("user")
             if not user_id:
                 continue
-            entry = individual_scores.setdefault(
-                user_id,
-                {
-                    "user_id": user_id,
-                    "username": solve.get("username"),
-                    "score": 0,
-                    "bonus_score": 0,
-                    "solves": 0,
-                },
-            )
-            entry["score"] += solve.get("awarded_points", 0)
-            entry["bonus_score"] += solve.get("bonus_points", 0)
-            entry["solves"] += 1
+            tally = individual_scores.get(user_id)
+            if tally is None:
+                tally = individual_scores[user_id] = _ScoreTally(user_id, solve.get("username"))
+            tally.score += solve.get("awarded_points", 0)
+            tally.bonus_score += solve.get("bonus_points", 0)
+            tally.solves += 1
         # 如果榜单有用户字段，回填 username
         for entry in scoreboard_payload:
             if entry.get("type") == "user" and entry.get("user", {}).get("id"):
                 uid = entry["user"]["id"]
                 if uid in individual_scores:
-                    individual_scores[uid]["username"] = entry["user"].get("username")
+                    individual_scores[uid].username = entry["user"].get("username")
 
         if individual_scores:
             sorted_individuals = sorted(
                 individual_scores.values(),
-                key=lambda x: (-x["score"], -x["bonus_score"], -x["solves"]),
+                key=lambda x: (-x.score, -x.bonus_score, -x.solves),
             )
             # 重新写回排名列表（团队赛也有个人榜）
             individual_ranking = [
-                {**entry, "rank": idx + 1}
-                for idx, entry in enumerate(sorted_individuals)
+                {
+                    "user_id": tally.user_id,
+                    "username": tally.username,
+                    "score": tally.score,
+                    "bonus_score": tally.bonus_score,
+                    "solves": tally.solves,
+                    "rank": idx,
+                }
+                for idx, tally in enumerate(sorted_individuals, start=1)
             ]
             if not top_user and individual_ranking:
                 top_user = individual_ranking[0].get("user_id") or individual_ranking[0].get("username")
@@ -1510,26 +1813,28 @@ class ContestExportService(BaseService[dict]):
             "total_solves": len(solves_payload),
         }
 
-    @staticmethod
-    def _build_challenge_stats(challenges_payload, submissions_payload, solves_payload):
-        """按题目维度统计提交/解题数量，附带题目元信息"""
-        sub_count: dict[str, int] = {}
-        for sub in submissions_payload:
-            slug = sub.get("challenge")
-            if slug:
-                sub_count[slug] = sub_count.get(slug, 0) + 1
-        solve_count: dict[str, int] = {}
-        for solve in solves_payload:
-            slug = solve.get("challenge")
-            if slug:
-                solve_count[slug] = solve_count.get(slug, 0) + 1
+    def _build_challenge_stats(self, contest: Contest, challenges_payload):
+        """按题目维度统计提交/解题数量（数据库 GROUP BY 计数），附带题目元信息"""
+        sub_count = dict(
+            self.submission_repo.filter(contest=contest)
+            .values_list("challenge__slug")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        solve_count = dict(
+            self.solve_repo.filter(challenge__contest=contest)
+            .values_list("challenge__slug")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
         stats = []
         for ch in challenges_payload:
+            slug = ch.get("slug")
             stats.append(
                 {
                     "challenge": ch,
-                    "submissions": sub_count.get(ch.get("slug"), 0),
-                    "solves": solve_count.get(ch.get("slug"), 0),
+                    "submissions": sub_count.get(slug, 0),
+                    "solves": solve_count.get(slug, 0),
                 }
             )
         return stats
@@ -0,0 +1,116 @@
+"""
+比赛信号：
+- 比赛保存/删除后清空仓储层的 slug -> 主键缓存与 Redis 比赛行缓存，避免读取到过期数据
+- 报名、队伍成员、队伍或比赛变更后失效列表页的用户附加字段缓存
+- 报名记录删除后同步移除用户已报名集合
+- 队伍成员变化后清除队伍成员数缓存
+- 题目分类或比赛变更后失效比赛分类缓存
+"""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.challenges.models import ChallengeCategory
+from apps.common.infra import redis_client
+from apps.common.utils.redis_keys import team_member_count_key, user_registered_contests_key
+
+from .models import Contest, ContestParticipant, Team, TeamMember
+from .repo import ContestRepo, clear_slug_cache, team_contest_id
+from .services import ContestContextService
+
+# 影响列表页用户附加字段（报名/组队/副状态）的列；只改其他列的保存不失效缓存
+_CONTEST_USER_FIELD_COLUMNS = frozenset(
+    {"start_time", "end_time", "freeze_time", "registration_start_time", "registration_end_time", "is_team_based"}
+)
+_TEAM_USER_FIELD_COLUMNS = frozenset({"name", "is_active", "contest"})
+_MEMBER_USER_FIELD_COLUMNS = frozenset({"is_active", "team"})
+
+
+def _touches(kwargs: dict, columns: frozenset) -> bool:
+    """保存是否可能改动给定列：全量保存视为可能，指定 update_fields 时看是否有交集"""
+    update_fields = kwargs.get("update_fields")
+    return update_fields is None or not columns.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Contest)
+@receiver(post_delete, sender=Contest)
+def invalidate_contest_slug_cache(sender, instance, **kwargs) -> None:
+    """比赛变更后清空 slug 缓存与 Redis 比赛行缓存；行缓存提交后再清一次，避免事务内被并发读取回填旧行"""
+    clear_slug_cache()
+    pk = instance.pk
+    ContestRepo.clear_cached_row(pk)
+    transaction.on_commit(lambda: ContestRepo.clear_cached_row(pk))
+    # 分类序列化结果内含比赛 slug，比赛变更时一并失效
+    ContestContextService.invalidate_category_cache(pk)
+
+
+@receiver(post_save, sender=Contest)
+@receiver(post_delete, sender=Contest)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def invalidate_contest_user_fields(sender, instance, **kwargs) -> None:
+    """
+    比赛时间或队伍信息变化会影响全部用户的附加字段，整场失效（自增版本号，O(1)）
+    - 新建的比赛/队伍还没有任何用户缓存，跳过
+    - 只改动无关列（如描述、邀请码）的保存跳过
+    """
+    if kwargs.get("created"):
+        return
+    columns = _CONTEST_USER_FIELD_COLUMNS if sender is Contest else _TEAM_USER_FIELD_COLUMNS
+    if not _touches(kwargs, columns):
+        return
+    contest_id = instance.pk if sender is Contest else instance.contest_id
+    ContestContextService.invalidate_user_contest_fields(contest_id)
+
+
+@receiver(post_save, sender=ContestParticipant)
+@receiver(post_delete, sender=ContestParticipant)
+def invalidate_participant_user_fields(sender, instance, **kwargs) -> None:
+    """报名记录变化仅影响该用户"""
+    ContestContextService.invalidate_user_contest_fields(instance.contest_id, instance.user_id)
+
+
+@receiver(post_delete, sender=ContestParticipant)
+def forget_registered_contest(sender, instance, **kwargs) -> None:
+    """报名记录删除后从用户已报名集合中移除"""
+    redis_client.srem(user_registered_contests_key(instance.user_id), instance.contest_id)
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_member_user_fields(sender, instance, **kwargs) -> None:
+    """
+    队伍成员变化仅影响该用户
+    - 所属比赛优先取已加载的队伍，否则查进程内 team_id -> 比赛 id 缓存，级联删除时不再逐个成员查询队伍
+    """
+    if not _touches(kwargs, _MEMBER_USER_FIELD_COLUMNS):
+        return
+    if TeamMember.team.is_cached(instance):
+        contest_id = instance.team.contest_id
+    else:
+        try:
+            contest_id = team_contest_id(instance.team_id)
+        except Team.DoesNotExist:  # type: ignore[attr-defined]
+            # 队伍已删除：队伍自身的删除信号已整场失效
+            return
+    ContestContextService.invalidate_user_contest_fields(contest_id, instance.user_id)
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_team_member_count(sender, instance, **kwargs) -> None:
+    """成员变化后清除队伍成员数缓存，下次读取按 SQL 回填；提交后再清一次，避免事务内回填的计数残留"""
+    key = team_member_count_key(instance.team_id)
+    redis_client.delete(key)
+    transaction.on_commit(lambda: redis_client.delete(key))
+
+
+@receiver(post_save, sender=ChallengeCategory)
+@receiver(post_delete, sender=ChallengeCategory)
+def invalidate_contest_categories(sender, instance, **kwargs) -> None:
+    """后台等途径单独修改题目分类时失效所属比赛的分类缓存"""
+    if instance.contest_id:
+        ContestContextService.invalidate_category_cache(instance.contest_id)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+from apps.common.infra.logger import get_logger, logger_extra
+from apps.common.ws_utils import broadcast_contest, broadcast_notify
+from apps.notifications.models import Notification
+from apps.notifications.services import fanout_notifications, build_dedup_key
+
+from .repo import TeamMemberRepo
+from .services import build_team_member_snapshot, serialize_team_member
+
+logger = get_logger(__name__)
+
+TEAM_CREATED = "team_created"
+TEAM_JOINED = "team_joined"
+
+
+@shared_task(name="contests.after_team_joined")
+def after_team_joined(team_id: int, user_id: int, contest_id: int, event: str = TEAM_JOINED) -> None:
+    """
+    Celery 任务：队伍创建/加入提交后的广播与通知
+
+    - 由服务层在事务提交后投递，重新读取成员记录，事务回滚时不会产生过期事件
+    - team_created 仅推送队长快照；team_joined 额外向队伍全体成员扇出系统通知
+    """
+    member_repo = TeamMemberRepo()
+    member = (
+        member_repo.filter(team_id=team_id, user_id=user_id, team__contest_id=contest_id, is_active=True)
+        .select_related("user", "team", "team__contest")
+        .first()
+    )
+    if member is None:
+        # 成员已离队或记录不存在（例如写入被回滚），无需广播
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "队伍事件跳过：成员记录不存在",
+                extra=logger_extra({"team_id": team_id, "user_id": user_id, "event": event}),
+            )
+        return
+    team = member.team
+    contest = team.contest
+    member_payload = serialize_team_member(member)
+    if event == TEAM_CREATED:
+        # 新建队伍只有队长一人，快照直接由成员载荷构造
+        snapshot = {"member_count": 1, "members": [member_payload], "has_more_members": False}
+    else:
+        snapshot = build_team_member_snapshot(member_repo, team, limit=20)
+    broadcast_contest(
+        contest.slug,
+        {
+            "event": event,
+            "contest": contest.slug,
+            "team": team.slug,
+            "team_id": team_id,
+            "user_id": user_id,
+            "member": member_payload,
+            **snapshot,
+        },
+    )
+    broadcast_notify(
+        user_id,
+        {
+            "event": event,
+            "contest": contest.slug,
+            "team": team.slug,
+            "team_id": team_id,
+            "member": member_payload,
+            **snapshot,
+        },
+    )
+    if event != TEAM_JOINED:
+        return
+    # 系统通知：队员加入队伍；快照已含全部成员时直接复用其用户 id，否则仅查询 id 列
+    if snapshot["has_more_members"]:
+        member_user_ids = list(member_repo.active_member_user_ids(team))
+    else:
+        member_user_ids = [m["user_id"] for m in snapshot["members"]]
+    if not member_user_ids:
+        return
+    dedup = build_dedup_key(
+        type=Notification.Type.TEAM_MEMBER_JOINED,
+        contest=contest,
+        team=team,
+        extra=str(user_id),
+    )
+    fanout_notifications(
+        user_ids=member_user_ids,
+        type=Notification.Type.TEAM_MEMBER_JOINED,
+        title=f"{member_payload['username'] or '成员'} 加入队伍",
+        body=team.name,
+        payload={
+            "contest": contest.slug,
+            "team": team.slug,
+            "team_id": team_id,
+            "user_id": user_id,
+        },
+        contest=contest,
+        team=team,
+        dedup_key=dedup,
+    )
+
+
+def enqueue_team_event(team_id: int, user_id: int, contest_id: int, event: str = TEAM_JOINED) -> None:
+    """
+    投递队伍事件任务（服务层在事务提交后调用）：
+    - broker 不可用时 delay 会抛错，此时记录告警并在当前进程同步执行，保持广播/通知尽力而为
+    - 同步执行同样失败时仅记录日志，不影响已提交的写入结果
+    """
+    try:
+        after_team_joined.delay(team_id, user_id, contest_id, event=event)
+        return
+    except Exception:
+        logger.warning(
+            "队伍事件投递失败，改为同步执行",
+            extra=logger_extra({"team_id": team_id, "user_id": user_id, "event": event}),
+            exc_info=True,
+        )
+    try:
+        after_team_joined(team_id, user_id, contest_id, event=event)
+    except Exception:
+        logger.warning(
+            "队伍事件同步执行失败，已忽略",
+            extra=logger_extra({"team_id": team_id, "user_id": user_id, "event": event}),
+            exc_info=True,
+        )
@@ -1,71 +1,131 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from unittest import mock
 
 from django.test import TestCase, override_settings
+from django.urls import reverse
 from django.conf import settings
-from django.core.cache import cache
-from rest_framework.test import APITestCase, APIClient
+from django.db import connections
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory, force_authenticate
 from django.utils import timezone
 from apps.common.exceptions import ContestEndedError, ConflictError
 
 from apps.accounts.models import User
+from apps.challenges.models import ChallengeSolve
 from apps.challenges.schemas import ChallengeCreateSchema
 from apps.challenges.services import ChallengeCreateService
+from apps.common.infra import redis_client
 from apps.common.tests_utils import AuthenticatedAPIMixin
+from apps.common.utils.redis_keys import team_member_count_key
+from apps.notifications.models import Notification
+from apps.notifications.services import fanout_notifications
 from apps.submissions.schemas import SubmissionCreateSchema
 from apps.submissions.services import SubmissionService
 
-from .models import Contest
+from .models import Contest, ContestAnnouncement, ContestParticipant
+from .repo import ContestParticipantRepo
+from .tasks import after_team_joined
 from .schemas import (
+    AnnouncementCreateSchema,
     TeamCreateSchema,
     TeamJoinSchema,
     TeamInviteResetSchema,
     TeamTransferSchema,
 )
+from .views import ChallengeCategoryView, ContestDetailView
 from .services import (
+    ContestAnnouncementService,
+    ContestContextService,
     ContestRegisterService,
     TeamCreateService,
     TeamJoinService,
     ScoreboardService,
     TeamInviteResetService,
     TeamTransferService,
+    serialize_team,
 )
 
 
 # 测试用例：覆盖 contests 模块的服务层与 API 冒烟，确保核心流程可用
 
+# 测试内使用 MD5 哈希创建/校验密码，避免默认慢哈希拖慢建用户与登录
+FAST_PASSWORD_HASHERS = ("django.contrib.auth.hashers.MD5PasswordHasher",)
+
+
+def settings_overrides(**overrides) -> dict:
+    """以 Config.settings_test 运行时这些配置已在设置模块中生效，跳过逐类覆盖；否则原样返回"""
+    return {} if getattr(settings, "TESTING", False) else overrides
+
+
+def ensure_savepoint_rollback(test_cls: type) -> None:
+    """
+    校验用例类仍基于 TestCase 的保存点回滚：夹具只建一次、每个用例结束回滚到保存点
+    - 改用 TransactionTestCase 会在每个用例后清空整库，慢一个数量级
+    - 需要验证 on_commit 回调时使用 self.captureOnCommitCallbacks(execute=True)，不要更换基类
+    """
+    assert issubclass(test_cls, TestCase), f"{test_cls.__name__} 必须继承 django.test.TestCase"
+    for alias in test_cls.databases:
+        assert connections[alias].features.supports_transactions, f"测试数据库 {alias} 需支持事务以使用保存点回滚"
+
 
 @override_settings(
-    CACHES={
-        "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-            "LOCATION": "contests-service-tests",
-        }
-    }
+    **settings_overrides(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "contests-service-tests",
+            }
+        },
+        PASSWORD_HASHERS=FAST_PASSWORD_HASHERS,
+    )
 )
 class ContestServiceTests(TestCase):
     """服务层单元测试：验证队伍创建/加入/移交与记分板逻辑"""
 
-    def setUp(self) -> None:
-        """构造一场进行中的比赛和两个普通用户供各用例复用"""
-        # 构造进行中的比赛和两个用户
+    # 只在默认库上开启/回滚事务，且不走序列化回滚
+    databases = {"default"}
+    serialized_rollback = False
+
+    # 服务均为无状态对象，类级别各实例化一次供全部用例复用
+    register_service = ContestRegisterService()
+    team_create_service = TeamCreateService()
+    team_join_service = TeamJoinService()
+    invite_reset_service = TeamInviteResetService()
+    transfer_service = TeamTransferService()
+    challenge_create_service = ChallengeCreateService()
+    submission_service = SubmissionService()
+    scoreboard_service = ScoreboardService()
+    context_service = ContestContextService()
+    announcement_service = ContestAnnouncementService()
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        ensure_savepoint_rollback(cls)
+
+    @classmethod
+    def setUpTestData(cls):
+        """一次性构造一场进行中的比赛和两个普通用户，各用例在事务回滚中复用"""
+        # 用例只要求当前时间处于比赛窗口内，前后各留一年，避免依赖用例运行时长
         now = timezone.now()
-        self.contest = Contest.objects.create(
+        cls.contest = Contest.objects.create(
             name="Spring CTF",
             slug="spring-ctf",
-            start_time=now - timedelta(hours=1),
-            end_time=now + timedelta(hours=4),
+            start_time=now - timedelta(days=365),
+            end_time=now + timedelta(days=365),
             max_team_members=3,
         )
-        self.user1 = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234")
-        self.user2 = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234")
+        cls.user1 = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234")
+        cls.user2 = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234")
+        # 两名用户预先报名，各用例直接在已报名状态上组队/提交
+        cls.register_service.execute(cls.user1, "spring-ctf")
+        cls.register_service.execute(cls.user2, "spring-ctf")
 
     def test_team_create_service(self):
         """创建队伍后，队长成员记录应自动生成"""
-        ContestRegisterService().execute(self.user1, "spring-ctf")
         schema = TeamCreateSchema(contest_slug="spring-ctf", name="Alpha Team")
-        team = TeamCreateService().execute(self.user1, schema)
+        team = self.team_create_service.execute(self.user1, schema)
         self.assertEqual(team.name, "Alpha Team")
         self.assertEqual(team.contest, self.contest)
         self.assertEqual(team.captain, self.user1)
@@ -73,35 +133,62 @@ class ContestServiceTests(TestCase):
 
     def test_team_join_service(self):
         """验证邀请码加入队伍流程与角色设定"""
-        ContestRegisterService().execute(self.user1, "spring-ctf")
-        ContestRegisterService().execute(self.user2, "spring-ctf")
-        team = TeamCreateService().execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Beta"))
+        team = self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Beta"))
         schema = TeamJoinSchema(contest_slug="spring-ctf", invite_token=team.invite_token)
-        membership = TeamJoinService().execute(self.user2, schema)
+        membership = self.team_join_service.execute(self.user2, schema)
         self.assertEqual(membership.team, team)
         self.assertEqual(membership.user, self.user2)
         self.assertEqual(membership.role, "member")
 
     def test_team_invite_reset_and_transfer(self):
         """验证重置邀请码与队长移交链路"""
-        ContestRegisterService().execute(self.user1, "spring-ctf")
-        ContestRegisterService().execute(self.user2, "spring-ctf")
-        team = TeamCreateService().execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Gamma"))
+        team = self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Gamma"))
         # 重置邀请码
         reset_schema = TeamInviteResetSchema(team_id=team.id)  # type: ignore[attr-defined]
-        updated_team = TeamInviteResetService().execute(self.user1, reset_schema)
+        updated_team = self.invite_reset_service.execute(self.user1, reset_schema)
         self.assertNotEqual(team.invite_token, updated_team.invite_token)
         # 队长移交
-        TeamJoinService().execute(self.user2,
+        self.team_join_service.execute(self.user2,
                                   TeamJoinSchema(contest_slug="spring-ctf", invite_token=updated_team.invite_token))
         transfer_schema = TeamTransferSchema(team_id=team.id, new_captain_id=self.user2.id)  # type: ignore[attr-defined]
-        updated_team = TeamTransferService().execute(self.user1, transfer_schema)
+        updated_team = self.transfer_service.execute(self.user1, transfer_schema)
         self.assertEqual(updated_team.captain_id, self.user2.id)  # type: ignore[attr-defined]
 
+    def test_transfer_to_inactive_member_refreshes_member_count(self):
+        """移交给已退队成员会重新激活其成员关系，队伍有效人数（含计数缓存）应随之更新"""
+        team = self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Delta"))
+        self.team_join_service.execute(
+            self.user2, TeamJoinSchema(contest_slug="spring-ctf", invite_token=team.invite_token)
+        )
+        member_repo = self.transfer_service.member_repo
+        member_repo.filter(team=team, user=self.user2).update(is_active=False)
+        # 模拟退队后已回填的计数缓存（Redis 不可用时写入为空操作，直接走 SQL 计数）
+        redis_client.set(team_member_count_key(team.id), 1)
+        self.transfer_service.execute(
+            self.user1, TeamTransferSchema(team_id=team.id, new_captain_id=self.user2.id)  # type: ignore[attr-defined]
+        )
+        self.assertEqual(member_repo.active_count(team), 2)
+
+    def test_team_join_event_falls_back_when_broker_down(self):
+        """broker 不可用时加入队伍仍成功，队伍事件在当前进程同步执行并写入成员通知"""
+        team = self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Eps"))
+        with mock.patch.object(after_team_joined, "delay", side_effect=OSError("broker down")):
+            with self.captureOnCommitCallbacks(execute=True):
+                membership = self.team_join_service.execute(
+                    self.user2, TeamJoinSchema(contest_slug="spring-ctf", invite_token=team.invite_token)
+                )
+        self.assertTrue(membership.is_active)
+        notified = Notification.objects.filter(type=Notification.Type.TEAM_MEMBER_JOINED, team=team)
+        self.assertEqual(sorted(notified.values_list("user_id", flat=True)), sorted([self.user1.id, self.user2.id]))
+
+    def test_after_team_joined_skips_missing_member(self):
+        """成员记录不存在（如写入已回滚）时任务直接跳过，不产生通知"""
+        after_team_joined(team_id=0, user_id=self.user1.id, contest_id=self.contest.id)
+        self.assertFalse(Notification.objects.filter(type=Notification.Type.TEAM_MEMBER_JOINED).exists())
+
     def test_scoreboard_service(self):
         """验证记分板汇总逻辑：应按解题记录累加得分"""
-        ContestRegisterService().execute(self.user1, "spring-ctf")
-        ChallengeCreateService().execute(
+        self.challenge_create_service.execute(
             self.user1,
             ChallengeCreateSchema(
                 contest_slug="spring-ctf",
@@ -112,15 +199,186 @@ class ContestServiceTests(TestCase):
                 dynamic_prefix="flag",
             ),
         )
-        TeamCreateService().execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Gamma"))
-        SubmissionService().execute(
+        self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Gamma"))
+        self.submission_service.execute(
             self.user1,
             SubmissionCreateSchema(contest_slug="spring-ctf", challenge_slug="warmup", flag="flag{123}"),
         )
-        scoreboard = ScoreboardService().execute(self.contest)
+        scoreboard = self.scoreboard_service.execute(self.contest)
         self.assertGreaterEqual(len(scoreboard), 1)
         self.assertEqual(scoreboard[0]["score"], 100)
 
+    def test_scoreboard_ranking_ties_and_freeze(self):
+        """验证聚合排名：同分按最后解题时间先者在前，封榜后只统计封榜前的解题，后台视图不受封榜影响"""
+        challenges = [
+            self.challenge_create_service.execute(
+                self.user1,
+                ChallengeCreateSchema(
+                    contest_slug="spring-ctf", title=slug, slug=slug, content="Find flag", flag="1", dynamic_prefix="flag"
+                ),
+            )
+            for slug in ("rank-a", "rank-b")
+        ]
+        alpha = self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Alpha"))
+        beta = self.team_create_service.execute(self.user2, TeamCreateSchema(contest_slug="spring-ctf", name="Beta"))
+        # 两队总分同为 160，Beta 的最后解题更早，应排在 Alpha 之前
+        now = timezone.now()
+        for user, team, minutes, bonus in (
+                (self.user1, alpha, (30, 10), (10, 0)),
+                (self.user2, beta, (40, 20), (0, 10)),
+        ):
+            ChallengeSolve.objects.bulk_create(
+                ChallengeSolve(
+                    challenge=challenge,
+                    user=user,
+                    team=team,
+                    awarded_points=100 - 50 * index + bonus[index],
+                    bonus_points=bonus[index],
+                    solved_at=now - timedelta(minutes=minutes[index]),
+                )
+                for index, challenge in enumerate(challenges)
+            )
+
+        self.scoreboard_service.invalidate_cache(self.contest.id)
+        board = self.scoreboard_service.execute(self.contest)
+        self.assertEqual([row["team"]["id"] for row in board], [beta.id, alpha.id])
+        self.assertEqual([row["rank"] for row in board], [1, 2])
+        self.assertEqual([row["score"] for row in board], [160, 160])
+        self.assertEqual([row["bonus_score"] for row in board], [10, 10])
+        self.assertEqual([solve["challenge"] for solve in board[0]["solves"]], ["rank-a", "rank-b"])
+        self.assertEqual(board[0]["solves"][1]["base_points"], 50)
+
+        # 封榜于 25 分钟前：前台只计第一题，Alpha 110 分领先；后台忽略封榜仍为完整榜单
+        self.contest.freeze_time = now - timedelta(minutes=25)
+        self.contest.save(update_fields=["freeze_time"])
+        self.scoreboard_service.invalidate_cache(self.contest.id)
+        frozen = self.scoreboard_service.execute(self.contest)
+        self.assertEqual([(row["team"]["id"], row["score"]) for row in frozen], [(alpha.id, 110), (beta.id, 100)])
+        self.assertTrue(all(len(row["solves"]) == 1 for row in frozen))
+        admin_board = self.scoreboard_service.execute(self.contest, ignore_freeze=True)
+        self.assertEqual([(row["team"]["id"], row["score"]) for row in admin_board], [(beta.id, 160), (alpha.id, 160)])
+
+    def test_serialize_team_counts_empty_prefetch_without_repo(self):
+        """预取到的空成员列表即 0 人，不应再回退计数缓存；未预取时使用注入的仓储计数"""
+        team = self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Empty"))
+        member_repo = mock.Mock()
+        member_repo.active_count.return_value = 7
+
+        team.members_prefetched = []
+        payload = serialize_team(team, member_repo=member_repo)
+        self.assertEqual(payload["member_count"], 0)
+        self.assertNotIn("members", payload)
+        member_repo.active_count.assert_not_called()
+
+        del team.members_prefetched
+        self.assertEqual(serialize_team(team, member_repo=member_repo)["member_count"], 7)
+        member_repo.active_count.assert_called_once_with(team)
+
+    def test_sync_participant_statuses_bulk_promotes(self):
+        """开赛后批量同步：已报名记录应统一推进为进行中"""
+        # 夹具报名时比赛已开始，先退回已报名状态再验证批量推进
+        ContestParticipant.objects.filter(contest=self.contest).update(status=ContestParticipant.Status.REGISTERED)
+        promoted = self.context_service.sync_participant_statuses(self.contest)
+        self.assertEqual(promoted, 2)
+        self.assertFalse(
+            ContestParticipant.objects.filter(
+                contest=self.contest, status=ContestParticipant.Status.REGISTERED
+            ).exists()
+        )
+
+    def test_bulk_ensure_inserts_missing_and_never_demotes(self):
+        """批量确保参与记录：缺失的插入，已有记录跳过插入且只向前推进状态，不降级"""
+        Status = ContestParticipant.Status
+        user3 = User.objects.create_user(username="carol", email="carol@example.com", password="Pass1234")
+        participants = ContestParticipant.objects.filter(contest=self.contest)
+        participants.filter(user=self.user1).update(status=Status.FINISHED)
+        participants.filter(user=self.user2).update(status=Status.REGISTERED, is_valid=True)
+        existing_ids = dict(participants.values_list("user_id", "id"))
+
+        ContestParticipantRepo().bulk_ensure(self.contest, [self.user1, self.user2, user3], Status.RUNNING)
+
+        rows = {p.user_id: p for p in participants}
+        self.assertEqual(len(rows), 3)
+        # 已结束高于进行中：不被降级
+        self.assertEqual(rows[self.user1.id].status, Status.FINISHED)
+        # 已报名推进为进行中，已有行未被插入覆盖：主键与有效标记保持不变
+        self.assertEqual(rows[self.user2.id].status, Status.RUNNING)
+        self.assertTrue(rows[self.user2.id].is_valid)
+        self.assertEqual({uid: rows[uid].id for uid in existing_ids}, existing_ids)
+        # 缺失的记录按目标状态新建
+        self.assertEqual(rows[user3.id].status, Status.RUNNING)
+
+    def test_announcement_fanout_by_user_ids(self):
+        """发布公告：按参赛用户 id 批量写入通知，重复去重键应刷新而非重复插入"""
+        # 夹具报名均未组队（无效），仅将 user1 标记为有效参赛
+        ContestParticipant.objects.filter(contest=self.contest, user=self.user1).update(is_valid=True)
+        schema = AnnouncementCreateSchema(
+            contest_slug="spring-ctf", title="Rules", summary="Read me", content="No flag sharing"
+        )
+        self.announcement_service.execute(schema)
+        notifs = Notification.objects.filter(type=Notification.Type.CONTEST_ANNOUNCEMENT_NEW)
+        self.assertEqual(list(notifs.values_list("user_id", flat=True)), [self.user1.id])
+        notifs.update(read_at=timezone.now())
+        fanout_notifications(
+            user_ids=[self.user1.id],
+            type=Notification.Type.CONTEST_ANNOUNCEMENT_NEW,
+            title="Rules v2",
+            contest=self.contest,
+            dedup_key=notifs.get().dedup_key,
+        )
+        refreshed = notifs.get()
+        self.assertEqual(refreshed.title, "Rules v2")
+        self.assertIsNone(refreshed.read_at)
+        self.assertEqual(notifs.count(), 1)
+        # 同一去重键换类型重发：刷新时应同步更新 type，而不是保留旧类型
+        fanout_notifications(
+            user_ids=[self.user1.id],
+            type=Notification.Type.CONTEST_STARTED,
+            title="Rules v3",
+            contest=self.contest,
+            dedup_key=refreshed.dedup_key,
+        )
+        self.assertEqual(Notification.objects.get(pk=refreshed.pk).type, Notification.Type.CONTEST_STARTED)
+
+    def test_get_context_participant_saves_to_own_row(self):
+        """联表还原的报名记录主键/外键应与库中一致，保存时只写回本人的报名行"""
+        self.team_create_service.execute(self.user1, TeamCreateSchema(contest_slug="spring-ctf", name="Ctx"))
+        repo = ContestParticipantRepo()
+        participant, membership = repo.get_context(self.contest, self.user1)
+        self.assertIsNotNone(membership)
+        own = ContestParticipant.objects.get(contest=self.contest, user=self.user1)
+        other = ContestParticipant.objects.get(contest=self.contest, user=self.user2)
+        self.assertEqual(
+            (participant.pk, participant.contest_id, participant.user_id),
+            (own.pk, self.contest.id, self.user1.id),
+        )
+        ContestParticipant.objects.filter(pk__in=[own.pk, other.pk]).update(
+            status=ContestParticipant.Status.REGISTERED
+        )
+        participant.status = ContestParticipant.Status.REGISTERED
+        repo.update_status(participant, ContestParticipant.Status.FINISHED)
+        own.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(own.status, ContestParticipant.Status.FINISHED)
+        self.assertEqual(other.status, ContestParticipant.Status.REGISTERED)
+
+    def test_bulk_context_restores_participant_keys(self):
+        """批量还原的报名记录主键/外键应与库中一致，未组队时不返回成员关系"""
+        contexts = ContestParticipantRepo().bulk_context([self.contest.id], self.user2.id)
+        participant, membership = contexts[self.contest.id]
+        own = ContestParticipant.objects.get(contest=self.contest, user=self.user2)
+        self.assertIsNone(membership)
+        self.assertEqual(
+            (participant.pk, participant.contest_id, participant.user_id, participant.status),
+            (own.pk, self.contest.id, self.user2.id, own.status),
+        )
+        # 夹具报名均为无效，翻转为有效后只应影响本人的报名行
+        participant.is_valid = True
+        participant.save(update_fields=["is_valid"])
+        own.refresh_from_db()
+        self.assertTrue(own.is_valid)
+        self.assertFalse(ContestParticipant.objects.get(contest=self.contest, user=self.user1).is_valid)
+
     def test_contest_register_reject_when_ended(self):
         """比赛已结束时报名应被拒绝并抛出 ContestEndedError"""
         past = timezone.now() - timedelta(hours=3)
@@ -132,53 +390,123 @@ class ContestServiceTests(TestCase):
             max_team_members=3,
         )
         with self.assertRaises((ContestEndedError, ConflictError)):
-            ContestRegisterService().execute(self.user1, ended.slug)
+            self.register_service.execute(self.user1, ended.slug)
 
 
 @override_settings(
-    REST_FRAMEWORK={
-        **settings.REST_FRAMEWORK,
-        "DEFAULT_THROTTLE_RATES": {
-            **settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {}),
-            "login": "1000/min",
-            "user_post": "1000/min",
+    **settings_overrides(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                **settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {}),
+                # 速率置空即关闭对应限流，SimpleRateThrottle 直接放行，不再读写计数缓存
+                "login": None,
+                "user_post": None,
+            },
         },
-    },
-    CACHES={
-        "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-            "LOCATION": "contests-api-tests",
-        }
-    },
-    ALLOW_LOGIN_WITHOUT_CAPTCHA=True,
-    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "contests-api-tests",
+            }
+        },
+        ALLOW_LOGIN_WITHOUT_CAPTCHA=True,
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        PASSWORD_HASHERS=FAST_PASSWORD_HASHERS,
+    )
 )
 class ContestsAPITestCase(AuthenticatedAPIMixin, APITestCase):
     """Contests 模块接口冒烟：比赛、公告、队伍全链路"""
 
+    # 只在默认库上开启/回滚事务，且不走序列化回滚
+    databases = {"default"}
+    serialized_rollback = False
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        ensure_savepoint_rollback(cls)
+
     @classmethod
     def setUpTestData(cls):
         """一次性创建管理员和两个普通用户，供全局用例复用"""
+        # 通过管理器建号，昵称、account_id 与管理员标记由模型自行补齐；邮箱验证随创建一并写入，省去逐个 save
         cls.admin = User.objects.create_superuser(
             username="admin_test_user",
             email="admin@example.com",
             password="StrongPass123!",
+            is_email_verified=True,
         )
-        cls.admin.is_email_verified = True
-        cls.admin.save()
-        cls.user1 = User.objects.create_user(username="alice", email="alice@example.com", password="Passw0rd123")
-        cls.user1.is_email_verified = True
-        cls.user1.save()
-        cls.user2 = User.objects.create_user(username="bob", email="bob@example.com", password="Passw0rd123")
-        cls.user2.is_email_verified = True
-        cls.user2.save()
+        cls.user1 = User.objects.create_user(
+            username="alice", email="alice@example.com", password="Passw0rd123", is_email_verified=True
+        )
+        cls.user2 = User.objects.create_user(
+            username="bob", email="bob@example.com", password="Passw0rd123", is_email_verified=True
+        )
+        # 不专门验证建赛接口的用例共用一场进行中的团队赛，直接落库，用例内修改随事务回滚
+        now = timezone.now()
+        cls.shared_contest = Contest.objects.create(
+            name="shared contest",
+            slug="shared-contest",
+            description="desc",
+            start_time=now - timedelta(days=1),
+            end_time=now + timedelta(days=1),
+            is_team_based=True,
+        )
+
+    # 路由反查结果按 (名称, 参数) 缓存在类上，同一地址只解析一次
+    _url_cache: dict[tuple, str] = {}
+
+    @classmethod
+    def _url(cls, name: str, **kwargs) -> str:
+        """按 contests 命名空间反查接口地址，避免用例硬编码路径"""
+        key = (name, tuple(sorted(kwargs.items())))
+        url = cls._url_cache.get(key)
+        if url is None:
+            url = cls._url_cache[key] = reverse(f"contests:{name}", kwargs=kwargs or None)
+        return url
+
+    _factory = APIRequestFactory()
+
+    def _call_view(self, view_cls, method: str, url: str, *, user: User | None = None, data=None, **view_kwargs):
+        """以 APIRequestFactory 构造请求并直接调用视图，可选强制认证；响应未渲染，断言请使用 resp.data"""
+        if method == "get":
+            request = self._factory.get(url, data)
+        else:
+            request = getattr(self._factory, method)(url, data, format="json")
+        if user is not None:
+            force_authenticate(request, user=user)
+        return view_cls.as_view()(request, **view_kwargs)
+
+    def _as(self, user: User | None) -> APIClient:
+        """复用本用例的 self.client，按请求切换强制认证身份；传 None 回到匿名"""
+        self.client.raise_request_exception = False
+        self.client.force_authenticate(user=user)
+        return self.client
+
+    # 夹具账号的明文密码，真实令牌用例按用户名登录
+    _PASSWORDS = {"admin_test_user": "StrongPass123!", "alice": "Passw0rd123", "bob": "Passw0rd123"}
+    # 各账号只走一次登录接口：JWT 无状态，用例回滚不影响令牌有效性
+    _access_tokens: dict[str, str] = {}
+
+    def _jwt(self, user: User | None) -> APIClient:
+        """以登录接口签发的真实访问令牌请求，覆盖认证类与令牌校验；传 None 清空凭据回到匿名"""
+        self.client.raise_request_exception = False
+        self.client.force_authenticate(user=None)
+        if user is None:
+            self.client.credentials()
+            return self.client
+        token = self._access_tokens.get(user.username)
+        if token is None:
+            token = self._access_tokens[user.username] = self.api_login(user.username, self._PASSWORDS[user.username])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.client
 
     def setUp(self):
-        """每个测试前重置时间窗口并清理缓存以避免限流影响"""
-        # 每个用例重置时间窗口并清理缓存，避免节流干扰
+        """每个测试前重置比赛时间窗口"""
+        # 限流已关闭且真实令牌按账号缓存，无需再清理限流计数
         self.now_minus = timezone.now() - timedelta(hours=1)
         self.now_plus = timezone.now() + timedelta(hours=1)
-        cache.clear()
 
     def _create_contest(self, client: APIClient, slug: str, categories: list[str] | None = None) -> str:
         """使用管理员创建比赛，返回 slug"""
@@ -192,52 +520,89 @@ class ContestsAPITestCase(AuthenticatedAPIMixin, APITestCase):
         }
         if categories is not None:
             payload["categories"] = categories
-        resp = client.post("/api/contests/", payload, format="json")
+        resp = client.post(self._url("list"), payload, format="json")
         self.assertEqual(resp.status_code, 201)
         return resp.data["data"]["contest"]["slug"]
 
     def test_contest_list_detail_and_announcements(self):
         """验证比赛创建、公告发布、列表筛选与详情展示"""
-        admin_client = self._auth_client("admin_test_user", "StrongPass123!")
-        slug = self._create_contest(admin_client, "spring-open")
+        slug = self._create_contest(self._as(self.admin), "spring-open")
 
         # 创建公告
-        resp = admin_client.post(
-            f"/api/contests/{slug}/announcements/",
+        resp = self._as(self.admin).post(
+            self._url("announcements", contest_slug=slug),
             {"title": "欢迎", "summary": "平台升级公告摘要", "content": "开赛公告"},
             format="json",
         )
         self.assertEqual(resp.status_code, 201)
 
+        # 公告键集分页：before 游标晚于发布时间时应返回该公告
+        resp = self._as(None).get(
+            self._url("announcements", contest_slug=slug),
+            {"before": (timezone.now() + timedelta(minutes=1)).isoformat()},
+        )
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(len(resp.data["data"]["items"]), 1)
+        self.assertFalse(resp.data["extra"]["has_next"])
+
         # 列表 running 应包含该比赛
-        resp = self.client.get("/api/contests/?status=running")
+        resp = self._as(None).get(self._url("list"), {"status": "running"})
         self.assertEqual(resp.status_code, 200, resp.content)
         listing = next((item for item in resp.data["data"]["items"] if item["slug"] == slug), None)
         self.assertIsNotNone(listing)
         self.assertEqual(listing["status"], "进行中")
 
+        # 列表键集分页：游标晚于开始时间时应包含该比赛
+        resp = self._as(None).get(self._url("list"), {"before": timezone.now().isoformat()})
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertIn(slug, [item["slug"] for item in resp.data["data"]["items"]])
+
         # 详情包含公告与挑战列表字段
-        user_client = self._auth_client("alice", "Passw0rd123")
-        resp = user_client.get(f"/api/contests/{slug}/")
+        resp = self._as(self.user1).get(self._url("detail", contest_slug=slug))
         self.assertEqual(resp.status_code, 200, resp.content)
         self.assertIn("announcements", resp.data["data"])
         self.assertEqual(resp.data["data"]["contest"]["status"], "进行中")
 
+    def test_contest_category_management(self):
+        """验证比赛题目分类在创建及后续更新中可配置"""
+        slug = self._create_contest(self._as(self.admin), "category-contest", categories=["Web", "Pwn"])
+
+        # 后续断言只关心视图逻辑，直接调用视图，跳过路由解析与中间件
+        detail_resp = self._call_view(
+            ContestDetailView, "get", self._url("detail", contest_slug=slug), user=self.user1, contest_slug=slug
+        )
+        self.assertEqual(detail_resp.status_code, 200)
+        contest_payload = detail_resp.data["data"]["contest"]
+        self.assertIn("categories", contest_payload)
+        self.assertEqual(sorted(cat["name"] for cat in contest_payload["categories"]), ["Pwn", "Web"])
+
+        categories_url = self._url("categories", contest_slug=slug)
+        update_resp = self._call_view(
+            ChallengeCategoryView,
+            "put",
+            categories_url,
+            user=self.admin,
+            data={"categories": ["Web", "Crypto"]},
+            contest_slug=slug,
+        )
+        self.assertEqual(update_resp.status_code, 200, update_resp.data)
+        self.assertEqual(len(update_resp.data["data"]["items"]), 2)
+
+        list_resp = self._call_view(ChallengeCategoryView, "get", categories_url, contest_slug=slug)
+        self.assertEqual(list_resp.status_code, 200)
+        self.assertEqual(sorted(cat["name"] for cat in list_resp.data["data"]["items"]), ["Crypto", "Web"])
+
     def test_team_lifecycle(self):
         """验证队伍创建、加入、队长移交、邀请码重置与解散全链路"""
-        admin_client = self._auth_client("admin_test_user", "StrongPass123!")
-        slug = self._create_contest(admin_client, "team-contest")
-
-        c1 = self._auth_client("alice", "Passw0rd123")
-        c2 = self._auth_client("bob", "Passw0rd123")
+        slug = self.shared_contest.slug
 
         # 先报名参赛
-        c1.post(f"/api/contests/{slug}/register/")
-        c2.post(f"/api/contests/{slug}/register/")
+        self._as(self.user1).post(self._url("register", contest_slug=slug))
+        self._as(self.user2).post(self._url("register", contest_slug=slug))
 
         # 创建队伍
-        resp = c1.post(
-            f"/api/contests/{slug}/teams/",
+        resp = self._as(self.user1).post(
+            self._url("teams", contest_slug=slug),
             {"name": "Alpha", "description": "desc"},
             format="json",
         )
@@ -245,36 +610,36 @@ class ContestsAPITestCase(AuthenticatedAPIMixin, APITestCase):
         invite_token = resp.data["data"]["team"]["invite_token"]
 
         # 队伍列表
-        resp = c1.get(f"/api/contests/{slug}/teams/")
+        resp = self._as(self.user1).get(self._url("teams", contest_slug=slug))
         self.assertEqual(resp.status_code, 200, resp.content)
 
         # 加入队伍
-        resp = c2.post(
-            f"/api/contests/{slug}/teams/join/",
+        resp = self._as(self.user2).post(
+            self._url("team-join", contest_slug=slug),
             {"invite_token": invite_token},
             format="json",
         )
         self.assertEqual(resp.status_code, 200, resp.content)
 
         # 队长移交
-        resp = c1.get(f"/api/contests/{slug}/teams/")
+        resp = self._as(self.user1).get(self._url("teams", contest_slug=slug))
         team_id = resp.data["data"]["items"][0]["id"]
-        resp = admin_client.post(
-            f"/api/contests/teams/{team_id}/transfer/",
+        resp = self._as(self.admin).post(
+            self._url("team-transfer", team_id=team_id),
             {"new_captain_id": self.user2.id},
             format="json",
         )
         self.assertIn(resp.status_code, [200, 400], getattr(resp, "data", resp.content))
 
         # 重置邀请码（管理员可操作，避免权限限制）
-        resp = admin_client.post(f"/api/contests/teams/{team_id}/invite/reset/", {}, format="json")
+        resp = self._as(self.admin).post(self._url("team-invite-reset", team_id=team_id), {}, format="json")
         self.assertEqual(resp.status_code, 200)
 
         # 解散队伍
-        resp = admin_client.post(f"/api/contests/teams/{team_id}/disband/", {}, format="json")
+        resp = self._as(self.admin).post(self._url("team-disband", team_id=team_id), {}, format="json")
         self.assertEqual(resp.status_code, 200)
         # 解散后列表应为空
-        resp = c1.get(f"/api/contests/{slug}/teams/")
+        resp = self._as(self.user1).get(self._url("teams", contest_slug=slug))
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(len(resp.data["data"]["items"]), 0)
 
@@ -287,53 +652,142 @@ class ContestsAPITestCase(AuthenticatedAPIMixin, APITestCase):
             start_time=ended_start,
             end_time=ended_start + timedelta(hours=1),
         )
-        client = self._auth_client("alice", "Passw0rd123")
-        resp = client.post(f"/api/contests/{ended.slug}/register/")
+        resp = self._as(self.user1).post(self._url("register", contest_slug=ended.slug))
         self.assertEqual(resp.status_code, 409)
         self.assertNotEqual(resp.data.get("code"), 0)
 
-    def test_contest_category_management(self):
-        """验证比赛题目分类在创建及后续更新中可配置"""
-        admin_client = self._auth_client("admin_test_user", "StrongPass123!")
-        slug = self._create_contest(admin_client, "category-contest", categories=["Web", "Pwn"])
-
-        user_client = self._auth_client("alice", "Passw0rd123")
-        detail_resp = user_client.get(f"/api/contests/{slug}/")
-        self.assertEqual(detail_resp.status_code, 200)
-        contest_payload = detail_resp.data["data"]["contest"]
-        self.assertIn("categories", contest_payload)
-        self.assertEqual(sorted(cat["name"] for cat in contest_payload["categories"]), ["Pwn", "Web"])
-
-        update_resp = admin_client.put(
-            f"/api/contests/{slug}/categories/",
-            {"categories": ["Web", "Crypto"]},
-            format="json",
-        )
-        self.assertEqual(update_resp.status_code, 200, update_resp.content)
-        self.assertEqual(len(update_resp.data["data"]["items"]), 2)
-
-        list_resp = self.client.get(f"/api/contests/{slug}/categories/")
-        self.assertEqual(list_resp.status_code, 200)
-        self.assertEqual(sorted(cat["name"] for cat in list_resp.data["data"]["items"]), ["Crypto", "Web"])
-
     def test_contest_update_permission_enforced(self):
         """比赛更新接口需管理员/管理权限，普通用户应被拒绝"""
-        admin_client = self._auth_client("admin_test_user", "StrongPass123!")
-        slug = self._create_contest(admin_client, "perm-contest")
-        user_client = self._auth_client("alice", "Passw0rd123")
+        slug = self.shared_contest.slug
+        detail_url = self._url("detail", contest_slug=slug)
 
         # 普通用户尝试更新，预期 403
-        resp_user = user_client.patch(
-            f"/api/contests/{slug}/",
-            {"name": "nope"},
-            format="json",
+        resp_user = self._call_view(
+            ContestDetailView, "patch", detail_url, user=self.user1, data={"name": "nope"}, contest_slug=slug
         )
         self.assertEqual(resp_user.status_code, 403)
 
         # 管理员更新应成功
-        resp_admin = admin_client.patch(
-            f"/api/contests/{slug}/",
-            {"name": "updated-name"},
+        resp_admin = self._call_view(
+            ContestDetailView, "patch", detail_url, user=self.admin, data={"name": "updated-name"}, contest_slug=slug
+        )
+        self.assertEqual(resp_admin.status_code, 200, resp_admin.data)
+
+    def test_contest_create_and_update_with_jwt(self):
+        """真实令牌端到端：管理员登录后建赛并更新，匿名更新被拒绝"""
+        slug = self._create_contest(self._jwt(self.admin), "jwt-open")
+        detail_url = self._url("detail", contest_slug=slug)
+
+        resp = self._jwt(None).patch(detail_url, {"name": "anonymous"}, format="json")
+        self.assertIn(resp.status_code, [401, 403])
+
+        resp = self._jwt(self.admin).patch(detail_url, {"name": "jwt-renamed"}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(resp.data["data"]["contest"]["name"], "jwt-renamed")
+
+    def test_register_with_jwt(self):
+        """真实令牌端到端：选手登录后报名，无令牌报名被权限校验拒绝（403）"""
+        register_url = self._url("register", contest_slug=self.shared_contest.slug)
+
+        # 未登录由业务权限校验拒绝，返回 403 而非 401（见 common.permissions._ensure_authenticated）
+        resp = self._jwt(None).post(register_url)
+        self.assertEqual(resp.status_code, 403)
+
+        resp = self._jwt(self.user1).post(register_url)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertTrue(
+            ContestParticipant.objects.filter(contest=self.shared_contest, user=self.user1).exists()
+        )
+
+    def test_team_create_and_mine_with_jwt(self):
+        """真实令牌端到端：报名后建队，“我的队伍”按令牌身份返回该队"""
+        slug = self.shared_contest.slug
+        self._jwt(self.user1).post(self._url("register", contest_slug=slug))
+
+        resp = self._jwt(self.user1).post(
+            self._url("teams", contest_slug=slug), {"name": "JWT Team", "description": "desc"}, format="json"
+        )
+        self.assertEqual(resp.status_code, 201, resp.content)
+        team_id = resp.data["data"]["team"]["id"]
+
+        resp = self._jwt(self.user1).get(self._url("teams-mine"))
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual([item["id"] for item in resp.data["data"]["items"]], [team_id])
+
+        resp = self._jwt(self.user2).get(self._url("teams-mine"))
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(resp.data["data"]["items"], [])
+
+    def test_announcement_create_and_detail_with_jwt(self):
+        """真实令牌端到端：管理员发布公告，选手凭令牌查看详情，匿名查看详情被拒绝（403）"""
+        slug = self.shared_contest.slug
+        resp = self._jwt(self.admin).post(
+            self._url("announcements", contest_slug=slug),
+            {"title": "JWT", "summary": "摘要", "content": "正文"},
             format="json",
         )
-        self.assertEqual(resp_admin.status_code, 200, resp_admin.content)
+        self.assertEqual(resp.status_code, 201, resp.content)
+        detail_url = self._url(
+            "announcement-detail", contest_slug=slug, announcement_id=resp.data["data"]["announcement"]["id"]
+        )
+
+        resp = self._jwt(None).get(detail_url)
+        self.assertEqual(resp.status_code, 403)
+
+        resp = self._jwt(self.user1).get(detail_url)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(resp.data["data"]["announcement"]["content"], "正文")
+
+    def test_submission_list_with_jwt(self):
+        """真实令牌端到端：提交记录按令牌身份过滤，无令牌被权限校验拒绝（403）"""
+        submissions_url = self._url("submissions", contest_slug=self.shared_contest.slug)
+
+        resp = self._jwt(None).get(submissions_url)
+        self.assertEqual(resp.status_code, 403)
+
+        resp = self._jwt(self.user1).get(submissions_url)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(resp.data["data"]["items"], [])
+
+    def _walk_keyset(self, url: str, page_size: int, **params) -> list[int]:
+        """从当前时间起按 before 游标逐页翻到底，返回依次拿到的记录 id"""
+        ids: list[int] = []
+        cursor = (timezone.now() + timedelta(minutes=1)).isoformat()
+        for _ in range(20):
+            resp = self.client.get(url, {**params, "before": cursor, "page_size": page_size})
+            self.assertEqual(resp.status_code, 200, resp.content)
+            ids.extend(item["id"] for item in resp.data["data"]["items"])
+            cursor = resp.data["extra"]["next_cursor"]
+            if not resp.data["extra"]["has_next"]:
+                break
+        return ids
+
+    def test_announcement_keyset_page_boundary_inside_tie(self):
+        """多条公告创建时间相同且翻页边界落在并列值内部时，逐页翻完应不丢不重"""
+        created_at = timezone.now() - timedelta(minutes=5)
+        anns = ContestAnnouncement.objects.bulk_create(
+            [
+                ContestAnnouncement(contest=self.shared_contest, title=f"t{i}", summary="s", content="c")
+                for i in range(3)
+            ]
+        )
+        ContestAnnouncement.objects.filter(pk__in=[a.pk for a in anns]).update(created_at=created_at)
+        self._as(None)
+        ids = self._walk_keyset(self._url("announcements", contest_slug=self.shared_contest.slug), 2)
+        self.assertEqual(ids, sorted((a.pk for a in anns), reverse=True))
+
+    def test_contest_list_keyset_page_boundary_inside_tie(self):
+        """多场比赛开始时间相同且翻页边界落在并列值内部时，逐页翻完应不丢不重且按 id 倒序"""
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+        contests = Contest.objects.bulk_create(
+            [
+                Contest(name=f"tie {i}", slug=f"tie-{i}", start_time=start, end_time=start + timedelta(days=1))
+                for i in range(3)
+            ]
+        )
+        self._as(None)
+        ids = self._walk_keyset(self._url("list"), 2)
+        tied = {c.pk for c in contests}
+        self.assertEqual([pk for pk in ids if pk in tied], sorted(tied, reverse=True))
+        self.assertEqual(len(ids), len(set(ids)))
+
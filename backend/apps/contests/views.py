@@ -20,8 +20,8 @@ from apps.common.permissions import (
 from apps.challenges.repo import ChallengeRepo
 from apps.challenges.serializers import serialize_challenge, serialize_category
 from apps.submissions.services import SubmissionService, serialize_submission
-from apps.common.pagination import StandardPagination
-from django.db.models import Count, Q
+from apps.common.pagination import StandardPagination, KeysetPagination
+from apps.common.utils.request_context import get_user_gate
 from apps.submissions.repo import SubmissionRepo
 from apps.submissions.schemas import SubmissionCreateSchema
 from apps.common.schema_utils import (
@@ -34,9 +34,11 @@ from apps.common.schema_utils import (
     announcement_serializer,
     category_serializer,
     pagination_parameters,
+    cursor_parameter,
     scoreboard_entry_serializer,
 )
-from .repo import ContestRepo, TeamRepo, TeamMemberRepo, ContestAnnouncementRepo
+from .models import contest_status_case
+from .repo import ContestRepo, TeamRepo, ContestAnnouncementRepo
 from .services import (
     ContestContextService,
     ContestRegisterService,
@@ -46,8 +48,8 @@ from .services import (
     TeamTransferService,
     ContestCategoryUpdateService,
     serialize_announcement,
+    serialize_announcement_row,
     ContestUpdateService,
-    determine_contest_status,
 )
 from .schemas import (
     ContestCreateSchema,
@@ -78,6 +80,12 @@ _optional_team_serializer = team_serializer()
 _optional_team_serializer.required = False
 _optional_team_serializer.allow_null = True
 
+# 无状态的服务与仓储在模块级共享，各视图类引用同一实例，避免每个类各自构造一份
+_context_service = ContestContextService()
+_contest_repo = _context_service.contest_repo
+_submission_service = SubmissionService(contest_service=_context_service)
+_announcement_repo = ContestAnnouncementRepo()
+
 
 # 视图层：暴露比赛、公告、队伍接口，仅做参数转换与调用服务层，不承载业务
 
@@ -86,7 +94,7 @@ class ContestListView(APIView):
     """比赛列表/创建接口：GET 公共访问，POST 仅管理员"""
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
-    context_service = ContestContextService()
+    context_service = _context_service
 
     @extend_schema(
         summary="比赛列表",
@@ -102,15 +110,23 @@ class ContestListView(APIView):
                 type=str,
                 enum=["running", "upcoming", "ended"],
             ),
+            cursor_parameter(),
             *pagination_parameters(),
         ],
     )
     def get(self, request: Request) -> Response:
         # 公开接口：任何访客都可查看比赛列表，用于前台首页
         # 按状态过滤比赛（进行中/未开始/已结束）
-        repo = ContestRepo()
+        repo = _contest_repo
         status_filter = request.query_params.get("status")
-        queryset = repo.get_queryset().order_by("-start_time")
+        # 仅读取摘要列，serialize_contest 不会触发延迟字段的补充查询
+        # 开始时间相同（整点开赛很常见）时按 id 决定先后，页码与游标翻页顺序一致且稳定
+        queryset = (
+            repo.get_queryset()
+            .only(*ContestRepo.SUMMARY_FIELDS)
+            .with_status()
+            .order_by("-start_time", "-id")
+        )
         if status_filter:
             now = timezone.now()
             if status_filter == "running":
@@ -119,33 +135,23 @@ class ContestListView(APIView):
                 queryset = queryset.filter(start_time__gt=now)
             elif status_filter == "ended":
                 queryset = queryset.filter(end_time__lt=now)
-        paginator = StandardPagination()
-        page = paginator.paginate_queryset(queryset, request)
-        data = [serialize_contest(c) for c in page]
-        # 附加当前用户的报名/队伍标记
-        if request.user.is_authenticated:
-            participants = {
-                p.contest_id: p
-                for p in self.context_service.participant_repo.filter(contest__in=page, user=request.user)
-            }
-            memberships = {
-                m.team.contest_id: m
-                for m in self.context_service.member_repo.filter(team__contest__in=page, user=request.user, is_active=True)
-            }
-            slug_map = {c.slug: c for c in page}
-            for item in data:
-                contest_obj = slug_map.get(item.get("slug"))
-                if not contest_obj:
-                    continue
-                cid = getattr(contest_obj, "id", None)
-                participant = participants.get(cid)
-                membership = memberships.get(cid)
-                user_fields = self.context_service.build_user_contest_fields(
-                    contest_obj,
-                    participant=participant,
-                    membership=membership,
-                )
-                item.update(user_fields)
+        keyset = KeysetPagination(cursor_field="start_time")
+        before = keyset.get_cursor(request)
+        if before is not None:
+            # 传入 before 游标时按 (开始时间, id) 键集翻页，避免深翻页的 OFFSET 扫描
+            rows = list(keyset.filter_queryset(queryset, before)[: keyset.get_fetch_limit(request)])
+            paginator = keyset
+            page = keyset.paginate_rows(rows)
+        else:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(queryset, request)
+        # 附加当前用户的报名/队伍标记：整页批量查询，按比赛 id 合并；空页（越界翻页等）直接跳过
+        user_fields: dict[int, dict] = {}
+        if page:
+            gate = get_user_gate(request.user)
+            if gate.is_auth:
+                user_fields = self.context_service.bulk_user_contest_fields(list(page), gate)
+        data = [serialize_contest(c, extra=user_fields.get(c.id)) for c in page]
         return paginator.get_paginated_response({"items": data})
 
     @extend_schema(
@@ -159,9 +165,9 @@ class ContestListView(APIView):
         ensure_biz_permission(request.user, "contests.manage_contest")
         schema = ContestCreateSchema.from_dict(request.data, auto_validate=True)
         contest = CreateContestService().execute(schema)
-        categories = self.context_service.list_categories(contest)
+        categories = self.context_service.list_category_payload(contest)
         return response.created(
-            {"contest": serialize_contest(contest, categories=categories)},
+            {"contest": serialize_contest(contest, category_payload=categories)},
             message="比赛已创建",
         )
 
@@ -171,7 +177,7 @@ class ContestRegisterView(APIView):
 
     permission_classes = [IsAuthenticated, BizPermission]
     biz_permission = "contests.view_contest"
-    context_service = ContestContextService()
+    context_service = _context_service
     register_service = ContestRegisterService()
 
     @extend_schema(
@@ -188,10 +194,10 @@ class ContestRegisterView(APIView):
         """报名后生成/更新参赛记录，未开赛为已报名，开赛后为进行中"""
         contest = self.context_service.get_contest(contest_slug)
         participant = self.register_service.execute(request.user, contest_slug)
-        categories = self.context_service.list_categories(contest)
+        categories = self.context_service.list_category_payload(contest)
         return response.success(
             {
-                "contest": serialize_contest(contest, categories=categories),
+                "contest": serialize_contest(contest, category_payload=categories),
                 "status": participant.status,
             },
             message="报名成功",
@@ -202,11 +208,10 @@ class ContestDetailView(APIView):
     """比赛详情接口：返回比赛、挑战、公告、记分板及我的队伍"""
     permission_classes = [AllowAny]
     biz_permission = "contests.view_contest"
-    context_service = ContestContextService()
+    context_service = _context_service
     challenge_repo = ChallengeRepo()
-    member_repo = TeamMemberRepo()
     scoreboard_service = ScoreboardService()
-    submit_service = SubmissionService()
+    submit_service = _submission_service
     update_service = ContestUpdateService()
 
     @extend_schema(
@@ -230,19 +235,16 @@ class ContestDetailView(APIView):
         # 获取比赛对象，填充基础信息
         # 获取比赛与基础信息
         contest = self.context_service.get_contest(contest_slug)
-        self.context_service.ensure_contest_visible(contest, request.user if request.user.is_authenticated else None)
-        categories = self.context_service.list_categories(contest)
-        participant = None
-        membership = None
-        if request.user.is_authenticated:
-            participant = self.context_service.mark_participation(contest, request.user, allow_create=False)
-            membership = self.member_repo.get_membership(contest=contest, user=request.user)
+        self.context_service.ensure_contest_visible(contest, request.user)
+        categories = self.context_service.list_category_payload(contest)
+        # 报名记录与队伍关系一次取出，并顺带推进已有报名的参与状态
+        participant, membership = self.context_service.get_user_context(contest, request.user)
         data = {
-            "contest": serialize_contest(contest, categories=categories),
+            "contest": serialize_contest(contest, category_payload=categories),
         }
         # 若已登录，附上用户所在队伍信息
         if membership and getattr(membership, "team", None):
-            data["my_team"] = serialize_team(membership.team)
+            data["my_team"] = serialize_team(membership.team, fetch_members=True)
 
         # 读取比赛下的有效题目列表
         challenges = self.challenge_repo.list_active_with_related(contest=contest)
@@ -253,51 +255,41 @@ class ContestDetailView(APIView):
                 membership=membership,
             )
             data["contest"].update(user_fields)
+        # 当前用户在各题目下可见的分值（考虑动态降分/提示扣分）整页批量计算，避免逐题查询
+        challenges = list(challenges)
+        points_map = self.submit_service.visible_points_for_user_bulk(
+            request.user if request.user.is_authenticated else None,
+            contest,
+            challenges,
+            membership=membership,
+        )
         data["challenges"] = [
-            serialize_challenge(
-                ch,
-                # 查询当前用户在该题目下可见的分值（考虑动态降分/封榜）
-                current_points=self.submit_service.visible_points_for_user(
-                    request.user if request.user.is_authenticated else None,
-                    contest,
-                    ch,
-                    membership=membership,
-                ),
-                request=request,
-            )
+            serialize_challenge(ch, current_points=points_map.get(ch.id), request=request)
             for ch in challenges
         ]
         # 公告：仅返回有效公告
-        announcements = self.context_service.list_announcements(contest)
-        data["announcements"] = [serialize_announcement(ann) for ann in announcements]
+        announcements = self.context_service.list_announcement_values(contest)
+        data["announcements"] = [serialize_announcement_row(row, contest.slug) for row in announcements]
         # 计算记分板
-        raw_scoreboard = self.scoreboard_service.execute(contest)
-        scoreboard_payload: list[dict] = []
+        # 记分板每次都是新解码/新构建的列表，直接原地补充展示字段，不再逐行拷贝字典
+        # 按赛制确定当前用户的匹配键，补充字段的同一遍遍历中定位“我的排名”行
+        if contest.is_team_based:
+            my_key, my_id = "team_id", membership.team_id if membership else None
+        else:
+            my_key, my_id = "user_id", request.user.id if request.user.is_authenticated else None
+        scoreboard = self.scoreboard_service.execute(contest)
         my_row = None
-        current_team_id = getattr(membership, "team_id", None) if membership else None
-        current_user_id = getattr(request.user, "id", None) if request.user.is_authenticated else None
-        for entry in raw_scoreboard:
+        for entry in scoreboard:
             team_info = entry.get("team") or {}
             user_info = entry.get("user") or {}
-            team_id = team_info.get("id")
-            user_id = user_info.get("id")
-            name = team_info.get("name") or user_info.get("username") or ""
-            is_me = False
-            if contest.is_team_based and current_team_id and team_id == current_team_id:
-                is_me = True
-            if not contest.is_team_based and current_user_id and user_id == current_user_id:
-                is_me = True
-            payload = {
-                **entry,
-                "team_id": team_id,
-                "user_id": user_id,
-                "name": name,
-                "is_me": is_me,
-            }
-            scoreboard_payload.append(payload)
-            if is_me and my_row is None:
-                my_row = payload
-        data["scoreboard"] = scoreboard_payload
+            entry["team_id"] = team_info.get("id")
+            entry["user_id"] = user_info.get("id")
+            entry["name"] = team_info.get("name") or user_info.get("username") or ""
+            is_me = my_id is not None and my_row is None and entry[my_key] == my_id
+            entry["is_me"] = is_me
+            if is_me:
+                my_row = entry
+        data["scoreboard"] = scoreboard
         data["my_scoreboard"] = my_row
         return response.success(data)
 
@@ -312,13 +304,15 @@ class ContestDetailView(APIView):
     def patch(self, request: Request, contest_slug: str) -> Response:
         """管理员更新比赛基础信息：时间窗口、可见性等"""
         ensure_biz_permission(request.user, "contests.manage_contest")
-        payload = dict(request.data or {})
-        payload["contest_slug"] = contest_slug
-        schema = ContestUpdateSchema.from_dict(payload, auto_validate=True)
+        schema = ContestUpdateSchema.from_dict(
+            request.data or {},
+            overrides={"contest_slug": contest_slug},
+            auto_validate=True,
+        )
         contest = self.update_service.execute(schema)
-        categories = self.context_service.list_categories(contest)
+        categories = self.context_service.list_category_payload(contest)
         return response.success(
-            {"contest": serialize_contest(contest, categories=categories)},
+            {"contest": serialize_contest(contest, category_payload=categories)},
             message="比赛信息已更新",
         )
 
@@ -356,10 +350,10 @@ class ContestSubmissionView(APIView):
         "get": "submissions.view_submission",
     }
     pagination_class = StandardPagination
-    context_service = ContestContextService()
-    service = SubmissionService()
+    context_service = _context_service
+    service = _submission_service
     repo = SubmissionRepo()
-    member_repo = TeamMemberRepo()
+    member_repo = _context_service.member_repo
 
     @extend_schema(
         responses=api_response_schema(
@@ -384,11 +378,13 @@ class ContestSubmissionView(APIView):
     )
     def post(self, request: Request, contest_slug: str) -> Response:
         """比赛作用域内提交 Flag"""
-        payload = dict(request.data)
-        payload["contest_slug"] = contest_slug
         contest = self.context_service.get_contest(contest_slug)
         self.context_service.ensure_contest_visible(contest, request.user)
-        schema = SubmissionCreateSchema.from_dict(payload, auto_validate=True)
+        schema = SubmissionCreateSchema.from_dict(
+            request.data,
+            overrides={"contest_slug": contest_slug},
+            auto_validate=True,
+        )
         submission = self.service.execute(request.user, schema)
         base_points = max(0, submission.awarded_points - getattr(submission, "bonus_points", 0))
         challenge_payload = serialize_challenge(submission.challenge, current_points=base_points, request=request)
@@ -421,6 +417,7 @@ class ContestSubmissionView(APIView):
                 type=str,
                 enum=["personal", "team"],
             ),
+            cursor_parameter(),
             *pagination_parameters(),
         ],
     )
@@ -430,17 +427,27 @@ class ContestSubmissionView(APIView):
         - scope=personal（默认）：仅本人提交
         - scope=team（组队赛）：查看所在队伍的提交
         """
-        contest = ContestRepo().get_by_slug(contest_slug)
+        contest = _contest_repo.get_by_slug(contest_slug)
         self.context_service.ensure_contest_visible(contest, request.user)
         scope = request.query_params.get("scope", "personal")
-        membership = self.member_repo.get_membership(contest=contest, user=request.user)
         queryset = self.repo.filter(contest=contest).select_related("challenge", "user", "team")
-        if contest.is_team_based and scope == "team" and membership and getattr(membership, "team_id", None):
-            queryset = queryset.filter(team_id=membership.team_id)  # type: ignore[attr-defined]
+        # 队伍关系只在组队赛 team 范围下才用得到，默认个人范围不再查询
+        membership = None
+        if contest.is_team_based and scope == "team":
+            membership = self.member_repo.get_membership(contest=contest, user=request.user)
+        if membership and membership.team_id:
+            queryset = queryset.filter(team_id=membership.team_id)
         else:
             queryset = queryset.filter(user=request.user)
-        queryset = queryset.order_by("-created_at")
-        paginator = StandardPagination()
+        queryset = queryset.order_by("-created_at", "-id")
+        keyset = KeysetPagination()
+        before = keyset.get_cursor(request)
+        if before is not None:
+            # 传入 before 游标时走键集分页，命中 (contest, user/team, created_at) 索引
+            rows = list(keyset.filter_queryset(queryset, before)[: keyset.get_fetch_limit(request)])
+            items = [serialize_submission(sub) for sub in keyset.paginate_rows(rows)]
+            return keyset.get_paginated_response({"items": items})
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(queryset, request)
         items = [serialize_submission(sub) for sub in page]
         return paginator.get_paginated_response({"items": items})
@@ -454,7 +461,7 @@ class ContestTeamsView(APIView):
         "post": "teams.manage_team",
     }
     pagination_class = StandardPagination
-    context_service = ContestContextService()
+    context_service = _context_service
     team_repo = TeamRepo()
 
     @extend_schema(
@@ -474,12 +481,11 @@ class ContestTeamsView(APIView):
         # 登录用户查看当前比赛所有有效队伍，便于选择加入
         # 查询比赛并返回所有有效队伍
         contest = self.context_service.get_contest(contest_slug)
-        teams = (
-            self.team_repo.filter_with_related(contest=contest, is_active=True)
-            .annotate(active_member_count=Count("members", filter=Q(members__is_active=True)))
-            .order_by("name", "id")
+        # 人数直接取预取的有效成员列表长度，列表查询不再联表成员做 GROUP BY 计数
+        teams = self.team_repo.prefetch_active_members(
+            self.team_repo.filter_with_related(contest=contest, is_active=True).order_by("name", "id")
         )
-        paginator = StandardPagination()
+        paginator = self.pagination_class()
         page_items = paginator.paginate_queryset(teams, request)
         data = [serialize_team(team) for team in page_items]
         return paginator.get_paginated_response({"contest": contest.slug, "items": data})
@@ -500,11 +506,9 @@ class ContestTeamsView(APIView):
         # contest_slug 路径参数：锁定队伍所属比赛
         # 登录用户创建队伍：补充比赛标识后走服务层校验人数/权限
         # 补充比赛标识后交由服务层创建队伍
-        payload = dict(request.data)
-        payload["contest_slug"] = contest_slug
-        schema = TeamCreateSchema.from_dict(payload, auto_validate=True)
+        schema = TeamCreateSchema.from_dict(request.data, overrides={"contest_slug": contest_slug}, auto_validate=True)
         team = TeamCreateService().execute(request.user, schema)
-        return response.created({"team": serialize_team(team)}, message="队伍已创建")
+        return response.created({"team": serialize_team(team, fetch_members=True)}, message="队伍已创建")
 
 
 class ContestTeamJoinView(APIView):
@@ -527,12 +531,10 @@ class ContestTeamJoinView(APIView):
         # contest_slug 路径参数：确认邀请码所属比赛
         # 仅允许登录选手通过邀请码加入对应比赛队伍
         # 补充比赛标识后交由服务层处理
-        payload = dict(request.data)
-        payload["contest_slug"] = contest_slug
-        schema = TeamJoinSchema.from_dict(payload, auto_validate=True)
+        schema = TeamJoinSchema.from_dict(request.data, overrides={"contest_slug": contest_slug}, auto_validate=True)
         membership = TeamJoinService().execute(request.user, schema)
         return response.success(
-            {"team": serialize_team(membership.team)},
+            {"team": serialize_team(membership.team, fetch_members=True)},
             message="已加入队伍",
         )
 
@@ -572,7 +574,7 @@ class TeamDisbandView(APIView):
         # 由队长/管理员触发解散，服务层将成员标记失效
         schema = TeamDisbandSchema.from_dict({"team_id": team_id}, auto_validate=True)
         team = TeamDisbandService().execute(request.user, schema)
-        return response.success({"team": serialize_team(team)}, message="队伍已解散")
+        return response.success({"team": serialize_team(team, fetch_members=True)}, message="队伍已解散")
 
 
 class TeamInviteResetView(APIView):
@@ -595,7 +597,7 @@ class TeamInviteResetView(APIView):
         # 触发重置：生成新邀请码并更新更新时间
         schema = TeamInviteResetSchema.from_dict({"team_id": team_id}, auto_validate=True)
         team = TeamInviteResetService().execute(request.user, schema)
-        return response.success({"team": serialize_team(team)}, message="邀请码已重置")
+        return response.success({"team": serialize_team(team, fetch_members=True)}, message="邀请码已重置")
 
 
 class TeamTransferView(APIView):
@@ -622,11 +624,9 @@ class TeamTransferView(APIView):
         # team_id 路径参数：队长移交的目标队伍
         # 将新队长用户 ID 传入服务层，完成角色切换
         # 补充队伍 ID 后交由服务层移交
-        payload = dict(request.data)
-        payload["team_id"] = team_id
-        schema = TeamTransferSchema.from_dict(payload, auto_validate=True)
+        schema = TeamTransferSchema.from_dict(request.data, overrides={"team_id": team_id}, auto_validate=True)
         team = TeamTransferService().execute(request.user, schema)
-        return response.success({"team": serialize_team(team)}, message="队长已移交")
+        return response.success({"team": serialize_team(team, fetch_members=True)}, message="队长已移交")
 
 
 class ChallengeCategoryView(APIView):
@@ -637,7 +637,7 @@ class ChallengeCategoryView(APIView):
     """
 
     permission_classes = [AllowAny]
-    context_service = ContestContextService()
+    context_service = _context_service
     service = ContestCategoryUpdateService()
 
     @extend_schema(
@@ -647,9 +647,9 @@ class ChallengeCategoryView(APIView):
     )
     def get(self, request: Request, contest_slug: str) -> Response:
         _ = request
-        contest = self.context_service.get_contest(contest_slug)
-        categories = self.context_service.list_categories(contest)
-        return response.success({"items": [serialize_category(cat) for cat in categories]})
+        contest = self.context_service.get_contest_light(contest_slug)
+        categories = self.context_service.list_category_payload(contest)
+        return response.success({"items": categories})
 
     @extend_schema(
         summary="更新比赛题目分类",
@@ -667,9 +667,11 @@ class ChallengeCategoryView(APIView):
     )
     def patch(self, request: Request, contest_slug: str) -> Response:
         ensure_biz_permission(request.user, "contests.manage_contest")
-        payload = dict(request.data or {})
-        payload["contest_slug"] = contest_slug
-        schema = ContestCategoryUpdateSchema.from_dict(payload, auto_validate=True)
+        schema = ContestCategoryUpdateSchema.from_dict(
+            request.data or {},
+            overrides={"contest_slug": contest_slug},
+            auto_validate=True,
+        )
         categories = self.service.execute(schema)
         return response.success(
             {"items": [serialize_category(cat) for cat in categories]},
@@ -695,7 +697,7 @@ class MyTeamsView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
-    context_service = ContestContextService()
+    context_service = _context_service
 
     @extend_schema(
         summary="我的战队列表",
@@ -737,23 +739,33 @@ class MyTeamsView(APIView):
         memberships = (
             member_repo.filter(user=user)
             .select_related("team", "team__contest")
+            # 比赛状态由数据库统一计算，循环内不再逐行比较时间
+            .annotate(contest_status=contest_status_case("team__contest__"))
             .order_by("-joined_at")
         )
 
         items = []
+        # 同一比赛下的多支队伍（历史退队/换队）只序列化一次比赛
+        contest_cache: dict[int, dict] = {}
         for m in memberships:
-            team = getattr(m, "team", None)
-            contest = getattr(team, "contest", None) if team else None
+            team = m.team
+            contest = team.contest if team else None
+            contest_data = None
+            if contest is not None:
+                contest_data = contest_cache.get(contest.id)
+                if contest_data is None:
+                    contest.annotated_status = m.contest_status
+                    contest_data = contest_cache[contest.id] = serialize_contest(contest)
             items.append(
                 {
-                    "id": getattr(team, "id", None),
-                    "name": getattr(team, "name", None),
-                    "invite_token": getattr(team, "invite_token", None),
-                    "role": getattr(m, "role", None),
-                    "is_active": getattr(m, "is_active", None),
-                    "joined_at": getattr(m, "joined_at", None),
-                    "contest": serialize_contest(contest) if contest else None,
-                    "status": determine_contest_status(contest) if contest else None,
+                    "id": team.id if team else None,
+                    "name": team.name if team else None,
+                    "invite_token": team.invite_token if team else None,
+                    "role": m.role,
+                    "is_active": m.is_active,
+                    "joined_at": m.joined_at,
+                    "contest": contest_data,
+                    "status": contest_data["status"] if contest_data else None,
                 }
             )
         return response.success({"items": items})
@@ -768,26 +780,41 @@ class ContestAnnouncementView(APIView):
 
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
-    context_service = ContestContextService()
+    context_service = _context_service
     service = ContestAnnouncementService()
-    announcement_repo = ContestAnnouncementRepo()
+    announcement_repo = _announcement_repo
 
     @extend_schema(
         summary="比赛公告列表",
         operation_id="contests_announcements_list",
         request=None,
         responses=list_response("AnnouncementList", announcement_serializer(), paginated=True),
-        parameters=pagination_parameters(),
+        parameters=[
+            cursor_parameter(),
+            *pagination_parameters(),
+        ],
     )
     def get(self, request: Request, contest_slug: str) -> Response:
         # contest_slug 路径参数：限定公告所属比赛
         # 公开公告列表：按创建时间倒序返回已启用公告
         # 获取比赛并返回有效公告列表
-        contest = self.context_service.get_contest(contest_slug)
-        announcements = self.context_service.list_announcements(contest)
-        paginator = StandardPagination()
+        contest = self.context_service.get_contest_light(contest_slug)
+        keyset = KeysetPagination()
+        before = keyset.get_cursor(request)
+        if before is not None:
+            # 传入 before 游标时走键集分页，避免深翻页的 OFFSET 扫描
+            rows = self.context_service.list_announcement_values(
+                contest,
+                before=before,
+                before_id=keyset.cursor_id,
+                limit=keyset.get_fetch_limit(request),
+            )
+            items = [serialize_announcement_row(row, contest.slug) for row in keyset.paginate_rows(rows)]
+            return keyset.get_paginated_response({"items": items})
+        announcements = self.context_service.list_announcement_values(contest)
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(announcements, request)
-        items = [serialize_announcement(ann) for ann in page]
+        items = [serialize_announcement_row(row, contest.slug) for row in page]
         return paginator.get_paginated_response({"items": items})
 
     @extend_schema(
@@ -810,9 +837,11 @@ class ContestAnnouncementView(APIView):
         ensure_biz_permission(request.user, "contests.manage_announcement")
         # contest_slug 路径参数：指定公告关联的比赛
         # 将比赛标识加入 payload，使用 Schema 校验并调用服务落库
-        payload = dict(request.data)
-        payload["contest_slug"] = contest_slug
-        schema = AnnouncementCreateSchema.from_dict(payload, auto_validate=True)
+        schema = AnnouncementCreateSchema.from_dict(
+            request.data,
+            overrides={"contest_slug": contest_slug},
+            auto_validate=True,
+        )
         ann = self.service.execute(schema)
         return response.created({"announcement": serialize_announcement(ann)}, message="公告已发布")
 
@@ -824,8 +853,8 @@ class ContestAnnouncementDetailView(APIView):
 
     permission_classes = [IsAuthenticated, BizPermission]
     biz_permission = "contests.view_contest"
-    context_service = ContestContextService()
-    announcement_repo = ContestAnnouncementRepo()
+    context_service = _context_service
+    announcement_repo = _announcement_repo
 
     @extend_schema(
         summary="比赛公告详情",
@@ -840,6 +869,8 @@ class ContestAnnouncementDetailView(APIView):
         ann = self.announcement_repo.get_by_id(announcement_id)
         if ann.contest_id != contest.id:  # type: ignore[attr-defined]
             raise NotFoundError(message="公告不存在")
+        # 已取得所属比赛，直接挂到外键缓存，序列化时无需再查比赛
+        ann.contest = contest
         return response.success({"announcement": serialize_announcement(ann)})
 
 
@@ -850,7 +881,7 @@ class AnnouncementListGlobalView(APIView):
 
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
-    announcement_repo = ContestAnnouncementRepo()
+    announcement_repo = _announcement_repo
 
     @extend_schema(
         summary="全局公告列表",
@@ -873,7 +904,7 @@ class AnnouncementListGlobalView(APIView):
         queryset = self.announcement_repo.get_queryset().filter(is_active=True).select_related("contest").order_by("-created_at")
         if slug:
             queryset = queryset.filter(contest__slug=slug)
-        paginator = StandardPagination()
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(queryset, request)
         items = [serialize_announcement(ann) for ann in page]
         return paginator.get_paginated_response({"items": items})
@@ -448,8 +448,7 @@ class MachineStopService(BaseService[MachineInstance]):
         """检查用户是否属于指定队伍（活跃成员）"""
         if team_id is None:
             return False
-        membership = self.member_repo.filter(team_id=team_id, user=user, is_active=True).first()
-        return membership is not None
+        return self.member_repo.filter(team_id=team_id, user=user, is_active=True).exists()
 
     @staticmethod
     def _stop_container(container_id: str) -> None:
@@ -519,5 +518,4 @@ class MachineExtendService(BaseService[MachineInstance]):
     def _user_in_team(self, user: User, team_id: Optional[int]) -> bool:
         if team_id is None:
             return False
-        membership = self.member_repo.filter(team_id=team_id, user=user, is_active=True).first()
-        return membership is not None
+        return self.member_repo.filter(team_id=team_id, user=user, is_active=True).exists()
@@ -209,11 +209,11 @@ class MachinesAPITestCase(AuthenticatedAPIMixin, APITestCase):
         docker_manager._USE_MOCK = True
         cls.user = User.objects.create_user(username="alice", email="alice@example.com", password="Passw0rd123")
         cls.user.is_email_verified = True
-        cls.user.save()
+        cls.user.save(update_fields=["is_email_verified"])
         cls.admin = User.objects.create_superuser(username="admin_test_user", email="admin@example.com",
                                                   password="StrongPass123!")
         cls.admin.is_email_verified = True
-        cls.admin.save()
+        cls.admin.save(update_fields=["is_email_verified"])
         now = timezone.now()
         cls.contest = Contest.objects.create(
             name="API Machines",
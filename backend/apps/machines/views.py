@@ -50,7 +50,7 @@ class MachineListCreateView(APIView):
             .select_related("contest", "challenge", "team")
             .order_by("-created_at")
         )
-        paginator = StandardPagination()
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(queryset, request)
         data = [serialize_machine(m) for m in page]
         return paginator.get_paginated_response({"items": data})
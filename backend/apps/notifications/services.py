@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import Any
+from itertools import islice
+from typing import Any, Iterable, Iterator
 from datetime import datetime, date
 
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 from apps.common.base.base_service import BaseService
@@ -10,7 +12,7 @@ from apps.common.exceptions import NotFoundError
 from apps.accounts.models import User
 from apps.contests.models import Contest, Team
 from apps.challenges.models import Challenge
-from apps.common.ws_utils import broadcast_notify
+from apps.common.ws_utils import broadcast_notify, broadcast_team
 
 from .models import Notification
 from .repo import NotificationRepo
@@ -100,7 +102,6 @@ class NotificationCreateService(BaseService[Notification]):
     ) -> Notification:
         payload = _normalize_payload(payload or {})
         dedup_key = dedup_key or ""
-        existing = self.repo.get_by_dedup(user=user, dedup_key=dedup_key)
         data = {
             "type": type,
             "title": title,
@@ -111,18 +112,21 @@ class NotificationCreateService(BaseService[Notification]):
             "challenge": challenge,
             "expires_at": expires_at,
         }
-        if existing:
-            # 更新并重置已读，确保最新内容可见
-            data["read_at"] = None
-            self.repo.update(existing, {k: v for k, v in data.items() if k != "type" or v is not None})
-            return existing
-        data.update(
-            {
-                "user": user,
-                "dedup_key": dedup_key,
-            }
-        )
-        return self.repo.create(data)
+        create_data = {**data, "user": user, "dedup_key": dedup_key}
+        if not dedup_key:
+            return self.repo.create(create_data)
+        # 先直接插入，由 (user, dedup_key) 唯一约束判重，避免先查后写的额外查询与并发竞态
+        try:
+            with transaction.atomic():
+                return self.repo.create(create_data)
+        except IntegrityError:
+            existing = self.repo.get_by_dedup(user=user, dedup_key=dedup_key)
+            if existing is None:
+                raise
+        # 已存在同一去重键：更新并重置已读，确保最新内容可见
+        data["read_at"] = None
+        self.repo.update(existing, {k: v for k, v in data.items() if k != "type" or v is not None})
+        return existing
 
 
 class NotificationMarkReadService(BaseService[Notification]):
@@ -154,6 +158,114 @@ class NotificationMarkAllReadService(BaseService[int]):
         return self.repo.mark_all_read(user)
 
 
+# 批量扇出时单批写入/推送的用户数
+FANOUT_BATCH_SIZE = 1000
+
+
+def _chunked(values: Iterable[int], size: int) -> Iterator[list[int]]:
+    """将用户 id 序列按批切分，支持惰性迭代器"""
+    it = iter(values)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _bulk_fanout_by_ids(
+        user_ids: Iterable[int],
+        *,
+        type: str,
+        title: str,
+        body: str | None,
+        payload: dict | None,
+        contest: Contest | None,
+        team: Team | None,
+        challenge: Challenge | None,
+        dedup_key: str | None,
+        expires_at,
+        repo: NotificationRepo,
+        team_channel: bool = False,
+) -> int:
+    """
+    按用户 id 批量写入通知并推送：
+    - 已存在同一去重键的通知整批刷新内容并重置已读，其余整批插入（冲突忽略）
+    - 推送内容除 id/时间外对所有用户一致，只构造一次
+    - team_channel=True 且指定队伍时，每批仅向队伍组发布一次，各用户的通知 id 放入 recipients 由订阅端过滤
+    """
+    payload = _normalize_payload(payload or {})
+    body = body or ""
+    dedup_key = dedup_key or ""
+    push_base = {
+        "event": "notification",
+        "type": type,
+        "title": title,
+        "body": body,
+        "payload": payload,
+        "contest": getattr(contest, "slug", None),
+        "team_id": getattr(team, "id", None),
+        "team_slug": getattr(team, "slug", None),
+        "challenge": getattr(challenge, "slug", None),
+    }
+    total = 0
+    for batch in _chunked(user_ids, FANOUT_BATCH_SIZE):
+        objs = [
+            Notification(
+                user_id=uid,
+                type=type,
+                title=title,
+                body=body,
+                payload=payload,
+                contest=contest,
+                team=team,
+                challenge=challenge,
+                dedup_key=dedup_key,
+                expires_at=expires_at,
+            )
+            for uid in batch
+        ]
+        if dedup_key:
+            # 与 NotificationCreateService 一致：type 有值时一并刷新
+            refresh = {"type": type} if type is not None else {}
+            repo.model.objects.filter(user_id__in=batch, dedup_key=dedup_key).update(
+                **refresh,
+                title=title,
+                body=body,
+                payload=payload,
+                contest=contest,
+                team=team,
+                challenge=challenge,
+                expires_at=expires_at,
+                read_at=None,
+                updated_at=timezone.now(),
+            )
+            repo.model.objects.bulk_create(objs, batch_size=FANOUT_BATCH_SIZE, ignore_conflicts=True)
+            # 冲突忽略时不回填主键，统一回查本批通知用于推送
+            rows = repo.model.objects.filter(user_id__in=batch, dedup_key=dedup_key).values_list(
+                "user_id", "id", "created_at"
+            )
+        else:
+            created = repo.model.objects.bulk_create(objs, batch_size=FANOUT_BATCH_SIZE)
+            rows = [(n.user_id, n.pk, n.created_at) for n in created]
+        if team_channel and team is not None:
+            recipients = [
+                [uid, notif_id, created_at.isoformat() if created_at else None]
+                for uid, notif_id, created_at in rows
+            ]
+            try:
+                broadcast_team(team.id, {**push_base, "recipients": recipients})
+            except Exception:
+                # 推送失败不影响写入
+                pass
+            total += len(recipients)
+            continue
+        for uid, notif_id, created_at in rows:
+            try:
+                broadcast_notify(uid, {**push_base, "id": notif_id, "created_at": created_at})
+            except Exception:
+                # 推送失败不影响写入
+                pass
+            total += 1
+    return total
+
+
 def create_and_push_notification(
         user: User,
         *,
@@ -206,8 +318,9 @@ def create_and_push_notification(
 
 
 def fanout_notifications(
-        users: list[User],
+        users: list[User] | None = None,
         *,
+        user_ids: Iterable[int] | None = None,
         type: str,
         title: str,
         body: str | None = None,
@@ -218,24 +331,28 @@ def fanout_notifications(
         dedup_key: str | None = None,
         expires_at=None,
         repo: NotificationRepo | None = None,
-) -> list[Notification]:
-    """向一组用户发送同样的通知，复用同一 dedup_key（可选）"""
+        team_channel: bool = False,
+) -> int:
+    """
+    向一组用户发送同样的通知，复用同一 dedup_key（可选），返回写入（含刷新）的通知条数
+    - 统一走按用户 id 的批量写入：去重依赖 (user, dedup_key) 唯一约束与冲突忽略，不再逐用户先查后写
+    - 已持有用户 id 时优先传 user_ids，无需加载 User 对象
+    - 接收者均为队伍成员时可传 team_channel=True，改为向队伍组单次发布
+    """
     repo = repo or NotificationRepo()
-    notifs: list[Notification] = []
-    for u in users:
-        notifs.append(
-            create_and_push_notification(
-                u,
-                type=type,
-                title=title,
-                body=body,
-                payload=payload,
-                contest=contest,
-                team=team,
-                challenge=challenge,
-                dedup_key=dedup_key,
-                expires_at=expires_at,
-                repo=repo,
-            )
-        )
-    return notifs
+    if user_ids is None:
+        user_ids = [u.id for u in users or [] if u is not None]
+    return _bulk_fanout_by_ids(
+        user_ids,
+        type=type,
+        title=title,
+        body=body,
+        payload=payload,
+        contest=contest,
+        team=team,
+        challenge=challenge,
+        dedup_key=dedup_key,
+        expires_at=expires_at,
+        repo=repo,
+        team_channel=team_channel,
+    )
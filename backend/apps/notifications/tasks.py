@@ -9,6 +9,7 @@ from django.conf import settings
 from apps.accounts.models import User
 from apps.contests.models import Contest, ContestParticipant
 from apps.contests.repo import ContestRepo, ContestParticipantRepo, TeamMemberRepo, TeamRepo
+from apps.contests.services import ContestContextService
 from apps.notifications.models import Notification
 from apps.notifications.services import fanout_notifications, build_dedup_key
 
@@ -16,13 +17,12 @@ from apps.notifications.services import fanout_notifications, build_dedup_key
 def _notify_participants(contest, *, type: str, title: str, body: str, bucket: str) -> None:
     """对有效报名选手推送通知"""
     participant_repo = ContestParticipantRepo()
-    participants = list(participant_repo.filter(contest=contest, is_valid=True).select_related("user"))
-    if not participants:
+    user_ids = list(participant_repo.filter(contest=contest, is_valid=True).values_list("user_id", flat=True))
+    if not user_ids:
         return
-    users = [p.user for p in participants if getattr(p, "user", None)]
     dedup = build_dedup_key(type=type, contest=contest, bucket=bucket)
     fanout_notifications(
-        users,
+        user_ids=user_ids,
         type=type,
         title=title,
         body=body,
@@ -34,12 +34,12 @@ def _notify_participants(contest, *, type: str, title: str, body: str, bucket: s
 
 def _notify_all_active_users(*, type: str, title: str, body: str, bucket: str, payload: dict | None = None) -> None:
     """向所有活跃非管理员用户广播通知（适用于公开广播类事件）"""
-    users = list(User.objects.filter(is_active=True, is_staff=False))
-    if not users:
+    user_ids = list(User.objects.filter(is_active=True, is_staff=False).values_list("id", flat=True))
+    if not user_ids:
         return
     dedup = build_dedup_key(type=type, bucket=bucket)
     fanout_notifications(
-        users,
+        user_ids=user_ids,
         type=type,
         title=title,
         body=body,
@@ -60,6 +60,8 @@ def scan_contests_for_notifications():
     ending_soon_delta = int(getattr(settings, "NOTIFY_CONTEST_ENDING_SOON_SECONDS", 1800))
     roster_min_members = int(getattr(settings, "NOTIFY_TEAM_MIN_MEMBERS", 2))
 
+    context_service = ContestContextService()
+
     contests = repo.filter()  # 过滤全部比赛，后续按时间窗口筛选
     for contest in contests:
         slug = getattr(contest, "slug", "")
@@ -85,6 +87,8 @@ def scan_contests_for_notifications():
             )
         # 比赛开始
         if contest.start_time and contest.start_time <= now <= contest.start_time + timedelta(minutes=5):
+            # 开赛后批量将已报名记录推进为进行中
+            context_service.sync_participant_statuses(contest)
             _notify_participants(
                 contest,
                 type=Notification.Type.CONTEST_STARTED,
@@ -137,6 +141,8 @@ def scan_contests_for_notifications():
             )
         # 比赛结束
         if contest.end_time and contest.end_time <= now <= contest.end_time + timedelta(minutes=5):
+            # 结束后批量将参与记录推进为已结束
+            context_service.sync_participant_statuses(contest)
             _notify_participants(
                 contest,
                 type=Notification.Type.CONTEST_ENDED,
@@ -199,8 +205,9 @@ def _notify_roster_warning(contest: Contest, *, bucket: str, min_members: int) -
             reason = f"队伍人数超限（当前 {count} 人，上限 {contest.max_team_members} 人）"
         if not warn:
             continue
-        members = list(member_repo.active_members(team))
-        if not members:
+        # 扇出仅需成员用户 id，不加载成员与用户整行
+        member_user_ids = list(member_repo.active_member_user_ids(team))
+        if not member_user_ids:
             continue
         dedup = build_dedup_key(
             type=Notification.Type.TEAM_ROSTER_WARNING,
@@ -209,7 +216,7 @@ def _notify_roster_warning(contest: Contest, *, bucket: str, min_members: int) -
             bucket=bucket,
         )
         fanout_notifications(
-            [m.user for m in members if getattr(m, "user", None)],
+            user_ids=member_user_ids,
             type=Notification.Type.TEAM_ROSTER_WARNING,
             title=reason,
             body=contest.name,
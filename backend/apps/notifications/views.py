@@ -70,7 +70,7 @@ class NotificationListView(APIView):
         queryset = self.repo.filter(user=request.user).order_by("-created_at")
         if status_filter == "unread":
             queryset = queryset.filter(read_at__isnull=True)
-        paginator = StandardPagination()
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(queryset, request)
         items = [serialize_notification(n) for n in page]
         return paginator.get_paginated_response(items)
@@ -100,10 +100,10 @@ class ProblemBankAPITests(AuthenticatedAPIMixin, APITestCase):
         now = timezone.now()
         cls.admin = User.objects.create_superuser(username="admin", email="a@example.com", password="Passw0rd123")
         cls.admin.is_email_verified = True
-        cls.admin.save()
+        cls.admin.save(update_fields=["is_email_verified"])
         cls.user = User.objects.create_user(username="alice", email="alice@example.com", password="Passw0rd123")
         cls.user.is_email_verified = True
-        cls.user.save()
+        cls.user.save(update_fields=["is_email_verified"])
         cls.contest = Contest.objects.create(
             name="Importable",
             slug="importable",
@@ -142,7 +142,7 @@ class ProblemBankListView(APIView):
             elif is_public.lower() in ("false", "0"):
                 qs = qs.filter(is_public=False)
         qs = qs.distinct()
-        paginator = StandardPagination()
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(qs.order_by("-updated_at", "-created_at", "name"), request)
         items = [serialize_bank(b) for b in page]
         return paginator.get_paginated_response({"items": items})
@@ -191,9 +191,11 @@ class ProblemBankMetaView(APIView):
         exclude=True,
     )
     def patch(self, request: Request, bank_slug: str) -> Response:
-        payload = dict(request.data or {})
-        payload["bank_slug"] = bank_slug
-        schema = ProblemBankUpdateSchema.from_dict(payload, auto_validate=True)
+        schema = ProblemBankUpdateSchema.from_dict(
+            request.data or {},
+            overrides={"bank_slug": bank_slug},
+            auto_validate=True,
+        )
         bank = self.update_service.execute(schema)
         return response.success({"bank": serialize_bank(bank)}, message="题库已更新")
 
@@ -228,7 +230,7 @@ class BankChallengeListView(APIView):
         solved_ids = set(
             self.solve_repo.filter(challenge__bank=bank, user=request.user).values_list("challenge_id", flat=True)
         )
-        paginator = StandardPagination()
+        paginator = self.pagination_class()
         page = paginator.paginate_queryset(challenges, request)
         data = [serialize_challenge(ch, solved=ch.id in solved_ids, request=request) for ch in page]
         # 收集所有分类（用于前端筛选，不随分页丢失）
@@ -290,9 +292,11 @@ class BankChallengeDetailView(APIView):
         exclude=True,
     )
     def patch(self, request: Request, bank_slug: str, challenge_slug: str) -> Response:
-        payload = dict(request.data or {})
-        payload.update({"bank_slug": bank_slug, "challenge_slug": challenge_slug})
-        schema = BankChallengeUpdateSchema.from_dict(payload, auto_validate=True)
+        schema = BankChallengeUpdateSchema.from_dict(
+            request.data or {},
+            overrides={"bank_slug": bank_slug, "challenge_slug": challenge_slug},
+            auto_validate=True,
+        )
         challenge = self.update_service.execute(schema)
         return response.success({"challenge": serialize_challenge(challenge, request=request)}, message="题目已更新")
 
@@ -337,9 +341,11 @@ class BankImportFromContestView(APIView):
         exclude=True,
     )
     def post(self, request: Request, bank_slug: str) -> Response:
-        payload = dict(request.data)
-        payload["bank_slug"] = bank_slug
-        schema = BankImportFromContestSchema.from_dict(payload, auto_validate=True)
+        schema = BankImportFromContestSchema.from_dict(
+            request.data,
+            overrides={"bank_slug": bank_slug},
+            auto_validate=True,
+        )
         imported = self.service.execute(schema)
         return response.success({"count": len(imported)}, message="已导入题目")
 
@@ -359,9 +365,11 @@ class BankImportChallengesView(APIView):
         exclude=True,
     )
     def post(self, request: Request, bank_slug: str) -> Response:
-        payload = dict(request.data)
-        payload["bank_slug"] = bank_slug
-        schema = BankImportChallengesSchema.from_dict(payload, auto_validate=True)
+        schema = BankImportChallengesSchema.from_dict(
+            request.data,
+            overrides={"bank_slug": bank_slug},
+            auto_validate=True,
+        )
         imported = self.service.execute(schema)
         return response.success({"count": len(imported)}, message="已导入题目")
 
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0004_submission_bonus_points'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['contest', 'user', 'created_at'], name='submission_contest_user_time'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['contest', 'team', 'created_at'], name='submission_contest_team_time'),
+        ),
+    ]
@@ -60,6 +60,9 @@ class Submission(models.Model):
             models.Index(fields=["contest", "created_at"]),
             models.Index(fields=["challenge", "user"]),
             models.Index(fields=["challenge", "team"]),
+            # 比赛内个人/队伍提交记录按时间倒序翻页（含键集分页）
+            models.Index(fields=["contest", "user", "created_at"], name="submission_contest_user_time"),
+            models.Index(fields=["contest", "team", "created_at"], name="submission_contest_team_time"),
         ]
         verbose_name = "Flag 提交"
         verbose_name_plural = "Flag 提交"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
 from django.conf import settings
 
@@ -319,6 +320,30 @@ class SubmissionService(BaseService[Submission]):
             hint_cost = self._calc_hint_cost(challenge, user, membership)
         return max(0, base_points - hint_cost)
 
+    def visible_points_for_user_bulk(self, user: User | None, contest, challenges, membership=None) -> dict[int, int]:
+        """
+        批量计算选手在多道题目下的当前可获得分值（题目 id -> 分值），规则同 visible_points_for_user
+        - 解题数与提示扣分各一次分组聚合，不再逐题查询
+        """
+        challenges = list(challenges)
+        if not challenges:
+            return {}
+        is_authenticated = user is not None and getattr(user, "is_authenticated", False)
+        if membership is None and is_authenticated:
+            membership = self.member_repo.get_membership(contest=contest, user=user)
+        challenge_ids = [ch.id for ch in challenges]
+        solved_counts = self._solved_counts(challenge_ids, contest)
+        hint_costs = self._calc_hint_costs(challenge_ids, user, membership) if is_authenticated else {}
+        result: dict[int, int] = {}
+        for ch in challenges:
+            solved_count = solved_counts.get(ch.id, 0)
+            base_points = self._calc_dynamic_points(ch, solved_count)
+            base_override, _ = self._apply_blood_reward(ch, solved_count + 1, include_bonus=False)
+            if base_override is not None:
+                base_points = base_override
+            result[ch.id] = max(0, base_points - hint_costs.get(ch.id, 0))
+        return result
+
     @staticmethod
     def _next_blood_rank(challenge) -> int:
         """
@@ -357,6 +382,32 @@ class SubmissionService(BaseService[Submission]):
                 return 0
         return 0
 
+    def _calc_hint_costs(self, challenge_ids: list[int], user: User, membership=None) -> dict[int, int]:
+        """批量提示扣分：若仓储支持 cost_by_challenge 则使用，否则均为 0"""
+        if hasattr(self.hint_repo, "cost_by_challenge"):
+            try:
+                team = getattr(membership, "team", None) if membership else None
+                return self.hint_repo.cost_by_challenge(
+                    challenge_ids=challenge_ids,
+                    user=user,
+                    team=team,
+                )  # type: ignore[attr-defined]
+            except Exception:
+                return {}
+        return {}
+
+    @staticmethod
+    def _solved_counts(challenge_ids: list[int], contest) -> dict[int, int]:
+        """批量统计多道题目的已解出数量（题目 id -> 数量），去重口径同 _solved_count"""
+        qs = ChallengeSolve.objects.filter(challenge_id__in=challenge_ids)
+        if contest.is_team_based:
+            qs = qs.exclude(team_id=None)
+            counter = Count("team_id", distinct=True)
+        else:
+            counter = Count("user_id", distinct=True)
+        rows = qs.values_list("challenge_id").annotate(n=counter).order_by()
+        return dict(rows)
+
     @staticmethod
     def _solved_count(challenge, contest) -> int:
         """
@@ -13,6 +13,7 @@ from apps.contests.schemas import TeamCreateSchema
 from apps.contests.services import TeamCreateService, ContestRegisterService
 from apps.challenges.schemas import ChallengeCreateSchema
 from apps.challenges.services import ChallengeCreateService
+from apps.challenges.models import ChallengeHint, ChallengeHintUnlock, ChallengeSolve
 from apps.challenges.repo import ChallengeRepo
 from apps.submissions.models import Submission
 from apps.common.tests_utils import AuthenticatedAPIMixin
@@ -171,6 +172,68 @@ class SubmissionServiceTests(TestCase):
         with self.assertRaises(ValidationError):
             SubmissionService().execute(self.user, schema)
 
+    def test_visible_points_bulk_matches_per_challenge(self):
+        """批量可得分值应与逐题计算一致：覆盖动态衰减、前 n 血不衰减与提示扣分"""
+        create = ChallengeCreateService().execute
+        base = {"contest_slug": "submit-ctf", "content": "Find flag", "flag": "demo", "base_points": 200}
+        decay = create(
+            self.user,
+            ChallengeCreateSchema(
+                title="Decay", slug="decay", scoring_mode="dynamic", decay_factor=0.9, min_score=60, **base
+            ),
+        )
+        step = create(
+            self.user,
+            ChallengeCreateSchema(
+                title="Step",
+                slug="step",
+                scoring_mode="dynamic",
+                decay_type="fixed_step",
+                decay_factor=30,
+                min_score=100,
+                **base,
+            ),
+        )
+        no_decay = create(
+            self.user,
+            ChallengeCreateSchema(
+                title="NoDecay",
+                slug="no-decay",
+                scoring_mode="dynamic",
+                blood_reward_type="no_decay",
+                blood_reward_count=3,
+                **base,
+            ),
+        )
+        warmup = ChallengeRepo().get_by_slug(contest=self.contest, slug="warmup")
+        challenges = [warmup, decay, step, no_decay]
+
+        # 其他三支队伍：decay/step 各被解出 3 次，no-decay 被解出 1 次
+        for index in range(3):
+            solver = User.objects.create_user(
+                username=f"solver{index}", email=f"s{index}@example.com", password="Pass1234"
+            )
+            team = self.team_repo.create_team(contest=self.contest, captain=solver, name=f"solver-team-{index}")
+            self.member_repo.create_member(team=team, user=solver, role=TeamMember.Role.CAPTAIN)
+            solved = [decay, step] + ([no_decay] if index == 0 else [])
+            ChallengeSolve.objects.bulk_create(
+                ChallengeSolve(challenge=challenge, user=solver, team=team, awarded_points=1) for challenge in solved
+            )
+        # 当前选手在 decay 上解锁了付费提示
+        hint = ChallengeHint.objects.create(challenge=decay, title="hint", content="...", is_free=False, cost=25)
+        ChallengeHintUnlock.objects.create(hint=hint, challenge=decay, user=self.user, team=self.team, cost=25)
+
+        service = SubmissionService()
+        for user in (self.user, None):
+            bulk = service.visible_points_for_user_bulk(user, self.contest, challenges)
+            expected = {ch.id: service.visible_points_for_user(user, self.contest, ch) for ch in challenges}
+            self.assertEqual(bulk, expected)
+        # 动态题确实发生了衰减与扣分，避免两边同时退化为基础分
+        bulk = service.visible_points_for_user_bulk(self.user, self.contest, challenges)
+        self.assertLess(bulk[decay.id], 200 - 25)
+        self.assertEqual(bulk[step.id], 110)
+        self.assertEqual(bulk[no_decay.id], 200)
+
     @staticmethod
     def _build_dynamic_flag(contest, challenge_slug: str, user):
         challenge = ChallengeRepo().get_by_slug(contest=contest, slug=challenge_slug)